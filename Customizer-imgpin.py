@@ -1,12 +1,20 @@
 import os
+import copy
+import atexit
 import json
 import math
 import tkinter as tk
-import subprocess
+import threading
 import colorsys
 from tkinter import ttk, messagebox
-from PIL import Image, ImageDraw, ImageFont, ImageTk
-from shared.colors import gradient_color, certainty_color, blind_evaluation_color, hex_to_rgb, format_blind_evaluation
+from PIL import Image, ImageDraw, ImageTk
+from core.font_index import font_choices, load_font_index, refresh_font_index, save_font_index
+from shared.layout import load_font
+from shared.render import custom_style, render_preview
+from core import ipc
+from core.config_checks import validate_customizations
+from core.config_store import JsonWriter, write_json_atomic
+from core.staged_update import installed_version
 
 CUSTOM_PATH = os.path.expanduser("~/.config/NBTrackr/customizations.json")
 BUNDLED_FONT_DISPLAY = "LiberationSans-Bold (Bundled)"
@@ -73,6 +81,10 @@ DEFAULT_CUSTOMIZATIONS = {
     "debug_mode": False,
     "idle_api_polling_rate": 0.2,
     "max_api_polling_rate": 0.05,
+    "poll_cpu_budget": 2.0,
+    "render_worker_enabled": False,
+    "render_workers": 1,
+    "background_updates_enabled": False,
     "auto_hide_window": True,
     "hide_method": "withdraw",
     "background_opacity": 1.0,
@@ -88,78 +100,6 @@ DISPLAY_NAMES = {
 }
 
 
-ADJ_POS = (117, 204, 108)
-ADJ_NEG = (204, 110, 114)
-
-NB_BG = (55, 60, 66, 255)
-NB_HEADER_BG = (45, 50, 56, 255)
-NB_HEADER_FG = (229, 229, 229)
-NB_ROW_ODD = (55, 60, 66, 255)
-NB_ROW_EVEN = (55, 60, 66, 255)
-NB_BORDER = (33, 37, 41, 255)
-NB_TEXT = (255, 255, 255)
-NB_THROW_HDR_FG = (192, 192, 192)
-
-_RED_HEX = (189, 65, 65)
-_YELLOW = (216, 192, 100)
-_GREEN_HEX = (89, 185, 75)
-
-
-def _interp(c1, c2, steps, step):
-    r = int(c1[0] + (c2[0] - c1[0]) * step / max(steps - 1, 1))
-    g = int(c1[1] + (c2[1] - c1[1]) * step / max(steps - 1, 1))
-    b = int(c1[2] + (c2[2] - c1[2]) * step / max(steps - 1, 1))
-    return (r, g, b)
-
-
-def _nb_cert_color(pct):
-    if pct >= 50:
-        return _interp(_YELLOW, _GREEN_HEX, 51, int(pct - 50))
-    return _interp(_RED_HEX, _YELLOW, 51, int(pct))
-
-
-def _nb_dir_color(direction):
-    abs_dir = abs(direction)
-    if abs_dir <= 180:
-        return _interp(_RED_HEX, _GREEN_HEX, 181, int(180 - abs_dir))
-    return _YELLOW
-
-
-def _load_preview_font(font_name, font_size):
-    font = None
-    if font_name:
-        try:
-            font = ImageFont.truetype(font_name, font_size)
-            return font
-        except Exception:
-            pass
-    _default_font_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "assets",
-        "LiberationSans",
-        "LiberationSans-Bold.ttf",
-    )
-    try:
-        return ImageFont.truetype(_default_font_path, font_size)
-    except Exception:
-        pass
-    return ImageFont.load_default()
-
-
-def _load_nb_preview_font(font_size):
-    font_path = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)),
-        "assets",
-        "LiberationSans",
-        "LiberationSans-Bold.ttf",
-    )
-    try:
-        return ImageFont.truetype(font_path, font_size)
-    except Exception:
-        pass
-    return ImageFont.load_default()
-
-
 PREVIEW_EYE_DATA = [
     {"chunkX": -149, "chunkZ": -77, "certainty": 0.999, "overworldDistance": 2992.0},
     {"chunkX": -148, "chunkZ": -84, "certainty": 0.001, "overworldDistance": 2879.0},
@@ -174,1352 +114,104 @@ PREVIEW_PLAYER = {
     "isInNether": False,
 }
 PREVIEW_EYE_THROWS = [
-    {"xInOverworld": -1954, "zInOverworld": -4197, "angle": 10.05, "error": 0.0021},
-    {"xInOverworld": -1955, "zInOverworld": -4190, "angle": 9.01, "error": 0.0034},
-    {"xInOverworld": -1957, "zInOverworld": -4190, "angle": 8.04, "error": -0.0008},
+    {
+        "xInOverworld": -1954,
+        "zInOverworld": -4197,
+        "angleWithoutCorrection": 10.05,
+        "correctionIncrements": 2,
+        "error": 0.0021,
+    },
+    {
+        "xInOverworld": -1955,
+        "zInOverworld": -4190,
+        "angleWithoutCorrection": 9.01,
+        "correctionIncrements": -1,
+        "error": 0.0034,
+    },
+    {
+        "xInOverworld": -1957,
+        "zInOverworld": -4190,
+        "angleWithoutCorrection": 8.04,
+        "correctionIncrements": 0,
+        "error": -0.0008,
+    },
 ]
 
 
-def render_default_preview(settings: dict) -> Image.Image:
-    CELL_PAD_MAIN = 3
-    HDR_SEP_PX = 1
-
-    try:
-        font_size = int(settings.get("font_size", 18))
-    except Exception:
-        font_size = 18
-
-    neg_coords_enabled = settings.get("negative_coords_color_enabled", False)
-    show_adj_count = settings.get("show_angle_adjustment_count", False)
-    neg_coords_rgb = hex_to_rgb(
-        settings.get("negative_coords_color", "#BA6669"), (186, 102, 105)
-    )
-    ow_coords_format = settings.get("overworld_coords_format", "four_four")
-
-    user_font_path = settings.get("font_name", "")
-    font = _load_preview_font(user_font_path, font_size)
-    small_font = _load_preview_font(user_font_path, max(8, int(font_size * 0.85)))
-
-    bg_opacity = settings.get("background_opacity", 1.0)
-    text_opacity = settings.get("text_opacity", 1.0)
-
-    def _bc(c):
-        return (*c[:3], int(bg_opacity * 255))
-
-    def _tc(c):
-        return (*c[:3], int(text_opacity * 255))
-
-    dummy_img = Image.new("RGBA", (1, 1))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-
-    def tw(text, fnt=font):
-        return dummy_draw.textbbox((0, 0), text, font=fnt)[2]
-
-    def th(fnt=font):
-        a, d = fnt.getmetrics()
-        return a + d
-
-    def th_full(fnt=font):
-        a, d = fnt.getmetrics()
-        return a + d
-
-    body_h = th(font) + 4
-    hdr_h = th(font) + 4
-    small_h = th(small_font) + 2
-    ROW_SEP = 1
-
-    a_new, d_new = font.getmetrics()
-    NB_NEW_HDR_H = a_new + d_new + 8
-
-    preds = PREVIEW_EYE_DATA
-    player_x = PREVIEW_PLAYER["xInOverworld"]
-    player_z = PREVIEW_PLAYER["zInOverworld"]
-    h_ang = PREVIEW_PLAYER["horizontalAngle"]
-
-    loc_label = "Chunk" if ow_coords_format == "chunk" else "Location"
-    col_keys = ["loc", "cert", "dist", "nether", "angle"]
-    hdr_labels = {
-        "loc": loc_label,
-        "cert": "%",
-        "dist": "Dist.",
-        "nether": "Nether",
-        "angle": "Angle",
-    }
-
-    _rep_samples = {
-        "loc": f"({12345}, {12345})",
-        "cert": "100.0%",
-        "dist": "10000",
-        "nether": f"({12345}, {12345})",
-        "angle": "180.0 (-> 180.0)",
-    }
-
-    rows = []
-    for pred in preds:
-        cx, cz = pred["chunkX"], pred["chunkZ"]
-        cert = pred["certainty"]
-        dist = pred["overworldDistance"]
-
-        if ow_coords_format == "chunk":
-            ox, oz = cx, cz
-        elif ow_coords_format == "eight_eight":
-            ox, oz = cx * 16 + 8, cz * 16 + 8
-        else:
-            ox, oz = cx * 16 + 4, cz * 16 + 4
-
-        nx, nz = round((cx * 16 + 4) / 8), round((cz * 16 + 4) / 8)
-        cert_pct = cert * 100
-        dist_disp = int(dist)
-
-        sx, sz = cx * 16 + 4, cz * 16 + 4
-        dx, dz = sx - player_x, sz - player_z
-        tgt = (math.degrees(math.atan2(dz, dx)) + 270) % 360
-        signed = ((tgt + 180) % 360) - 180
-        turn = ((tgt - (h_ang % 360) + 180) % 360) - 180
-
-        rows.append(
-            {
-                "loc": (ox, oz),
-                "cert_pct": cert_pct,
-                "dist": dist_disp,
-                "nether": (nx, nz),
-                "angle": f"{signed:.1f}",
-                "dir": turn,
-            }
-        )
-
-    col_widths = {}
-    for key in col_keys:
-        col_widths[key] = max(
-            tw(hdr_labels[key]) + CELL_PAD_MAIN * 2,
-            tw(_rep_samples.get(key, "")) + CELL_PAD_MAIN * 2,
-        )
-
-    for r in rows:
-        col_widths["loc"] = max(
-            col_widths["loc"], tw(f"({r['loc'][0]}, {r['loc'][1]})") + CELL_PAD_MAIN * 2
-        )
-        col_widths["cert"] = max(
-            col_widths["cert"], tw(f"{r['cert_pct']:.1f}%") + CELL_PAD_MAIN * 2
-        )
-        col_widths["dist"] = max(
-            col_widths["dist"], tw(str(r["dist"])) + CELL_PAD_MAIN * 2
-        )
-        col_widths["nether"] = max(
-            col_widths["nether"],
-            tw(f"({r['nether'][0]}, {r['nether'][1]})") + CELL_PAD_MAIN * 2,
-        )
-        angle_full = (
-            r["angle"] + f" ({'-> ' if r['dir'] > 0 else '<- '}{abs(r['dir']):.1f})"
-        )
-        col_widths["angle"] = max(
-            col_widths["angle"], tw(angle_full) + CELL_PAD_MAIN * 2
-        )
-
-    throw_headers = ["x", "z", "Angle", "Error"]
-    throw_col_widths = [tw(h, small_font) + 14 * 2 for h in throw_headers]
-
-    _preview_adj = (
-        {
-            0: ("10.05", "+2", 2),
-            1: ("9.01", "-1", -1),
-            2: ("8.04", None, None),
-        }
-        if show_adj_count
-        else {}
-    )
-
-    for ti, trow in enumerate(PREVIEW_EYE_THROWS):
-        if show_adj_count and ti in _preview_adj:
-            aw_str, cnt_str, _ = _preview_adj[ti]
-            angle_cell = aw_str + (cnt_str if cnt_str else "")
-        else:
-            angle_cell = f"{trow['angle']:.1f}"
-        cells = [
-            str(int(trow["xInOverworld"])),
-            str(int(trow["zInOverworld"])),
-            angle_cell,
-            f"{trow['error']:.4f}",
-        ]
-        for i, cell in enumerate(cells):
-            throw_col_widths[i] = max(
-                throw_col_widths[i], tw(cell, small_font) + 14 * 2
-            )
-
-    main_table_w = sum(col_widths[k] for k in col_keys)
-    throw_total = sum(throw_col_widths)
-    img_w = max(main_table_w, throw_total)
-
-    if main_table_w < img_w:
-        extra = img_w - main_table_w
-        per_col = extra // len(col_keys)
-        for k in col_keys:
-            col_widths[k] += per_col
-        col_widths[col_keys[-1]] += img_w - sum(col_widths[k] for k in col_keys)
-
-    leftover = img_w - sum(throw_col_widths)
-    if leftover > 0:
-        ob = int(leftover * 0.20)
-        cb = int(leftover * 0.30)
-        throw_col_widths[0] += ob
-        throw_col_widths[1] += cb
-        throw_col_widths[2] += cb
-        throw_col_widths[3] += ob
-        diff = img_w - sum(throw_col_widths)
-        throw_col_widths[3] += diff
-
-    num_rows = len(rows)
-    num_throw_rows = len(PREVIEW_EYE_THROWS)
-
-    main_h = (
-        NB_NEW_HDR_H
-        + HDR_SEP_PX
-        + HDR_SEP_PX
-        + hdr_h
-        + HDR_SEP_PX
-        + num_rows * body_h
-        + num_rows * ROW_SEP
-    )
-    throw_h = (
-        HDR_SEP_PX + hdr_h + small_h + HDR_SEP_PX + num_throw_rows * (body_h + ROW_SEP)
-    )
-    img_h = main_h + throw_h
-
-    NEW_HEADER_BG_C = (0x21, 0x25, 0x29, 255)
-    NB_HDR_SEP_C = (33, 37, 41, 255)
-    NB_HEADER_BG_C = (45, 50, 56, 255)
-    NB_ROW_BG_C = (55, 60, 66, 255)
-    NB_TEXT_C = (255, 255, 255)
-    NB_VER_FG_C = (0x80, 0x80, 0x80)
-    NB_ROW_SEP_C = (42, 46, 50, 255)
-    NB_THROW_HDR_FG_C = (192, 192, 192)
-
-    img = Image.new("RGBA", (img_w, img_h), _bc(NB_ROW_BG_C))
-    draw = ImageDraw.Draw(img)
-
-    draw.rectangle([0, 0, img_w - 1, NB_NEW_HDR_H - 1], fill=_bc(NEW_HEADER_BG_C))
-    draw.text(
-        (CELL_PAD_MAIN + 4, (NB_NEW_HDR_H - th()) // 2),
-        "NBTrackr",
-        font=font,
-        fill=_tc(NB_TEXT_C),
-    )
-    ver_text = "(preview)"
-    ver_x = CELL_PAD_MAIN + 4 + tw("NBTrackr") + 8
-    a_t, _ = font.getmetrics()
-    a_v, _ = small_font.getmetrics()
-    ver_y = (NB_NEW_HDR_H - th()) // 2 + a_t - a_v
-    draw.text((ver_x, ver_y), ver_text, font=small_font, fill=_tc(NB_VER_FG_C))
-
-    _bp = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "assets", "boat_green_icon.png"
-    )
-    try:
-        _isz = NB_NEW_HDR_H - 8
-        with Image.open(_bp) as _bi:
-            _bi = _bi.convert("RGBA").resize((_isz, _isz), Image.Resampling.LANCZOS)
-            _icon_x = img_w - _isz - 20
-            _icon_y = (NB_NEW_HDR_H - _isz) // 2
-            img.alpha_composite(_bi, (_icon_x, _icon_y))
-    except Exception:
-        pass
-
-    y0 = NB_NEW_HDR_H
-    draw.rectangle([0, y0, img_w - 1, y0 + HDR_SEP_PX - 1], fill=_bc(NB_HDR_SEP_C))
-
-    col_hdr_y0 = y0 + HDR_SEP_PX
-    draw.rectangle(
-        [0, col_hdr_y0, img_w - 1, col_hdr_y0 + HDR_SEP_PX - 1], fill=_bc(NB_HDR_SEP_C)
-    )
-
-    col_hdr_start = col_hdr_y0 + HDR_SEP_PX
-    draw.rectangle(
-        [0, col_hdr_start, img_w - 1, col_hdr_start + hdr_h - 1],
-        fill=_bc(NB_HEADER_BG_C),
-    )
-    x = 0
-    for key in col_keys:
-        cw = col_widths[key]
-        lbl = hdr_labels[key]
-        lw = tw(lbl)
-        if key == "angle":
-            rep_base = tw("000.00")
-            rep_dir = tw(" (-> 000.0)")
-            rep_full = rep_base + rep_dir
-            cell_bx = x + (cw - rep_full) // 2
-            dir_start = cell_bx + rep_base
-            text_x = dir_start + (rep_dir - lw) // 2
-            text_x = max(x, min(text_x, x + cw - lw))
-        else:
-            text_x = x + (cw - lw) // 2
-        draw.text(
-            (text_x, col_hdr_start + (hdr_h - th()) // 2),
-            lbl,
-            font=font,
-            fill=_tc(NB_TEXT_C),
-        )
-        x += cw
-
-    sep_below_hdr = col_hdr_start + hdr_h
-    draw.rectangle(
-        [0, sep_below_hdr, img_w - 1, sep_below_hdr + HDR_SEP_PX - 1],
-        fill=_bc(NB_HDR_SEP_C),
-    )
-
-    row_area_y = sep_below_hdr + HDR_SEP_PX
-
-    for row_idx, r in enumerate(rows):
-        y = row_area_y + row_idx * (body_h + ROW_SEP)
-        draw.rectangle([0, y, img_w - 1, y + body_h - 1], fill=_bc(NB_ROW_BG_C))
-        if row_idx < num_rows - 1:
-            draw.rectangle(
-                [0, y + body_h, img_w - 1, y + body_h + ROW_SEP - 1],
-                fill=_bc(NB_ROW_SEP_C),
-            )
-
-        a_body, d_body = font.getmetrics()
-        text_y = y + (body_h - (a_body + d_body)) // 2
-        x = 0
-
-        def draw_cell(key, text, fill=NB_TEXT_C, fnt=font):
-            nonlocal x
-            cw = col_widths[key]
-            tw_ = dummy_draw.textbbox((0, 0), text, font=fnt)[2]
-            draw.text((x + (cw - tw_) // 2, text_y), text, font=fnt, fill=_tc(fill))
-            x += cw
-
-        def draw_coord_cell(key, coord_pair):
-            nonlocal x
-            cw = col_widths[key]
-            cx_v, cz_v = coord_pair
-            parts = [
-                ("(", NB_TEXT_C),
-                (
-                    str(cx_v),
-                    neg_coords_rgb if neg_coords_enabled and cx_v < 0 else NB_TEXT_C,
-                ),
-                (", ", NB_TEXT_C),
-                (
-                    str(cz_v),
-                    neg_coords_rgb if neg_coords_enabled and cz_v < 0 else NB_TEXT_C,
-                ),
-                (")", NB_TEXT_C),
-            ]
-            full_w = sum(tw(p[0]) for p in parts)
-            bx = x + (cw - full_w) // 2
-            for pt, pc in parts:
-                draw.text((bx, text_y), pt, font=font, fill=_tc(pc))
-                bx += tw(pt)
-            x += cw
-
-        draw_coord_cell("loc", r["loc"])
-        draw_cell("cert", f"{r['cert_pct']:.1f}%", fill=certainty_color(r["cert_pct"]))
-        draw_cell("dist", str(r["dist"]))
-        draw_coord_cell("nether", r["nether"])
-
-        lx = x
-        cw = col_widths["angle"]
-        base_str = r["angle"]
-        arrow = "->" if r["dir"] > 0 else "<-"
-        dir_part = f" ({arrow} {abs(r['dir']):.1f})"
-        dir_col = gradient_color(abs(r["dir"]))
-        full_w = tw(base_str) + tw(dir_part)
-        bx = lx + (cw - full_w) // 2
-        draw.text((bx, text_y), base_str, font=font, fill=_tc(NB_TEXT_C))
-        draw.text((bx + tw(base_str), text_y), dir_part, font=font, fill=_tc(dir_col))
-        x += cw
-
-    throw_base_y = main_h
-    draw.rectangle(
-        [0, throw_base_y, img_w - 1, throw_base_y + HDR_SEP_PX - 1],
-        fill=_bc(NB_HDR_SEP_C),
-    )
-
-    th_title_y = throw_base_y + HDR_SEP_PX
-    draw.rectangle(
-        [0, th_title_y, img_w - 1, th_title_y + hdr_h - 1], fill=_bc(NB_HEADER_BG_C)
-    )
-    draw.text(
-        (CELL_PAD_MAIN + 6, th_title_y + (hdr_h - th()) // 2),
-        "Ender eye throws",
-        font=font,
-        fill=_tc(NB_TEXT_C),
-    )
-
-    th_hdr_y = th_title_y + hdr_h
-    draw.rectangle(
-        [0, th_hdr_y, img_w - 1, th_hdr_y + small_h - 1], fill=_bc(NB_HEADER_BG_C)
-    )
-    x = 0
-    for i, thdr in enumerate(throw_headers):
-        cw = throw_col_widths[i]
-        lw = tw(thdr, small_font)
-        ty = th_hdr_y + (small_h - th(small_font)) // 2
-        draw.text((x + (cw - lw) // 2, ty), thdr, font=small_font, fill=_tc(NB_TEXT_C))
-        x += cw
-
-    sep2_y = th_hdr_y + small_h
-    draw.rectangle(
-        [0, sep2_y, img_w - 1, sep2_y + HDR_SEP_PX - 1], fill=_bc(NB_HDR_SEP_C)
-    )
-
-    for ti, trow in enumerate(PREVIEW_EYE_THROWS):
-        ty = sep2_y + HDR_SEP_PX + ti * (body_h + ROW_SEP)
-        if ti < num_throw_rows - 1:
-            draw.rectangle(
-                [0, ty + body_h, img_w - 1, ty + body_h + ROW_SEP - 1],
-                fill=NB_ROW_SEP_C,
-            )
-        x = 0
-        cells = [
-            str(int(trow["xInOverworld"])),
-            str(int(trow["zInOverworld"])),
-            f"{trow['angle']:.1f}",
-            f"{trow['error']:.4f}",
-        ]
-        for i, cell in enumerate(cells):
-            cw = throw_col_widths[i]
-            a_s, d_s = small_font.getmetrics()
-            sy = ty + (body_h - (a_s + d_s)) // 2
-            if i == 2 and show_adj_count and ti in _preview_adj:
-                aw_str, cnt_str, cnt_raw = _preview_adj[ti]
-                if cnt_str:
-                    adj_col = (
-                        (117, 204, 108)
-                        if (cnt_raw is None or cnt_raw >= 0)
-                        else (204, 110, 114)
-                    )
-                    full_w = tw(aw_str, small_font) + tw(cnt_str, small_font)
-                    bx = x + (cw - full_w) // 2
-                    draw.text(
-                        (bx, sy), aw_str, font=small_font, fill=_tc(NB_THROW_HDR_FG_C)
-                    )
-                    draw.text(
-                        (bx + tw(aw_str, small_font), sy),
-                        cnt_str,
-                        font=small_font,
-                        fill=_tc(adj_col),
-                    )
-                else:
-                    cw_ = tw(aw_str, small_font)
-                    draw.text(
-                        (x + (cw - cw_) // 2, sy),
-                        aw_str,
-                        font=small_font,
-                        fill=_tc(NB_THROW_HDR_FG_C),
-                    )
-            else:
-                cw_ = tw(cell, small_font)
-                draw.text(
-                    (x + (cw - cw_) // 2, sy),
-                    cell,
-                    font=small_font,
-                    fill=_tc(NB_THROW_HDR_FG_C),
-                )
-            x += cw
-
-    return img
-
-
-def render_default_blind_preview(settings: dict = None) -> Image.Image:
-    font_size = 18
-    if settings is None:
-        settings = {}
-    try:
-        font_size = int(settings.get("font_size", font_size))
-    except Exception:
-        pass
-    user_font_path = settings.get("font_name", "")
-    font = _load_preview_font(user_font_path, font_size)
-    small_font = _load_preview_font(user_font_path, max(8, int(font_size * 0.85)))
-
-    bg_opacity = settings.get("background_opacity", 1.0)
-    text_opacity = settings.get("text_opacity", 1.0)
-
-    def _bc(c):
-        return (*c[:3], int(bg_opacity * 255))
-
-    def _tc(c):
-        return (*c[:3], int(text_opacity * 255))
-
-    dummy_img = Image.new("RGBA", (1, 1))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-
-    def tw(text, fnt=font):
-        return dummy_draw.textbbox((0, 0), text, font=fnt)[2]
-
-    def th(fnt=font):
-        a, d = fnt.getmetrics()
-        return a + d
-
-    body_h = th(font) + 4
-    hdr_h = th(font) + 4
-    small_h = th(small_font) + 2
-    HDR_SEP = 1
-    ROW_SEP = 1
-    CELL_PAD = 3
-
-    NEW_HEADER_BG = (0x21, 0x25, 0x29, 255)
-    NB_HDR_SEP_C = (33, 37, 41, 255)
-    NB_HEADER_BG_C = (45, 50, 56, 255)
-    NB_ROW_BG_C = (55, 60, 66, 255)
-    NB_TEXT_C = (255, 255, 255)
-    NB_VER_FG = (0x80, 0x80, 0x80)
-
-    a_new, d_new = font.getmetrics()
-    new_header_h = a_new + d_new + 8
-
-    br = PREVIEW_BLIND
-    evaluation = br["evaluation"]
-    x_nether = br["xInNether"]
-    z_nether = br["zInNether"]
-    highroll_prob = br["highrollProbability"] * 100
-    highroll_thresh = br["highrollThreshold"]
-    improve_deg = math.degrees(br["improveDirection"])
-    improve_dist = br["improveDistance"]
-
-    eval_text = format_blind_evaluation(evaluation)
-    _prefix = f"Blind coords ({round(x_nether)}, {round(z_nether)}) are "
-    _l2p = f"{highroll_prob:.1f}%"
-    _l2s = f" chance of <{int(highroll_thresh)} block blind"
-    _l3 = f"Head {improve_deg:.0f}°, {round(improve_dist)} blocks away, for better coords."
-
-    eval_color = blind_evaluation_color(evaluation)
-
-    num_display_rows = 5
-    col_keys = ["loc", "cert", "dist", "nether", "angle"]
-    hdr_labels = {
-        "loc": "Location",
-        "cert": "%",
-        "dist": "Dist.",
-        "nether": "Nether",
-        "angle": "Angle",
-    }
-
-    col_widths = {k: tw(hdr_labels[k]) + CELL_PAD * 2 for k in col_keys}
-
-    samples = {
-        "loc": "(12345, 12345)",
-        "cert": "100.0%",
-        "dist": "10000",
-        "nether": "(12345, 12345)",
-        "angle": "180.0 (-> 180.0)",
-    }
-    for k, s in samples.items():
-        col_widths[k] = max(col_widths[k], tw(s) + CELL_PAD * 2)
-
-    min_blind_w = (
-        max(tw(_prefix) + tw(eval_text), tw(_l2p) + tw(_l2s), tw(_l3)) + CELL_PAD * 2
-    )
-
-    main_table_w = sum(col_widths[k] for k in col_keys)
-    img_w = max(main_table_w, min_blind_w)
-
-    if main_table_w < img_w:
-        extra = img_w - main_table_w
-        per_col = extra // len(col_keys)
-        for k in col_keys:
-            col_widths[k] += per_col
-        col_widths[col_keys[-1]] += img_w - sum(col_widths[k] for k in col_keys)
-
-    throw_headers = ["x", "z", "Angle", "Error"]
-    throw_col_widths = [tw(h, small_font) + 14 * 2 for h in throw_headers]
-    throw_samples = ["12345.67", "12345.67", "180.0", "0.0000"]
-    for i, s in enumerate(throw_samples):
-        throw_col_widths[i] = max(throw_col_widths[i], tw(s, small_font) + 14 * 2)
-
-    leftover = img_w - sum(throw_col_widths)
-    if leftover > 0:
-        ob = int(leftover * 0.20)
-        cb = int(leftover * 0.30)
-        throw_col_widths[0] += ob
-        throw_col_widths[1] += cb
-        throw_col_widths[2] += cb
-        throw_col_widths[3] += ob
-        diff = img_w - sum(throw_col_widths)
-        throw_col_widths[3] += diff
-
-    num_throw_rows = 3
-    main_h = (
-        new_header_h + HDR_SEP + HDR_SEP + hdr_h + HDR_SEP + num_display_rows * body_h
-    )
-    throw_h = HDR_SEP + hdr_h + small_h + HDR_SEP + num_throw_rows * (body_h + ROW_SEP)
-    img_h = main_h + throw_h
-
-    img = Image.new("RGBA", (img_w, img_h), _bc(NB_ROW_BG_C))
-    draw = ImageDraw.Draw(img)
-
-    draw.rectangle([0, 0, img_w - 1, new_header_h - 1], fill=_bc(NEW_HEADER_BG))
-    draw.text(
-        (CELL_PAD + 4, (new_header_h - th()) // 2),
-        "NBTrackr",
-        font=font,
-        fill=_tc(NB_TEXT_C),
-    )
-    ver_x = CELL_PAD + 4 + tw("NBTrackr") + 8
-    a_t, _ = font.getmetrics()
-    a_v, _ = small_font.getmetrics()
-    ver_y = (new_header_h - th()) // 2 + a_t - a_v
-    draw.text((ver_x, ver_y), "(preview)", font=small_font, fill=_tc(NB_VER_FG))
-
-    _bp = os.path.join(
-        os.path.dirname(os.path.abspath(__file__)), "assets", "boat_gray_icon.png"
-    )
-    try:
-        _isz = new_header_h - 4
-        with Image.open(_bp) as _bi:
-            _bi = _bi.convert("RGBA").resize((_isz, _isz), Image.Resampling.LANCZOS)
-            img.alpha_composite(_bi, (img_w - _isz - 4, (new_header_h - _isz) // 2))
-    except Exception:
-        pass
-
-    draw.rectangle(
-        [0, new_header_h, img_w - 1, new_header_h + HDR_SEP - 1], fill=_bc(NB_HDR_SEP_C)
-    )
-
-    col_hdr_y0 = new_header_h + HDR_SEP
-    draw.rectangle(
-        [0, col_hdr_y0, img_w - 1, col_hdr_y0 + HDR_SEP - 1], fill=_bc(NB_HDR_SEP_C)
-    )
-
-    txt_x = CELL_PAD
-    txt_y = new_header_h + HDR_SEP + (body_h - th()) // 2
-    lsep = body_h
-    draw.text((txt_x, txt_y), _prefix, font=font, fill=_tc(NB_TEXT_C))
-    draw.text((txt_x + tw(_prefix), txt_y), eval_text, font=font, fill=_tc(eval_color))
-    draw.text((txt_x, txt_y + lsep), _l2p, font=font, fill=_tc(eval_color))
-    draw.text((txt_x + tw(_l2p), txt_y + lsep), _l2s, font=font, fill=_tc(NB_TEXT_C))
-    draw.text((txt_x, txt_y + lsep * 2), _l3, font=font, fill=_tc(NB_TEXT_C))
-
-    throw_base_y = main_h
-    draw.rectangle(
-        [0, throw_base_y, img_w - 1, throw_base_y + HDR_SEP - 1], fill=_bc(NB_HDR_SEP_C)
-    )
-    th_title_y = throw_base_y + HDR_SEP
-    draw.rectangle(
-        [0, th_title_y, img_w - 1, th_title_y + hdr_h - 1], fill=_bc(NB_HEADER_BG_C)
-    )
-    draw.text(
-        (CELL_PAD + 6, th_title_y + (hdr_h - th()) // 2),
-        "Ender eye throws",
-        font=font,
-        fill=_tc(NB_TEXT_C),
-    )
-    th_hdr_y = th_title_y + hdr_h
-    draw.rectangle(
-        [0, th_hdr_y, img_w - 1, th_hdr_y + small_h - 1], fill=_bc(NB_HEADER_BG_C)
-    )
-    x = 0
-    for i, thdr in enumerate(throw_headers):
-        cw = throw_col_widths[i]
-        lw = tw(thdr, small_font)
-        ty2 = th_hdr_y + (small_h - th(small_font)) // 2
-        draw.text((x + (cw - lw) // 2, ty2), thdr, font=small_font, fill=_tc(NB_TEXT_C))
-        x += cw
-    sep2_y = th_hdr_y + small_h
-    draw.rectangle([0, sep2_y, img_w - 1, sep2_y + HDR_SEP - 1], fill=_bc(NB_HDR_SEP_C))
-
-    for ti in range(num_throw_rows):
-        ty = sep2_y + HDR_SEP + ti * (body_h + ROW_SEP)
-        if ti < num_throw_rows - 1:
-            draw.rectangle(
-                [0, ty + body_h, img_w - 1, ty + body_h + ROW_SEP - 1],
-                fill=_bc((42, 46, 50, 255)),
-            )
-
-    return img
-
+PREVIEW_BLIND = {
+    "evaluation": "HIGHROLL_GOOD",
+    "xInNether": 312,
+    "zInNether": -87,
+    "highrollProbability": 0.734,
+    "highrollThreshold": 400,
+    "improveDirection": math.radians(47),
+    "improveDistance": 62,
+}
 
-def render_eye_throws_preview(settings: dict) -> Image.Image:
-    bg_hex = settings.get("background_color", "#1E1E1E")
-    text_hex = settings.get("text_color", "#FFFFFF")
-    bg_rgb = hex_to_rgb(bg_hex, (255, 255, 255))
-    text_rgb = hex_to_rgb(text_hex, (0, 0, 0))
-    neg_coords_enabled = settings.get("negative_coords_color_enabled", False)
-    neg_coords_rgb = hex_to_rgb(
-        settings.get("negative_coords_color", "#BA6669"), (204, 110, 114)
-    )
-    portal_dist_enabled = settings.get("portal_nether_color_enabled", False)
-    portal_dist_rgb = hex_to_rgb(
-        settings.get("portal_nether_color", "#FFA500"), (255, 165, 0)
-    )
-
-    bg_opacity = settings.get("background_opacity", 1.0)
-    text_opacity = settings.get("text_opacity", 1.0)
-
-    text_outline_enabled = settings.get("text_outline_enabled", False)
-    text_outline_hex = settings.get("text_outline_color", "#000000")
-    text_outline_rgb = hex_to_rgb(text_outline_hex, (0, 0, 0))
-    text_outline_width = settings.get("text_outline_width", 2)
-    outline_rgba = (*text_outline_rgb, int(text_opacity * 255))
-
-    stroke_kwargs = {}
-    stroke_width_kwargs = {}
-    if text_outline_enabled:
-        stroke_kwargs = {
-            "stroke_width": text_outline_width,
-            "stroke_fill": outline_rgba,
-        }
-        stroke_width_kwargs = {
-            "stroke_width": text_outline_width,
-        }
-
-    def _bc(c):
-        return (*c[:3], int(bg_opacity * 255))
-
-    def _tc(c):
-        return (*c[:3], int(text_opacity * 255))
-
-    bg_rgba = _bc(bg_rgb)
-
-    shown_count = settings.get("shown_measurements", 1)
-    order = settings.get(
-        "text_order",
-        [
-            "distance",
-            "certainty_percentage",
-            "angle",
-            "overworld_coords",
-            "nether_coords",
-        ],
-    )
-    enabled = settings.get("text_enabled", {k: True for k in order})
-    show_adj = settings.get("show_angle_adjustment_count", False)
-    show_angle_error = settings.get("show_angle_error", False)
-    angle_display_mode = settings.get("angle_display_mode", "angle_and_change")
-    in_nether = PREVIEW_PLAYER["isInNether"]
-    font_name = settings.get("font_name", "")
-    font_size = settings.get("font_size", 18)
-    show_coords_by_dim = settings.get("show_coords_based_on_dimension", False)
-    ow_coords_format = settings.get("overworld_coords_format", "four_four")
-
-    font = _load_preview_font(font_name, font_size)
-    ascent, descent = font.getmetrics()
-    line_h = ascent + descent + 6
-    text_header = settings.get("text_header", {})
-    HEADER_LABELS = {
-        "distance": "Dist.",
-        "certainty_percentage": "%",
-        "angle": "Angle",
-        "overworld_coords": "Chunk"
-        if settings.get("overworld_coords_format", "four_four") == "chunk"
-        else "Location",
-        "nether_coords": "Nether",
-    }
+# The previews run the overlay's own renderers, on the running tracker's
+# latest data when it answers on the IPC socket and on the sample above
+# otherwise.
+PREVIEW_VERSION = installed_version(os.path.dirname(os.path.abspath(__file__))) or ""
+PREVIEW_DATA = {
+    "preds": PREVIEW_EYE_DATA,
+    "eye_throws": PREVIEW_EYE_THROWS,
+    "player": PREVIEW_PLAYER,
+    "blind_result": PREVIEW_BLIND,
+    "boat_state": "VALID",
+}
+PREVIEW_LIVE_POLL_MS = 500
 
-    preds = PREVIEW_EYE_DATA[:shown_count]
-    player_x = PREVIEW_PLAYER["xInOverworld"]
-    player_z = PREVIEW_PLAYER["zInOverworld"]
-    h_ang = PREVIEW_PLAYER["horizontalAngle"]
-
-    if show_adj:
-        adj_count_overlays = [
-            ("100.21", "+2", 2),
-            ("98.43", "-1", -1),
-            ("99.00", None, None),
-        ]
-    else:
-        adj_count_overlays = []
-    angle_error_overlays = (
-        [("0.0002",), ("-0.0015",), ("0.0034",)] if show_angle_error else []
-    )
-    n_bottom_rows = max(len(adj_count_overlays), len(angle_error_overlays))
-    _portal_link_flags = []
-    if portal_dist_enabled and PREVIEW_EYE_THROWS:
-        _ft = PREVIEW_EYE_THROWS[0]
-        _approx_nx = (_ft.get("xInOverworld") or 0.0) / 8.0
-        _approx_nz = (_ft.get("zInOverworld") or 0.0) / 8.0
-        for pred in preds:
-            cx = pred.get("chunkX", 0)
-            cz = pred.get("chunkZ", 0)
-            _best_nx = cx * 16 / 8.0 + 0.5
-            _best_nz = cz * 16 / 8.0 + 0.5
-            _max_axis = max(abs(_approx_nx - _best_nx), abs(_approx_nz - _best_nz))
-            _portal_link_flags.append(_max_axis < 24)
-    else:
-        _portal_link_flags = [False] * shown_count
-
-    lines = []
-    for pred_idx, pred in enumerate(preds):
-        cx, cz = pred["chunkX"], pred["chunkZ"]
-        cert = pred["certainty"]
-        dist = pred["overworldDistance"]
-        parts = []
-        for key in order:
-            if not enabled.get(key, True):
-                continue
-            if key == "distance":
-                d = dist / 8 if in_nether else dist
-                parts.append(("distance", (str(int(d)), d)))
-            elif key == "certainty_percentage":
-                pct = round(cert * 100, 1)
-                parts.append(("certainty", f"{pct}%"))
-            elif key == "angle":
-                sx, sz = cx * 16 + 4, cz * 16 + 4
-                if in_nether:
-                    sx /= 8.0
-                    sz /= 8.0
-                    px, pz = player_x / 8.0, player_z / 8.0
-                else:
-                    px, pz = player_x, player_z
-                dx, dz = sx - px, sz - pz
-                tgt = (math.degrees(math.atan2(dz, dx)) + 270) % 360
-                signed = ((tgt + 180) % 360) - 180
-                turn = ((tgt - (h_ang % 360) + 180) % 360) - 180
-
-                show_ang = angle_display_mode in ("angle_and_change", "angle_only")
-                show_change = angle_display_mode in ("angle_and_change", "change_only")
-
-                if show_ang:
-                    parts.append(("text", f"{signed:.2f}"))
-
-                if show_change:
-                    arrow = "->" if turn > 0 else "<-"
-                    parts.append(("angle_change", (arrow, f"{abs(turn):.1f}")))
-            elif key == "overworld_coords":
-                if ow_coords_format == "chunk":
-                    ox, oz = cx, cz
-                elif ow_coords_format == "eight_eight":
-                    ox, oz = cx * 16 + 8, cz * 16 + 8
-                else:
-                    ox, oz = cx * 16 + 4, cz * 16 + 4
-                if show_coords_by_dim and in_nether:
-                    ox, oz = round(ox / 8), round(oz / 8)
-                parts.append(("coords", (ox, oz)))
-            elif key == "nether_coords":
-                nx, nz = cx * 16 + 4, cz * 16 + 4
-                if not (show_coords_by_dim and not in_nether):
-                    nx, nz = round(nx / 8), round(nz / 8)
-                parts.append(("nether_coords_val", (nx, nz)))
-        if parts:
-            _flag = (
-                _portal_link_flags[pred_idx]
-                if pred_idx < len(_portal_link_flags)
-                else False
-            )
-            lines.append((parts, _flag))
 
-    if not lines:
-        img = Image.new("RGBA", (200, 40), bg_rgba)
+def render_sample_preview(kind, settings):
+    data = PREVIEW_DATA
+    if kind == "default_blind":
+        data = dict(PREVIEW_DATA, boat_state="NONE")
+    img = render_preview(kind, settings, data, PREVIEW_VERSION)
+    if img is None:
+        style = custom_style(settings)
+        img = Image.new("RGBA", (200, 40), style["bg_rgba"])
         draw = ImageDraw.Draw(img)
         draw.text(
             (10, 10),
             "(nothing to show)",
-            font=font,
-            fill=_tc(text_rgb),
-            **stroke_kwargs,
+            font=load_font(style["font_name"], style["font_size"]),
+            fill=style["text_rgba"],
+            **style["stroke_kwargs"],
         )
-        return img
-
-    dummy = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
-
-    def _pw(kind, val):
-        if kind == "distance":
-            txt = val[0]
-        elif kind in ("coords", "nether_coords_val"):
-            cx_v, cz_v = val
-            _parts = ["(", str(cx_v), ", ", str(cz_v), ")"]
-            return (
-                sum(
-                    dummy.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p in _parts
-                )
-                + 14
-            )
-        elif kind == "angle_change":
-            full_change = f"({val[0]} {val[1]})"
-            return (
-                dummy.textbbox((0, 0), full_change, font=font, **stroke_width_kwargs)[2]
-                + 14
-            )
-        else:
-            txt = str(val)
-        gap = 14
-        return dummy.textbbox((0, 0), txt, font=font, **stroke_width_kwargs)[2] + gap
-
-    col_widths = []
-    for parts_tuple, _plink in lines:
-        for slot_idx, item in enumerate(parts_tuple):
-            w = _pw(item[0], item[1])
-            if slot_idx >= len(col_widths):
-                col_widths.append(w)
-            else:
-                col_widths[slot_idx] = max(col_widths[slot_idx], w)
-
-    required_w = 10 + sum(col_widths) + 10
-
-    col_x = []
-    cx_acc = 10
-    for w in col_widths:
-        col_x.append(cx_acc)
-        cx_acc += w
-
-    has_header = any(
-        text_header.get(k, "Text") == "Text" for k in order if enabled.get(k, True)
-    )
-    header_h = line_h if has_header else 0
-    show_overlay_header = settings.get("show_overlay_header", False)
-
-    small_font_size = max(8, int(font_size * 0.90))
-    small_font = _load_preview_font(font_name, small_font_size)
-    small_ascent, small_descent = small_font.getmetrics()
-    small_line_h = small_ascent + small_descent + 4
-
-    overlay_header_h = (
-        small_line_h if (show_overlay_header and n_bottom_rows > 0) else 0
-    )
-    bottom_extra_h = (
-        (overlay_header_h + (small_line_h - 2) * n_bottom_rows + 4)
-        if n_bottom_rows > 0
-        else 0
-    )
-    height = header_h + line_h * len(lines) + 10 + bottom_extra_h
-
-    img = Image.new("RGBA", (int(required_w + 10), height), bg_rgba)
-    draw = ImageDraw.Draw(img)
-    if has_header:
-        visible_keys = [k for k in order if enabled.get(k, True)]
-        key_slots = {}
-        slot = 0
-        for key in visible_keys:
-            if key == "angle":
-                slots = []
-                if angle_display_mode in ("angle_and_change", "angle_only"):
-                    slots.append(slot)
-                    slot += 1
-                if angle_display_mode in ("angle_and_change", "change_only"):
-                    slots.append(slot)
-                    slot += 1
-                key_slots[key] = slots
-            else:
-                key_slots[key] = [slot]
-                slot += 1
-        for key in visible_keys:
-            if text_header.get(key, "Text") != "Text":
-                continue
-            slots = key_slots.get(key, [])
-            if not slots:
-                continue
-            first_slot = slots[0]
-            last_slot = slots[-1]
-            if first_slot >= len(col_x) or last_slot >= len(col_widths):
-                continue
-            hdr_txt = HEADER_LABELS.get(key, "")
-            if not hdr_txt:
-                continue
-            tw_hdr = draw.textbbox((0, 0), hdr_txt, font=font, **stroke_width_kwargs)[2]
-            if key == "angle" and angle_display_mode in ("angle_and_change",):
-                change_slot = slots[-1]
-                if change_slot < len(col_x) and change_slot < len(col_widths):
-                    span_start = col_x[change_slot]
-                    col_w_change = col_widths[change_slot]
-                    hx = span_start + (col_w_change - tw_hdr) // 2
-                else:
-                    span_start = col_x[first_slot]
-                    span_end = col_x[last_slot] + col_widths[last_slot]
-                    hx = span_start + (span_end - span_start - tw_hdr) // 2
-            else:
-                span_start = col_x[first_slot]
-                span_end = col_x[last_slot] + col_widths[last_slot]
-                span_w = span_end - span_start
-                hx = span_start + (span_w - tw_hdr) // 2
-            draw.text((hx, 5), hdr_txt, font=font, fill=_tc(text_rgb), **stroke_kwargs)
-
-    _last_turn_pct = [0.0]
-
-    for row, (parts, _portal_link) in enumerate(lines):
-        y = 5 + header_h + row * line_h
-
-        for _item in parts:
-            if _item[0] == "angle_change":
-                try:
-                    _last_turn_pct[0] = float(_item[1][1])
-                except Exception:
-                    pass
-                break
-
-        for slot_idx, item in enumerate(parts):
-            kind, val = item
-            col_left = col_x[slot_idx] if slot_idx < len(col_x) else 10
-            col_w = col_widths[slot_idx] if slot_idx < len(col_widths) else 0
-
-            def _cx(txt):
-                tw = draw.textbbox((0, 0), txt, font=font, **stroke_width_kwargs)[2]
-                return col_left + (col_w - tw) // 2
-
-            if kind == "certainty":
-                txt = val
-                try:
-                    fill = certainty_color(float(txt.rstrip("%")))
-                except Exception:
-                    fill = text_rgb
-                draw.text(
-                    (_cx(txt), y), txt, font=font, fill=_tc(fill), **stroke_kwargs
-                )
-
-            elif kind == "angle_change":
-                arrow, num = val
-                try:
-                    _last_turn_pct[0] = float(num)
-                except Exception:
-                    pass
-                fill = gradient_color(_last_turn_pct[0])
-                full_change = f"({arrow} {num})"
-                cw_ = draw.textbbox(
-                    (0, 0), full_change, font=font, **stroke_width_kwargs
-                )[2]
-                col_start = col_left + (col_w - cw_) // 2
-                draw.text(
-                    (col_start, y),
-                    full_change,
-                    font=font,
-                    fill=_tc(fill),
-                    **stroke_kwargs,
-                )
-
-            elif kind == "distance":
-                try:
-                    txt, dval = val
-                except Exception:
-                    txt = str(val)
-                draw.text(
-                    (_cx(txt), y), txt, font=font, fill=_tc(text_rgb), **stroke_kwargs
-                )
-
-            elif kind == "coords":
-                cx_v, cz_v = val
-                x_str = str(cx_v)
-                z_str = str(cz_v)
-                x_fill = neg_coords_rgb if neg_coords_enabled and cx_v < 0 else text_rgb
-                z_fill = neg_coords_rgb if neg_coords_enabled and cz_v < 0 else text_rgb
-                _parts = [
-                    ("(", text_rgb),
-                    (x_str, x_fill),
-                    (", ", text_rgb),
-                    (z_str, z_fill),
-                    (")", text_rgb),
-                ]
-                _total_w = sum(
-                    draw.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p, _ in _parts
-                )
-                bx = col_left + (col_w - _total_w) // 2
-                for pt, pc in _parts:
-                    draw.text((bx, y), pt, font=font, fill=_tc(pc), **stroke_kwargs)
-                    bx += draw.textbbox((0, 0), pt, font=font, **stroke_width_kwargs)[2]
-
-            elif kind == "nether_coords_val":
-                cx_v, cz_v = val
-                x_str = str(cx_v)
-                z_str = str(cz_v)
-                _is_portal = portal_dist_enabled and _portal_link
-                punct_fill = portal_dist_rgb if _is_portal else text_rgb
-                x_fill = (
-                    portal_dist_rgb
-                    if _is_portal
-                    else (
-                        neg_coords_rgb if neg_coords_enabled and cx_v < 0 else text_rgb
-                    )
-                )
-                z_fill = (
-                    portal_dist_rgb
-                    if _is_portal
-                    else (
-                        neg_coords_rgb if neg_coords_enabled and cz_v < 0 else text_rgb
-                    )
-                )
-                _parts = [
-                    ("(", punct_fill),
-                    (x_str, x_fill),
-                    (", ", punct_fill),
-                    (z_str, z_fill),
-                    (")", punct_fill),
-                ]
-                _total_w = sum(
-                    draw.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p, _ in _parts
-                )
-                bx = col_left + (col_w - _total_w) // 2
-                for pt, pc in _parts:
-                    draw.text((bx, y), pt, font=font, fill=_tc(pc), **stroke_kwargs)
-                    bx += draw.textbbox((0, 0), pt, font=font, **stroke_width_kwargs)[2]
-
-            else:
-                txt = str(val)
-                draw.text(
-                    (_cx(txt), y), txt, font=font, fill=_tc(text_rgb), **stroke_kwargs
-                )
-
-    actual_left = None
-    actual_right = None
-    for parts, _plink_last in lines[-1:]:
-        for slot_idx, item in enumerate(parts):
-            kind, val = item[0], item[1]
-            if slot_idx >= len(col_x) or slot_idx >= len(col_widths):
-                continue
-            c_left = col_x[slot_idx]
-            c_w = col_widths[slot_idx]
-            if kind == "distance":
-                txt = val[0]
-            elif kind in ("coords", "nether_coords_val"):
-                cx_v, cz_v = val
-                txt = f"({cx_v}, {cz_v})"
-                _parts = ["(", str(cx_v), ", ", str(cz_v), ")"]
-                txt_w = sum(
-                    draw.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p in _parts
-                )
-                centered_start = c_left + (c_w - txt_w) // 2
-                centered_end = centered_start + txt_w
-                if actual_left is None or centered_start < actual_left:
-                    actual_left = centered_start
-                if actual_right is None or centered_end > actual_right:
-                    actual_right = centered_end
-                continue
-            elif kind == "angle_change":
-                arrow, num = val
-                arrow_w = draw.textbbox(
-                    (0, 0), arrow, font=font, **stroke_width_kwargs
-                )[2]
-                total_w = (
-                    arrow_w
-                    + 4
-                    + draw.textbbox((0, 0), num, font=font, **stroke_width_kwargs)[2]
-                )
-                centered_start = c_left + (c_w - total_w) // 2
-                centered_end = centered_start + total_w
-                if actual_left is None or centered_start < actual_left:
-                    actual_left = centered_start
-                if actual_right is None or centered_end > actual_right:
-                    actual_right = centered_end
-                continue
-            else:
-                txt = str(val)
-            txt_w = draw.textbbox((0, 0), txt, font=font, **stroke_width_kwargs)[2]
-            centered_start = c_left + (c_w - txt_w) // 2
-            centered_end = centered_start + txt_w
-            if actual_left is None or centered_start < actual_left:
-                actual_left = centered_start
-            if actual_right is None or centered_end > actual_right:
-                actual_right = centered_end
-
-    if actual_left is None:
-        actual_left = 10
-    if actual_right is None:
-        actual_right = 10
-
-    n_overlay_rows = max(len(adj_count_overlays), len(angle_error_overlays))
-    if n_overlay_rows == 0:
-        return img
-
-    overlay_header_h = small_line_h if show_overlay_header else 0
-    base_y = header_h + line_h * len(lines) + 10
-
-    first_err_x = None
-    first_err_w = None
-    first_adj_x = None
-    first_adj_total_w = None
-
-    for oi in range(n_overlay_rows):
-        row_y = base_y + overlay_header_h + oi * (small_line_h - 2) - 2
+    return img
 
-        if oi < len(adj_count_overlays):
-            angle_txt, count_txt, adj_raw = adj_count_overlays[oi]
 
-            angle_w = draw.textbbox(
-                (0, 0), angle_txt, font=small_font, **stroke_width_kwargs
-            )[2]
-            if count_txt is not None:
-                count_w = draw.textbbox(
-                    (0, 0), count_txt, font=small_font, **stroke_width_kwargs
-                )[2]
-            else:
-                count_w = 0
+def render_default_preview(settings: dict) -> Image.Image:
+    return render_sample_preview("default", settings)
 
-            total_w = angle_w + count_w
 
-            if oi == 0:
-                adj_x = actual_right - total_w
-                first_adj_x = adj_x
-                first_adj_total_w = total_w
-            else:
-                adj_x = first_adj_x + (first_adj_total_w - total_w) // 2
-
-            draw.text(
-                (adj_x, row_y),
-                angle_txt,
-                font=small_font,
-                fill=_tc(text_rgb),
-                **stroke_kwargs,
-            )
+def render_default_blind_preview(settings: dict = None) -> Image.Image:
+    return render_sample_preview("default_blind", settings or {})
 
-            if count_txt is not None:
-                adj_fill = ADJ_POS if (adj_raw is None or adj_raw >= 0) else ADJ_NEG
-                draw.text(
-                    (adj_x + angle_w, row_y),
-                    count_txt,
-                    font=small_font,
-                    fill=_tc(adj_fill),
-                    **stroke_kwargs,
-                )
 
-        if oi < len(angle_error_overlays):
-            err_txt = angle_error_overlays[oi][0]
-            err_txt_w = draw.textbbox(
-                (0, 0), err_txt, font=small_font, **stroke_width_kwargs
-            )[2]
-            if oi == 0:
-                err_x = actual_left
-                first_err_x = err_x
-                first_err_w = err_txt_w
-            else:
-                err_x = first_err_x + (first_err_w - err_txt_w) // 2
-            draw.text(
-                (err_x, row_y),
-                err_txt,
-                font=small_font,
-                fill=_tc(text_rgb),
-                **stroke_kwargs,
-            )
+def render_eye_throws_preview(settings: dict) -> Image.Image:
+    return render_sample_preview("eye", settings)
 
-    if show_overlay_header and n_overlay_rows > 0:
-        hdr_y = base_y - 2
-        if angle_error_overlays and first_err_x is not None and first_err_w is not None:
-            err_hdr_w = draw.textbbox(
-                (0, 0), "Error", font=small_font, **stroke_width_kwargs
-            )[2]
-            err_hdr_x = first_err_x + (first_err_w - err_hdr_w) // 2
-            draw.text(
-                (err_hdr_x, hdr_y),
-                "Error",
-                font=small_font,
-                fill=_tc(text_rgb),
-                **stroke_kwargs,
-            )
-        if (
-            adj_count_overlays
-            and first_adj_x is not None
-            and first_adj_total_w is not None
-        ):
-            adj_hdr_w = draw.textbbox(
-                (0, 0), "Angle", font=small_font, **stroke_width_kwargs
-            )[2]
-            adj_hdr_x = first_adj_x + (first_adj_total_w - adj_hdr_w) // 2
-            draw.text(
-                (adj_hdr_x, hdr_y),
-                "Angle",
-                font=small_font,
-                fill=_tc(text_rgb),
-                **stroke_kwargs,
-            )
-    return img
 
+def render_blind_preview(settings: dict) -> Image.Image:
+    return render_sample_preview("blind", settings)
 
-PREVIEW_BLIND = {
-    "evaluation": "HIGHROLL_GOOD",
-    "xInNether": 312,
-    "zInNether": -87,
-    "highrollProbability": 0.734,
-    "highrollThreshold": 400,
-    "improveDirection": math.radians(47),
-    "improveDistance": 62,
-}
 
+def live_generation():
+    try:
+        header, _ = ipc.request("generation", timeout=0.2)
+        return header["generation"]
+    except ipc.IPCError:
+        return None
 
-def render_blind_preview(settings: dict) -> Image.Image:
-    bg_hex = settings.get("background_color", "#1E1E1E")
-    bg_rgb = hex_to_rgb(bg_hex, (255, 255, 255))
-    text_hex = settings.get("text_color", "#000000")
-    text_rgb = hex_to_rgb(text_hex, (0, 0, 0))
-
-    bg_opacity = settings.get("background_opacity", 1.0)
-    text_opacity = settings.get("text_opacity", 1.0)
-
-    text_outline_enabled = settings.get("text_outline_enabled", False)
-    text_outline_hex = settings.get("text_outline_color", "#000000")
-    text_outline_rgb = hex_to_rgb(text_outline_hex, (0, 0, 0))
-    text_outline_width = settings.get("text_outline_width", 2)
-    outline_rgba = (*text_outline_rgb, int(text_opacity * 255))
-
-    stroke_kwargs = {}
-    stroke_width_kwargs = {}
-    if text_outline_enabled:
-        stroke_kwargs = {
-            "stroke_width": text_outline_width,
-            "stroke_fill": outline_rgba,
-        }
-        stroke_width_kwargs = {
-            "stroke_width": text_outline_width,
-        }
-
-    def _bc(c):
-        return (*c[:3], int(bg_opacity * 255))
-
-    def _tc(c):
-        return (*c[:3], int(text_opacity * 255))
-
-    bg_rgba = _bc(bg_rgb)
-
-    font_name = settings.get("font_name", "")
-    font_size = settings.get("font_size", 18)
-    font = _load_preview_font(font_name, font_size)
-    ascent, descent = font.getmetrics()
-    line_h = ascent + descent + 6
-
-    br = PREVIEW_BLIND
-    evaluation = br["evaluation"]
-    x_nether = br["xInNether"]
-    z_nether = br["zInNether"]
-    highroll_prob = br["highrollProbability"] * 100
-    highroll_thresh = br["highrollThreshold"]
-    improve_deg = math.degrees(br["improveDirection"])
-    improve_dist = br["improveDistance"]
-
-    eval_text = format_blind_evaluation(evaluation)
-    eval_color = blind_evaluation_color(evaluation)
-    line1_pre = f"Blind coords ({int(x_nether)}, {int(z_nether)}) are "
-    line1_eval = eval_text
-    highroll_txt = f"{highroll_prob:.1f}%"
-    line2_post = f" chance of <{int(highroll_thresh)} block blind"
-    line3 = f"Head {improve_deg:.0f}°, {round(improve_dist)} blocks away, for better coords."
-
-    dummy = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
-
-    def tw(t):
-        return dummy.textbbox((0, 0), t, font=font, **stroke_width_kwargs)[2]
-
-    max_w = max(
-        tw(line1_pre) + tw(line1_eval), tw(highroll_txt) + tw(line2_post), tw(line3)
-    )
-    height = line_h * 3 + 20
-    pad = 10
-    img = Image.new("RGBA", (int(max_w + 2 * pad), height), bg_rgba)
-    draw = ImageDraw.Draw(img)
-
-    x, y = pad, 10
-    draw.text((x, y), line1_pre, font=font, fill=_tc(text_rgb), **stroke_kwargs)
-    draw.text(
-        (x + tw(line1_pre), y),
-        line1_eval,
-        font=font,
-        fill=_tc(eval_color),
-        **stroke_kwargs,
-    )
-
-    y += line_h
-    draw.text((pad, y), highroll_txt, font=font, fill=_tc(eval_color), **stroke_kwargs)
-    draw.text(
-        (pad + tw(highroll_txt), y),
-        line2_post,
-        font=font,
-        fill=_tc(text_rgb),
-        **stroke_kwargs,
-    )
-
-    y += line_h
-    draw.text((pad, y), line3, font=font, fill=_tc(text_rgb), **stroke_kwargs)
 
-    return img
+def render_live_preview(kind, settings):
+    # None when no tracker is running or it has no data for this preview yet.
+    try:
+        header, payload = ipc.request("preview", timeout=1.0, kind=kind, settings=settings)
+    except ipc.IPCError:
+        return None
+    return ipc.reply_image(header, payload)
 
 
 def ensure_custom_file_exists():
@@ -1527,8 +219,7 @@ def ensure_custom_file_exists():
     if not os.path.isdir(cfg_dir):
         os.makedirs(cfg_dir)
     if not os.path.isfile(CUSTOM_PATH):
-        with open(CUSTOM_PATH, "w") as f:
-            json.dump(DEFAULT_CUSTOMIZATIONS, f, indent=4)
+        write_json_atomic(CUSTOM_PATH, DEFAULT_CUSTOMIZATIONS)
 
 
 def load_customizations():
@@ -1550,9 +241,47 @@ def load_customizations():
         return DEFAULT_CUSTOMIZATIONS.copy()
 
 
+# Saves are made by the user and written right away, the Customizer can be
+# closed or killed right after.
+_custom_writer = JsonWriter(CUSTOM_PATH)
+atexit.register(_custom_writer.flush)
+
+
 def save_customizations(data):
-    with open(CUSTOM_PATH, "w") as f:
-        json.dump(data, f, indent=4)
+    _custom_writer.save(data)
+    _custom_writer.flush()
+
+
+def load_saved_customizations():
+    try:
+        with open(CUSTOM_PATH, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def apply_customizations(data, saved):
+    # A running tracker validates and applies the changed keys right away and
+    # writes customizations.json itself. Without one the file is written here
+    # and picked up on the tracker's next start. Settings the tracker rejects
+    # raise ipc.IPCRejected and are neither written nor marked as saved, the
+    # same checks raise ValueError here before the file is written without it.
+    validate_customizations(data)
+    changes = {k: v for k, v in data.items() if k not in saved or saved[k] != v}
+    removed = [k for k in saved if k not in data]
+    # An earlier save that is still queued must not land after the tracker's.
+    _custom_writer.flush()
+    try:
+        ipc.request("apply", timeout=1.0, changes=changes, removed=removed)
+    except ipc.IPCRejected:
+        raise
+    except ipc.IPCError:
+        save_customizations(data)
+    saved.clear()
+    saved.update(copy.deepcopy(data))
 
 
 def swap_positions(lst, idx, direction):
@@ -1784,50 +513,16 @@ def is_valid_hex(s):
         return False
 
 
-def find_system_fonts():
-    fonts = {}
-
-    search_dirs = [
-        "/usr/share/fonts",
-        "/usr/local/share/fonts",
-        "/run/current-system/sw/share/fonts",
-        os.path.expanduser("~/.fonts"),
-        os.path.expanduser("~/.local/share/fonts"),
-    ]
-    for d in search_dirs:
-        if not os.path.isdir(d):
-            continue
-        for root, dirs, files in os.walk(d):
-            for fname in files:
-                if fname.lower().endswith((".ttf", ".otf")):
-                    path = os.path.join(root, fname)
-                    display = os.path.splitext(fname)[0]
-                    fonts[display] = path
-
-    if not fonts:
-        try:
-            result = subprocess.run(
-                ["fc-list", "--format=%{file}\n"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            for line in result.stdout.splitlines():
-                path = line.strip()
-                if (
-                    path
-                    and os.path.isfile(path)
-                    and path.lower().endswith((".ttf", ".otf"))
-                ):
-                    display = os.path.splitext(os.path.basename(path))[0]
-                    fonts[display] = path
-        except Exception:
-            pass
-
-    sorted_fonts = dict(sorted(fonts.items(), key=lambda x: x[0].lower()))
+def find_system_fonts(index, extra_path=None):
+    fonts = font_choices(index)
+    # A saved font that the index has not picked up yet stays selectable.
+    if extra_path and extra_path != BUNDLED_FONT_PATH and extra_path not in fonts.values():
+        if os.path.isfile(extra_path):
+            fonts[os.path.splitext(os.path.basename(extra_path))[0]] = extra_path
+            fonts = dict(sorted(fonts.items(), key=lambda x: x[0].lower()))
 
     result_fonts = {BUNDLED_FONT_DISPLAY: BUNDLED_FONT_PATH}
-    result_fonts.update(sorted_fonts)
+    result_fonts.update(fonts)
     return result_fonts
 
 
@@ -1911,85 +606,47 @@ def _collect_blind_settings(vars_dict: dict) -> dict:
     }
 
 
-def open_default_preview(vars_dict: dict):
-    win = tk.Toplevel()
-    win.title("Default Overlay — Preview")
-    win.resizable(False, False)
+# ---- Previews ----
 
-    lbl = tk.Label(win, bd=0, highlightthickness=0)
-    lbl.pack(padx=20, pady=20)
+# Previews re-render when one of the Tk variables they read is written, plus
+# notify_previews() for state that has no variable (text order, angle combo).
+PREVIEW_DEBOUNCE_MS = 50
+PREVIEW_CACHE_SIZE = 16
 
-    tk.Button(win, text="Exit", command=win.destroy).pack(pady=(0, 10))
+_preview_listeners = []
 
-    _tk_img_ref = [None]
-    _running = [True]
-    _first_frame = [True]
 
-    def _refresh():
-        if not _running[0] or not win.winfo_exists():
-            return
-        try:
-            settings = _collect_default_settings(vars_dict)
-            pil_img = render_default_preview(settings)
-            tk_img = ImageTk.PhotoImage(pil_img)
-            _tk_img_ref[0] = tk_img
-            lbl.config(image=tk_img)
-            if _first_frame[0]:
-                win.geometry("")
-                _first_frame[0] = False
-        except Exception:
-            pass
-        win.after(300, _refresh)
+def notify_previews():
+    for cb in list(_preview_listeners):
+        cb()
 
-    def _on_close():
-        _running[0] = False
-        win.destroy()
-
-    win.protocol("WM_DELETE_WINDOW", _on_close)
-    _refresh()
 
+def _preview_variables(vars_dict):
+    found = []
+    for value in (vars_dict or {}).values():
+        if isinstance(value, tk.Variable):
+            found.append(value)
+        elif isinstance(value, dict):
+            found.extend(v for v in value.values() if isinstance(v, tk.Variable))
+    return found
 
-def open_eye_preview(vars_dict: dict):
-    win = tk.Toplevel()
-    win.title("Eye Throws Overlay Preview")
-    win.resizable(False, False)
 
-    lbl = tk.Label(win, bd=0, highlightthickness=0)
-    lbl.pack(padx=20, pady=20)
-
-    tk.Button(win, text="Exit", command=win.destroy).pack(pady=(0, 10))
-
-    _tk_img_ref = [None]
-    _running = [True]
-    _first_frame = [True]
-
-    def _refresh():
-        if not _running[0] or not win.winfo_exists():
-            return
+def _in_background(win, work, done):
+    # Requests to the tracker block, they run off the Tk thread and the result
+    # is handed back to it. Dropped if the window is gone by then.
+    def run():
+        result = work()
         try:
-            settings = _collect_eye_settings(vars_dict)
-            pil_img = render_eye_throws_preview(settings)
-            tk_img = ImageTk.PhotoImage(pil_img)
-            _tk_img_ref[0] = tk_img
-            lbl.config(image=tk_img)
-            if _first_frame[0]:
-                win.geometry("")
-                _first_frame[0] = False
-        except Exception:
+            win.after(0, lambda: win.winfo_exists() and done(result))
+        except (RuntimeError, tk.TclError):
             pass
-        win.after(300, _refresh)
 
-    def _on_close():
-        _running[0] = False
-        win.destroy()
-
-    win.protocol("WM_DELETE_WINDOW", _on_close)
-    _refresh()
+    threading.Thread(target=run, daemon=True).start()
 
 
-def open_default_blind_preview(vars_dict: dict = None):
+def _open_preview(title, kind, collect, vars_dict):
     win = tk.Toplevel()
-    win.title("Default Blind Coords Overlay Preview")
+    win.title(title)
     win.resizable(False, False)
 
     lbl = tk.Label(win, bd=0, highlightthickness=0)
@@ -1998,69 +655,141 @@ def open_default_blind_preview(vars_dict: dict = None):
     tk.Button(win, text="Exit", command=win.destroy).pack(pady=(0, 10))
 
     _tk_img_ref = [None]
-    _running = [True]
-    _first_frame = [True]
-
-    def _refresh():
-        if not _running[0] or not win.winfo_exists():
-            return
-        try:
-            settings = _collect_default_settings(vars_dict) if vars_dict else {}
-            pil_img = render_default_blind_preview(settings)
+    _pending = [None]
+    _last_key = [None]
+    _cache = {}
+    _live_gen = [None]
+    # A live preview request in flight, and whether settings changed meanwhile.
+    _requesting = [False]
+    _stale = [False]
+
+    def _show(key, pil_img):
+        _cache[key] = pil_img
+        while len(_cache) > PREVIEW_CACHE_SIZE:
+            del _cache[next(iter(_cache))]
+
+        tk_img = _tk_img_ref[0]
+        if tk_img is not None and (tk_img.width(), tk_img.height()) == pil_img.size:
+            tk_img.paste(pil_img)
+        else:
             tk_img = ImageTk.PhotoImage(pil_img)
             _tk_img_ref[0] = tk_img
             lbl.config(image=tk_img)
-            if _first_frame[0]:
-                win.geometry("")
-                _first_frame[0] = False
+            win.geometry("")
+        _last_key[0] = key
+
+    def _render():
+        _pending[0] = None
+        if not win.winfo_exists():
+            return
+        if _requesting[0]:
+            _stale[0] = True
+            return
+        try:
+            settings = collect(vars_dict)
+            key = (json.dumps(settings, sort_keys=True, default=str), _live_gen[0])
+            if key == _last_key[0]:
+                return
+            pil_img = _cache.pop(key, None)
+            if pil_img is not None:
+                _show(key, pil_img)
+            elif _live_gen[0] is not None:
+                _requesting[0] = True
+                _in_background(
+                    win,
+                    lambda: render_live_preview(kind, settings),
+                    lambda live_img: _live_done(key, settings, live_img),
+                )
+            else:
+                win.title(title)
+                _show(key, render_sample_preview(kind, settings))
         except Exception:
             pass
-        win.after(300, _refresh)
-
-    def _on_close():
-        _running[0] = False
-        win.destroy()
 
-    win.protocol("WM_DELETE_WINDOW", _on_close)
-    _refresh()
+    def _live_done(key, settings, live_img):
+        _requesting[0] = False
+        try:
+            win.title(f"{title} (live)" if live_img is not None else title)
+            _show(key, live_img or render_sample_preview(kind, settings))
+        except Exception:
+            pass
+        if _stale[0]:
+            _stale[0] = False
+            _render()
+
+    def _schedule(*_):
+        if _pending[0] is None and win.winfo_exists():
+            _pending[0] = win.after(PREVIEW_DEBOUNCE_MS, _render)
+
+    # A running tracker bumps its generation whenever Ninjabrain Bot's data
+    # changes, the preview follows it without re-rendering in between.
+    def _poll_live():
+        if win.winfo_exists():
+            _in_background(win, live_generation, _live_polled)
+
+    def _live_polled(gen):
+        if gen != _live_gen[0]:
+            _live_gen[0] = gen
+            _schedule()
+        win.after(PREVIEW_LIVE_POLL_MS, _poll_live)
+
+    traces = [(var, var.trace_add("write", _schedule)) for var in _preview_variables(vars_dict)]
+    _preview_listeners.append(_schedule)
+
+    def _on_destroy(event):
+        if event.widget is not win:
+            return
+        if _schedule in _preview_listeners:
+            _preview_listeners.remove(_schedule)
+        if _pending[0] is not None:
+            win.after_cancel(_pending[0])
+            _pending[0] = None
+        for var, trace_id in traces:
+            try:
+                var.trace_remove("write", trace_id)
+            except tk.TclError:
+                pass
+
+    win.bind("<Destroy>", _on_destroy)
+    # The sample shows right away, the first poll switches to the live data.
+    _render()
+    _poll_live()
 
 
-def open_blind_preview(vars_dict: dict):
-    win = tk.Toplevel()
-    win.title("Blind Coords Overlay — Preview")
-    win.resizable(False, False)
+def open_default_preview(vars_dict: dict):
+    _open_preview(
+        "Default Overlay — Preview",
+        "default",
+        _collect_default_settings,
+        vars_dict,
+    )
 
-    lbl = tk.Label(win, bd=0, highlightthickness=0)
-    lbl.pack(padx=20, pady=20)
 
-    tk.Button(win, text="Exit", command=win.destroy).pack(pady=(0, 10))
+def open_eye_preview(vars_dict: dict):
+    _open_preview(
+        "Eye Throws Overlay Preview",
+        "eye",
+        _collect_eye_settings,
+        vars_dict,
+    )
 
-    _tk_img_ref = [None]
-    _running = [True]
-    _first_frame = [True]
 
-    def _refresh():
-        if not _running[0] or not win.winfo_exists():
-            return
-        try:
-            settings = _collect_blind_settings(vars_dict)
-            pil_img = render_blind_preview(settings)
-            tk_img = ImageTk.PhotoImage(pil_img)
-            _tk_img_ref[0] = tk_img
-            lbl.config(image=tk_img)
-            if _first_frame[0]:
-                win.geometry("")
-                _first_frame[0] = False
-        except Exception:
-            pass
-        win.after(300, _refresh)
+def open_default_blind_preview(vars_dict: dict = None):
+    _open_preview(
+        "Default Blind Coords Overlay Preview",
+        "default_blind",
+        lambda v: _collect_default_settings(v) if v else {},
+        vars_dict,
+    )
 
-    def _on_close():
-        _running[0] = False
-        win.destroy()
 
-    win.protocol("WM_DELETE_WINDOW", _on_close)
-    _refresh()
+def open_blind_preview(vars_dict: dict):
+    _open_preview(
+        "Blind Coords Overlay — Preview",
+        "blind",
+        _collect_blind_settings,
+        vars_dict,
+    )
 
 
 def open_text_outline_settings(enabled_var, color_var, width_var):
@@ -2114,6 +843,7 @@ def open_text_outline_settings(enabled_var, color_var, width_var):
 def main():
     ensure_custom_file_exists()
     custom = load_customizations()
+    saved_custom = load_saved_customizations()
 
     root = tk.Tk()
     root.title("NBTrackr Settings")
@@ -2156,10 +886,11 @@ def main():
     f5.pack(fill="x", pady=5)
     tk.Label(f5, text="Font", width=26, anchor="w").pack(side="left")
 
-    system_fonts = find_system_fonts()
+    saved_font_path = custom.get("font_name", "")
+    font_index = load_font_index()
+    system_fonts = find_system_fonts(font_index, saved_font_path)
     font_path_to_display = {v: k for k, v in system_fonts.items()}
 
-    saved_font_path = custom.get("font_name", "")
     if not saved_font_path or saved_font_path == BUNDLED_FONT_PATH:
         saved_font_display = BUNDLED_FONT_DISPLAY
     else:
@@ -2174,14 +905,46 @@ def main():
     font_dropdown.bind("<<ComboboxSelected>>", lambda e: e.widget.selection_clear())
 
     def apply_font_dropdown(*_):
+        info = font_index["fonts"].get(system_fonts.get(font_var.get()), {})
         try:
-            font_dropdown.configure(font=(font_var.get(), 10))
+            font_dropdown.configure(font=(info.get("family") or font_var.get(), 10))
         except tk.TclError:
             font_dropdown.configure(font=("Helvetica", 10))
 
     font_var.trace_add("write", apply_font_dropdown)
     root.after(100, apply_font_dropdown)
 
+    # The dropdown starts from the cached index, the font directories are
+    # rescanned in the background once the window is up.
+    _font_index_result = []
+
+    def _refresh_font_index():
+        new_index = refresh_font_index(font_index)
+        if new_index != font_index:
+            save_font_index(new_index)
+        _font_index_result.append(new_index)
+
+    def _apply_font_index():
+        if not _font_index_result:
+            root.after(200, _apply_font_index)
+            return
+        font_index.clear()
+        font_index.update(_font_index_result.pop())
+        fonts = find_system_fonts(font_index, saved_font_path)
+        system_fonts.clear()
+        system_fonts.update(fonts)
+        font_path_to_display.clear()
+        font_path_to_display.update({v: k for k, v in system_fonts.items()})
+        font_dropdown["values"] = list(system_fonts.keys())
+        apply_font_dropdown()
+        notify_previews()
+
+    def _start_font_index_refresh():
+        threading.Thread(target=_refresh_font_index, daemon=True).start()
+        root.after(200, _apply_font_index)
+
+    root.after(300, _start_font_index_refresh)
+
     f_size = tk.Frame(g)
     f_size.pack(fill="x", pady=5)
     tk.Label(f_size, text="Font size", width=26, anchor="w").pack(side="left")
@@ -2413,7 +1176,11 @@ def main():
         _ANG_DISPLAY.get(ang_mode_var.get(), _ANG_DISPLAY["angle_and_change"])
     )
     ang_mode_combo.pack(side="left", padx=5)
-    ang_mode_combo.bind("<<ComboboxSelected>>", lambda ev: ev.widget.selection_clear())
+    def _on_ang_mode_selected(ev):
+        ev.widget.selection_clear()
+        notify_previews()
+
+    ang_mode_combo.bind("<<ComboboxSelected>>", _on_ang_mode_selected)
 
     f4 = tk.Frame(e)
     f4.pack(fill="x", pady=5)
@@ -2586,6 +1353,7 @@ def main():
             buttons[key] = (btnL, btnR)
 
         _apply_eye_button_states()
+        notify_previews()
 
     def _apply_eye_button_states():
         en = use_var.get()
@@ -2699,6 +1467,91 @@ def main():
     )
     max_rate_hint.pack(fill="x", pady=(0, 5))
 
+    f_cpu_budget = tk.Frame(adv)
+    f_cpu_budget.pack(fill="x", pady=(5, 0))
+    tk.Label(f_cpu_budget, text="Polling CPU budget (%)", width=26, anchor="w").pack(
+        side="left"
+    )
+    cpu_budget_var = tk.DoubleVar(
+        value=custom.get("poll_cpu_budget", DEFAULT_CUSTOMIZATIONS["poll_cpu_budget"])
+    )
+    tk.Entry(f_cpu_budget, textvariable=cpu_budget_var, width=8).pack(
+        side="left", padx=5
+    )
+    cpu_budget_hint = tk.Label(
+        adv,
+        text="  Default 2%. Polling slows down instead of using more of one CPU core.",
+        anchor="w",
+        fg="#666666",
+        font=("Helvetica", 9, "italic"),
+    )
+    cpu_budget_hint.pack(fill="x", pady=(0, 5))
+
+    f_render_worker = tk.Frame(adv)
+    f_render_worker.pack(fill="x", pady=(5, 0))
+    render_worker_var = tk.BooleanVar(
+        value=custom.get(
+            "render_worker_enabled", DEFAULT_CUSTOMIZATIONS["render_worker_enabled"]
+        )
+    )
+    tk.Label(
+        f_render_worker, text="Render overlay in a separate process", anchor="w"
+    ).pack(side="left")
+    tk.Checkbutton(f_render_worker, variable=render_worker_var, relief="flat", bd=0).pack(
+        side="left", padx=5
+    )
+    render_worker_hint = tk.Label(
+        adv,
+        text="  Keeps the overlay responsive with large fonts or outlines. Requires a restart.",
+        anchor="w",
+        fg="#666666",
+        font=("Helvetica", 9, "italic"),
+    )
+    render_worker_hint.pack(fill="x", pady=(0, 5))
+
+    f_render_workers = tk.Frame(adv)
+    f_render_workers.pack(fill="x", pady=(5, 0))
+    tk.Label(f_render_workers, text="Render processes", width=26, anchor="w").pack(
+        side="left"
+    )
+    render_workers_var = tk.IntVar(
+        value=custom.get("render_workers", DEFAULT_CUSTOMIZATIONS["render_workers"])
+    )
+    tk.Spinbox(
+        f_render_workers, from_=1, to=16, textvariable=render_workers_var, width=5
+    ).pack(side="left", padx=5)
+    render_workers_hint = tk.Label(
+        adv,
+        text="  Default 1, up to 16. Only used with the separate process. Requires a restart.",
+        anchor="w",
+        fg="#666666",
+        font=("Helvetica", 9, "italic"),
+    )
+    render_workers_hint.pack(fill="x", pady=(0, 5))
+
+    f_background_updates = tk.Frame(adv)
+    f_background_updates.pack(fill="x", pady=(5, 0))
+    background_updates_var = tk.BooleanVar(
+        value=custom.get(
+            "background_updates_enabled",
+            DEFAULT_CUSTOMIZATIONS["background_updates_enabled"],
+        )
+    )
+    tk.Label(
+        f_background_updates, text="Download updates in the background", anchor="w"
+    ).pack(side="left")
+    tk.Checkbutton(
+        f_background_updates, variable=background_updates_var, relief="flat", bd=0
+    ).pack(side="left", padx=5)
+    background_updates_hint = tk.Label(
+        adv,
+        text="  New releases are installed the next time NBTrackr starts. Requires a restart.",
+        anchor="w",
+        fg="#666666",
+        font=("Helvetica", 9, "italic"),
+    )
+    background_updates_hint.pack(fill="x", pady=(0, 5))
+
     f_hide_method = tk.Frame(adv)
     f_hide_method.pack(fill="x", pady=5)
     tk.Label(f_hide_method, text="Window hide method", width=26, anchor="w").pack(
@@ -2872,6 +1725,26 @@ def main():
             )
             return
 
+        try:
+            cpu_budget_val = float(cpu_budget_var.get())
+            if cpu_budget_val <= 0:
+                raise ValueError
+        except (ValueError, tk.TclError):
+            messagebox.showerror(
+                "Invalid Value", "Polling CPU budget must be a positive number."
+            )
+            return
+
+        try:
+            render_workers_val = int(render_workers_var.get())
+            if not 1 <= render_workers_val <= 16:
+                raise ValueError
+        except (ValueError, tk.TclError):
+            messagebox.showerror(
+                "Invalid Value", "Render processes must be a whole number from 1 to 16."
+            )
+            return
+
         if idle_val < max_val:
             messagebox.showerror(
                 "Invalid Value",
@@ -2912,6 +1785,10 @@ def main():
                 "debug_mode": debug_var.get(),
                 "idle_api_polling_rate": idle_val,
                 "max_api_polling_rate": max_val,
+                "poll_cpu_budget": cpu_budget_val,
+                "render_worker_enabled": render_worker_var.get(),
+                "render_workers": render_workers_val,
+                "background_updates_enabled": background_updates_var.get(),
                 "portal_nether_color_enabled": portal_dist_enabled_var.get(),
                 "portal_nether_color": portal_dist_color_var.get().strip(),
                 "auto_hide_window": auto_hide_var.get(),
@@ -2925,7 +1802,16 @@ def main():
                 "text_outline_width": text_outline_width_var.get(),
             }
         )
-        save_customizations(custom)
+        try:
+            apply_customizations(custom, saved_custom)
+        except ipc.IPCRejected as e:
+            messagebox.showerror(
+                "Settings Not Saved", f"NBTrackr rejected these settings: {e}"
+            )
+            return
+        except ValueError as e:
+            messagebox.showerror("Settings Not Saved", f"Invalid setting: {e}")
+            return
         messagebox.showinfo(
             "Settings Saved", "Your settings have been saved successfully."
         )
@@ -2934,7 +1820,13 @@ def main():
         if messagebox.askyesno(
             "Reset Settings", "Are you sure you want to reset to defaults?"
         ):
-            save_customizations(DEFAULT_CUSTOMIZATIONS.copy())
+            try:
+                apply_customizations(DEFAULT_CUSTOMIZATIONS, saved_custom)
+            except (ipc.IPCRejected, ValueError) as e:
+                messagebox.showerror(
+                    "Settings Not Reset", f"NBTrackr rejected the defaults: {e}"
+                )
+                return
             custom.clear()
             custom.update(DEFAULT_CUSTOMIZATIONS)
             use_var.set(custom["use_custom_pinned_image"])
@@ -2993,6 +1885,10 @@ def main():
             debug_var.set(custom["debug_mode"])
             idle_rate_var.set(custom["idle_api_polling_rate"])
             max_rate_var.set(custom["max_api_polling_rate"])
+            cpu_budget_var.set(custom["poll_cpu_budget"])
+            render_worker_var.set(custom["render_worker_enabled"])
+            render_workers_var.set(custom["render_workers"])
+            background_updates_var.set(custom["background_updates_enabled"])
             auto_hide_var.set(custom.get("auto_hide_window", True))
             hide_method_var.set(
                 _HIDE_METHOD_DISPLAY.get(
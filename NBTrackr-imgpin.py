@@ -1,19 +1,40 @@
 import sys
-import math
 import os
 import threading
 import time
-import requests
 import json
-import re
 import signal
+import atexit
+import io
 from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
-from PyQt5.QtWidgets import QApplication, QLabel, QWidget, QVBoxLayout
-from PyQt5.QtCore import Qt, QObject, pyqtSignal
-from PyQt5.QtGui import QPixmap, QImage
-from shared.colors import gradient_color, certainty_color, blind_evaluation_color, hex_to_rgb, with_alpha, format_blind_evaluation
-from core.updater import check_for_update, check_and_update
+from core.startup_profiler import StartupProfiler
+
+# Installed before the heavy imports below so --profile-startup sees them.
+# PyQt5 and core.updater (requests) are only imported where they are used.
+_startup = StartupProfiler(enabled="--profile-startup" in sys.argv)
+
+from PIL import Image
+from shared.colors import hex_to_rgb
+from core.render_worker import RenderWorkerPool, RenderWorkerError
+from core.nb_client import Backoff, NinjabrainBotClient
+from core.session_recorder import SessionRecorder, default_recording_path
+from core.poll_planner import DEFAULT_CPU_BUDGET, PollPlanner, PollRateController
+from core.ipc import IPCRejected, IPCServer, image_reply
+from core.config_checks import usable_customizations, validate_customizations
+from core.config_store import JsonWriter, file_generation
+from core.profiler import FrameProfiler
+from shared.layout import custom_bottom_rows, custom_lines
+from shared.render import (
+    custom_style,
+    render_custom_blind,
+    render_custom_boat_icon,
+    render_custom_overlay,
+    render_custom_text,
+    render_nb_failed_standalone,
+    render_nb_stronghold,
+    render_preview,
+    PREVIEW_KINDS,
+)
 
 # Program Version
 APP_VERSION = "v2.6.0"
@@ -26,6 +47,12 @@ HEADLESS = "--headless" in sys.argv
 LOCK_OVERLAY = "--lock-overlay" in sys.argv
 CLICK_THROUGH = "--click-through" in sys.argv
 DEBUG_MODE_FLAG = "--debug" in sys.argv
+UPDATE_FLAG = "--update" in sys.argv
+NO_UPDATE_CHECK_FLAG = "--no-update-check" in sys.argv
+RECORD_PATH = next(
+    (arg.split("=", 1)[1] for arg in sys.argv if arg.startswith("--record=")), None
+)
+RECORD_FLAG = "--record" in sys.argv or RECORD_PATH is not None
 
 position_set = False
 
@@ -40,28 +67,60 @@ _last_blind_resp = None
 _last_info_resp = None
 _cached_customizations = None
 
-_last_custom_mtime = 0
+_last_custom_file = None
 _last_overlay_w = 0
 _last_overlay_h = 0
 _window_visible = False
+_last_frame = None
+# Held while a frame is rendered, previews requested over IPC are rendered on
+# the socket thread and must not use the shared fonts at the same time.
+_render_lock = threading.Lock()
+_recorder = None
+_shutdown = threading.Event()
+_exit_code = 0
 
 
 def get_customizations():
-    global _cached_customizations
+    global _cached_customizations, _last_custom_file
     if _cached_customizations is not None:
         return _cached_customizations
     try:
+        _last_custom_file = file_generation(CUSTOMIZATIONS_FILE)
         with open(CUSTOMIZATIONS_FILE, "r") as f:
-            _cached_customizations = json.load(f)
-    except Exception:
+            custom = json.load(f)
+        if not isinstance(custom, dict):
+            raise ValueError("not an object")
+    except Exception as e:
+        if not isinstance(e, OSError):
+            _report_config(f"Ignoring customizations.json, using the defaults: {e}")
         _cached_customizations = {}
+        return _cached_customizations
+    _cached_customizations = _usable_customizations(custom)
     return _cached_customizations
 
 
+def _report_config(message):
+    # Shown outside debug mode too, a rejected setting silently falling back
+    # to its default looks like the tracker ignoring the Customizer.
+    print(f"[Config] {message}")
+
+
+def _usable_customizations(custom):
+    custom, errors = usable_customizations(
+        custom, IDLE_API_POLLING_RATE, MAX_API_POLLING_RATE
+    )
+    # Both polling rates are dropped for the same reason.
+    for error in dict.fromkeys(errors.values()):
+        _report_config(f"Ignoring customizations.json setting, {error}")
+    return custom
+
+
 def _load_advanced_settings():
     try:
         with open(CUSTOMIZATIONS_FILE, "r") as f:
             data = json.load(f)
+        # Rejected keys are reported once get_customizations() loads the file.
+        data, _ = usable_customizations(data, 0.3, 0.15)
         return (
             bool(data.get("debug_mode", False)),
             float(data.get("idle_api_polling_rate", 0.3)),
@@ -82,108 +141,26 @@ else:
     def log(*args):
         pass
 
-
-ADJ_COUNT_POSITIVE = (117, 204, 108)
-ADJ_COUNT_NEGATIVE = (204, 110, 114)
-
-
-def _strip_html(text):
-    return re.sub(r"<[^>]+>", "", text)
+# Per-stage frame timings, only collected in debug mode. Send SIGUSR1 to dump
+# them as JSON.
+_profiler = FrameProfiler(enabled=DEBUG_MODE or DEBUG_MODE_FLAG, log=log)
 
 
 # --------------------- Cache End --------------------------
 
 
-def _get_assets_dir():
-    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
-
-
-_nb_font_missing_warned = False
-
-
-def _load_nb_font(size):
-    global _nb_font_missing_warned
-    assets_dir = _get_assets_dir()
-    font_path = os.path.join(assets_dir, "LiberationSans", "LiberationSans-Bold.ttf")
-    if os.path.isfile(font_path):
-        try:
-            return ImageFont.truetype(font_path, size)
-        except Exception:
-            pass
-    if not _nb_font_missing_warned:
-        print(
-            "ERROR: Could not find the bundled font at:\n"
-            f"  {font_path}\n"
-            "The overlay text will use a fallback font and may look incorrect.\n"
-            "Please reinstall NBTrackr to restore the missing file."
-        )
-        _nb_font_missing_warned = True
-    return ImageFont.load_default()
-
-
-NB_BG = (55, 60, 66, 255)
-NB_HEADER_BG = (45, 50, 56, 255)
-NB_HEADER_FG = (229, 229, 229)
-NB_ROW_BG = (55, 60, 66, 255)
-NB_TEXT = (255, 255, 255)
-NB_THROW_HEADER_FG = (192, 192, 192)
-
-NB_HDR_SEP = (33, 37, 41, 255)
-NB_ROW_SEP = (42, 46, 50, 255)
-
 # --------------------- Generate default pinned image overlay ---------------
 
 _last_default_stronghold = None
 _last_default_boat = None
-_last_default_blind = None
-
-
-def _interpolate_color(c1, c2, steps, step):
-    r = int(c1[0] + (c2[0] - c1[0]) * step / max(steps - 1, 1))
-    g = int(c1[1] + (c2[1] - c1[1]) * step / max(steps - 1, 1))
-    b = int(c1[2] + (c2[2] - c1[2]) * step / max(steps - 1, 1))
-    return (r, g, b)
-
-
-_RED_HEX = (189, 65, 65)
-_YELLOW = (216, 192, 100)
-_GREEN_HEX = (89, 185, 75)
-
-
-def _nb_certainty_color(certainty_pct):
-    if certainty_pct >= 50:
-        return _interpolate_color(_YELLOW, _GREEN_HEX, 51, int(certainty_pct - 50))
-    else:
-        return _interpolate_color(_RED_HEX, _YELLOW, 51, int(certainty_pct))
-
-
-def _nb_direction_color(direction):
-    abs_dir = abs(direction)
-    if abs_dir <= 180:
-        return _interpolate_color(_RED_HEX, _GREEN_HEX, 181, int(180 - abs_dir))
-    return _YELLOW
-
-
-def _nb_blind_eval_color(evaluation):
-    mapping = {
-        "EXCELLENT": (_YELLOW, _GREEN_HEX, 51, 50),
-        "HIGHROLL_GOOD": (_YELLOW, _GREEN_HEX, 51, 40),
-        "HIGHROLL_OKAY": (_YELLOW, _GREEN_HEX, 51, 25),
-        "BAD_BUT_IN_RING": (_YELLOW, _GREEN_HEX, 51, 0),
-        "BAD": (_RED_HEX, _YELLOW, 51, 25),
-        "NOT_IN_RING": (_RED_HEX, _YELLOW, 51, 0),
-    }
-    if evaluation in mapping:
-        c1, c2, steps, step = mapping[evaluation]
-        return _interpolate_color(c1, c2, steps, step)
-    return (255, 255, 255)
 
 
 def generate_default_pinned_image():
-    global _last_default_stronghold, _last_default_boat, _last_default_blind
+    global _last_default_stronghold, _last_default_boat
     img = None
 
-    with status_lock:
+    with _profiler.stage("snapshot"), status_lock:
+        _profiler.stamp(status["generation"], status["arrived"])
         boat_resp = dict(status["boat_resp"])
         stronghold_resp = dict(status["stronghold_resp"])
         blind_resp = dict(status["blind_resp"])
@@ -204,11 +181,7 @@ def generate_default_pinned_image():
     blind_enabled = blind_resp.get("isBlindModeEnabled", False)
     blind_result = blind_resp.get("blindResult", {})
 
-    try:
-        with open(CUSTOMIZATIONS_FILE, "r") as f:
-            custom = json.load(f)
-    except Exception:
-        custom = {}
+    custom = get_customizations()
 
     try:
         font_size = int(custom.get("font_size", 18))
@@ -238,7 +211,7 @@ def generate_default_pinned_image():
 
     if not stronghold_resp:
         if not auto_hide_window:
-            img = _render_nb_stronghold(
+            img = _render_nb(
                 [],
                 [],
                 None,
@@ -262,33 +235,35 @@ def generate_default_pinned_image():
         _schedule(clear_overlay_image)
         return
 
-    cache_key = (
-        result_type,
-        boat_state,
-        boat_angle,
-        in_nether,
-        repr(preds[:5]),
-        repr(eye_throws),
-        repr(blind_result),
-        blind_enabled,
-        font_size,
-        neg_coords_enabled,
-        neg_coords_rgb,
-        ow_coords_format,
-        show_adj_count,
-        user_font_path,
-        player_x,
-        player_z,
-        h_ang,
-        bg_opacity,
-        text_opacity,
-        int(show_until * 10) if show_until != float("inf") else sys.maxsize,
-    )
-    if (
-        cache_key == _last_default_stronghold
-        and boat_resp == _last_default_boat
-        and (HEADLESS or _window_visible)
-    ):
+    with _profiler.stage("cache_key"):
+        cache_key = (
+            result_type,
+            boat_state,
+            boat_angle,
+            in_nether,
+            repr(preds[:5]),
+            repr(eye_throws),
+            repr(blind_result),
+            blind_enabled,
+            font_size,
+            neg_coords_enabled,
+            neg_coords_rgb,
+            ow_coords_format,
+            show_adj_count,
+            user_font_path,
+            player_x,
+            player_z,
+            h_ang,
+            bg_opacity,
+            text_opacity,
+            int(show_until * 10) if show_until != float("inf") else sys.maxsize,
+        )
+        unchanged = (
+            cache_key == _last_default_stronghold
+            and boat_resp == _last_default_boat
+            and (HEADLESS or _window_visible)
+        )
+    if unchanged:
         return
 
     _last_default_stronghold = cache_key
@@ -329,7 +304,7 @@ def generate_default_pinned_image():
                 current_blind_show_until = status["blindShowUntil"]
 
         if current_blind_show_until == float("inf") or now < current_blind_show_until:
-            img = _render_nb_stronghold(
+            img = _render_nb(
                 preds,
                 eye_throws,
                 player_x,
@@ -359,7 +334,7 @@ def generate_default_pinned_image():
                 status["blindShowUntil"] = -1
 
             if not auto_hide_window:
-                img = _render_nb_stronghold(
+                img = _render_nb(
                     preds,
                     eye_throws,
                     player_x,
@@ -398,7 +373,7 @@ def generate_default_pinned_image():
                 status["blindShowUntil"] = 0
 
     if result_type == "FAILED":
-        img = _render_nb_stronghold(
+        img = _render_nb(
             preds,
             eye_throws,
             player_x,
@@ -418,7 +393,7 @@ def generate_default_pinned_image():
             text_opacity=text_opacity,
         )
         if img is None:
-            img = _render_nb_failed_standalone(
+            img = render_nb_failed_standalone(
                 font_size, bg_opacity=bg_opacity, text_opacity=text_opacity
             )
         _save_and_apply(img)
@@ -434,7 +409,7 @@ def generate_default_pinned_image():
             show_until = status["showUntil"]
         if now < show_until:
             if boat_state == "ERROR":
-                img = _render_nb_stronghold(
+                img = _render_nb(
                     [],
                     [],
                     None,
@@ -457,7 +432,7 @@ def generate_default_pinned_image():
                 else:
                     _schedule(clear_overlay_image)
             elif boat_state == "VALID" and boat_angle is not None and boat_angle != 0:
-                img = _render_nb_stronghold(
+                img = _render_nb(
                     [],
                     [],
                     None,
@@ -481,7 +456,7 @@ def generate_default_pinned_image():
                     _schedule(clear_overlay_image)
             else:
                 if not auto_hide_window:
-                    img = _render_nb_stronghold(
+                    img = _render_nb(
                         [],
                         [],
                         None,
@@ -505,7 +480,7 @@ def generate_default_pinned_image():
                 _schedule(clear_overlay_image)
         else:
             if not auto_hide_window:
-                img = _render_nb_stronghold(
+                img = _render_nb(
                     [],
                     [],
                     None,
@@ -533,7 +508,7 @@ def generate_default_pinned_image():
         if (result_type in ("TRIANGULATION", "BLIND") and preds) or (
             result_type == "FAILED"
         ):
-            img = _render_nb_stronghold(
+            img = _render_nb(
                 preds,
                 eye_throws,
                 player_x,
@@ -555,7 +530,7 @@ def generate_default_pinned_image():
 
     if img is None:
         if not auto_hide_window:
-            img = _render_nb_stronghold(
+            img = _render_nb(
                 preds,
                 eye_throws,
                 player_x,
@@ -583,25 +558,52 @@ def generate_default_pinned_image():
     _save_and_apply(img)
 
 
-def _save_and_apply(img):
+def _write_overlay_png(img):
     tmp = IMAGE_PATH + ".tmp.png"
     try:
-        img.save(tmp, format="PNG")
-        try:
-            os.replace(tmp, IMAGE_PATH)
-        except Exception:
+        with _profiler.stage("encode"):
+            buf = io.BytesIO()
+            img.save(buf, format="PNG")
+        with _profiler.stage("write"):
+            with open(tmp, "wb") as f:
+                f.write(buf.getbuffer())
             try:
-                if os.path.exists(IMAGE_PATH):
-                    os.remove(IMAGE_PATH)
-                os.rename(tmp, IMAGE_PATH)
-            except Exception as e:
-                log("Failed to move tmp overlay file:", e)
+                os.replace(tmp, IMAGE_PATH)
+            except Exception:
+                try:
+                    if os.path.exists(IMAGE_PATH):
+                        os.remove(IMAGE_PATH)
+                    os.rename(tmp, IMAGE_PATH)
+                except Exception as e:
+                    log("[Render] Failed to move tmp overlay file into place:", e)
+                    return False
+        _profiler.sink()
+        return True
     except Exception as e:
-        log("Failed to save default overlay image:", e)
-    _schedule(lambda im=img: apply_overlay_from_pil(im))
+        log("[Render] Failed to save overlay image:", e)
+        return False
+
+
+def _apply_later(img, width=None, height=None):
+    global _last_frame
+    _last_frame = img
+    frame = _profiler.detach()
+
+    def _apply():
+        with _profiler.attached(frame):
+            apply_overlay_from_pil(img, width, height)
+
+    _schedule(_apply)
+
+
+def _save_and_apply(img):
+    _write_overlay_png(img)
+    _apply_later(img)
 
 
 def clear_overlay_image():
+    global _last_frame
+    _last_frame = None
     try:
         empty = Image.new("RGBA", (1, 1), (0, 0, 0, 0))
         tmp = IMAGE_PATH + ".tmp.png"
@@ -617,6 +619,8 @@ def clear_overlay_image():
                 log("clear_overlay_image: Failed to write empty overlay:", e)
     except Exception as e:
         log("clear_overlay_image: Failed:", e)
+    if _startup.enabled and status["stronghold_resp"]:
+        _startup.first_frame()
     if not HEADLESS:
         custom = get_customizations()
         if bool(custom.get("auto_hide_window", True)):
@@ -629,895 +633,65 @@ def clear_overlay_image():
                 _schedule(lambda im=empty: apply_overlay_from_pil(im))
 
 
-def _schedule(fn):
-    if HEADLESS:
-        fn()
-    else:
-        _scheduler.schedule(fn)
-
-
-def _make_draw_surface(w, h):
-    img = Image.new("RGBA", (w, h), NB_ROW_BG)
-    draw = ImageDraw.Draw(img)
-    return img, draw
-
-
-def _render_nb_stronghold(
-    preds,
-    eye_throws,
-    player_x,
-    player_z,
-    h_ang,
-    in_nether,
-    font_size,
-    neg_coords_enabled,
-    neg_coords_rgb,
-    ow_coords_format,
-    show_adj_count,
-    blind_result=None,
-    failed=False,
-    boat_state=None,
-    force_empty=False,
-    user_font_path="",
-    info_messages=None,
-    bg_opacity=1.0,
-    text_opacity=1.0,
-):
-    if info_messages is None:
-        info_messages = []
-    show_angle = h_ang is not None and player_x is not None and player_z is not None
-
-    def _bc(color):
-        return with_alpha(color[:3], bg_opacity)
-
-    def _tc(color):
-        return with_alpha(color[:3], text_opacity)
-
-    def _tc_dyn(color):
-        return with_alpha(color[:3], text_opacity)
-
-    _NB_ROW_BG = _bc(NB_ROW_BG)
-    _NB_HEADER_BG = _bc(NB_HEADER_BG)
-    _NB_HDR_SEP = _bc(NB_HDR_SEP)
-    _NB_ROW_SEP = _bc(NB_ROW_SEP)
-    _NEW_HEADER_BG = _bc((0x21, 0x25, 0x29))
-
-    _NB_TEXT = _tc(NB_TEXT)
-    _NB_THROW_HDR_FG = _tc(NB_THROW_HEADER_FG)
-    _NEW_HDR_VER_FG = _tc((0x80, 0x80, 0x80))
-    _PORTAL_WARN_COLOR = _tc(NB_THROW_HEADER_FG)
-
-    def _load_font_for_size(size):
-        if user_font_path:
-            try:
-                return ImageFont.truetype(user_font_path, size)
-            except Exception:
-                pass
-        return _load_nb_font(size)
-
-    hdr_font = _load_font_for_size(font_size)
-    body_font = _load_font_for_size(font_size)
-
-    portal_warn_font = _load_font_for_size(max(8, int(font_size * 0.85)))
-    small_font = _load_font_for_size(max(8, int(font_size * 0.85)))
-    new_header_font = _load_font_for_size(max(10, int(font_size * 1.05)))
-    new_header_ver_font = _load_font_for_size(max(8, int(font_size * 0.85)))
-
-    a_new, d_new = new_header_font.getmetrics()
-    new_header_h = a_new + d_new + 8
-
-    dummy_img = Image.new("RGBA", (1, 1))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-
-    def tw(text, fnt=body_font):
-        return dummy_draw.textbbox((0, 0), text, font=fnt)[2]
-
-    def th(fnt=body_font):
-        a, d = fnt.getmetrics()
-        return a + d
-
-    CELL_PAD_MAIN = 3
-    CELL_PAD_THROW = 14
-    HDR_SEP = 1
-    ROW_SEP = 1
-    body_h = th(body_font) + 4
-    throw_body_h = th(body_font) + 2
-    hdr_h = th(hdr_font) + 4
-    small_h = th(small_font) + 2
-
-    rows = []
-    for pred in preds[:5]:
-        cx, cz = pred.get("chunkX"), pred.get("chunkZ")
-        cert = pred.get("certainty")
-        dist = pred.get("overworldDistance")
-        if None in (cx, cz, cert, dist):
-            continue
-
-        if ow_coords_format == "chunk":
-            ox, oz = cx, cz
-        elif ow_coords_format == "eight_eight":
-            ox, oz = cx * 16 + 8, cz * 16 + 8
-        else:
-            ox, oz = cx * 16 + 4, cz * 16 + 4
-
-        nx, nz = round((cx * 16 + 4) / 8), round((cz * 16 + 4) / 8)
-        cert_pct = cert * 100
-        dist_disp = int(dist / 8) if in_nether else int(dist)
-
-        angle_str = None
-        dir_val = None
-        if show_angle:
-            sx = cx * 16 + 4
-            sz = cz * 16 + 4
-            if in_nether:
-                sx /= 8.0
-                sz /= 8.0
-                px, pz = player_x / 8.0, player_z / 8.0
-            else:
-                px, pz = player_x, player_z
-            dx, dz = sx - px, sz - pz
-            tgt = (math.degrees(math.atan2(dz, dx)) + 270) % 360
-            signed = ((tgt + 180) % 360) - 180
-            turn = ((tgt - (h_ang % 360) + 180) % 360) - 180
-            angle_str = f"{signed:.2f}"
-            dir_val = turn
-
-        rows.append(
-            {
-                "loc": (ox, oz),
-                "cert_pct": cert_pct,
-                "dist": dist_disp,
-                "nether": (nx, nz),
-                "angle": angle_str,
-                "dir": dir_val,
-            }
-        )
-
-    hide_row_dividers = blind_result is not None or failed
-    num_display_rows = max(len(rows), 5) if hide_row_dividers else len(rows)
-    if not rows and not hide_row_dividers and not force_empty:
-        return None
-    if force_empty:
-        num_display_rows = 5
-
-    adj_count_by_throw = {}
-    if show_adj_count and eye_throws:
-        for throw_idx, throw in enumerate(eye_throws):
-            angle_without = throw.get("angleWithoutCorrection", 0.0) or 0.0
-            increments = throw.get("correctionIncrements", 0) or 0
-            if increments != 0:
-                sign = "+" if increments >= 0 else ""
-                adj_count_by_throw[throw_idx] = (
-                    f"{angle_without:.2f}",
-                    f"{sign}{increments}",
-                    increments,
-                )
-            else:
-                adj_count_by_throw[throw_idx] = (f"{angle_without:.2f}", None, None)
-
-    loc_label = "Chunk" if ow_coords_format == "chunk" else "Location"
-    col_keys = ["loc", "cert", "dist", "nether"]
-    hdr_labels = {"loc": loc_label, "cert": "%", "dist": "Dist.", "nether": "Nether"}
-    if show_angle or force_empty:
-        col_keys.append("angle")
-        hdr_labels["angle"] = "Angle"
-
-    col_widths = {}
-    if ow_coords_format == "chunk":
-        _loc_sample = f"({-999}, {-999})"
-    else:
-        _loc_sample = f"({12345}, {12345})"
-    _rep_samples = {
-        "loc": _loc_sample,
-        "cert": "100.0%",
-        "dist": "10000",
-        "nether": f"({12345}, {12345})",
-        "angle": "180.0 (-> 180.0)",
-    }
-    for key in col_keys:
-        col_widths[key] = max(
-            tw(hdr_labels[key], hdr_font) + CELL_PAD_MAIN * 2,
-            tw(_rep_samples.get(key, ""), hdr_font) + CELL_PAD_MAIN * 2,
-        )
-
-    for r in rows:
-        col_widths["loc"] = max(
-            col_widths["loc"], tw(f"({r['loc'][0]}, {r['loc'][1]})") + CELL_PAD_MAIN * 2
-        )
-        col_widths["cert"] = max(
-            col_widths["cert"], tw(f"{r['cert_pct']:.1f}%") + CELL_PAD_MAIN * 2
-        )
-        col_widths["dist"] = max(
-            col_widths["dist"], tw(str(r["dist"])) + CELL_PAD_MAIN * 2
-        )
-        col_widths["nether"] = max(
-            col_widths["nether"],
-            tw(f"({r['nether'][0]}, {r['nether'][1]})") + CELL_PAD_MAIN * 2,
-        )
-        if show_angle and r["angle"] is not None:
-            full_a = r["angle"]
-            if r["dir"] is not None:
-                arrow = "->" if r["dir"] > 0 else "<-"
-                full_a = full_a + f" ({arrow} {abs(r['dir']):.1f})"
-            col_widths["angle"] = max(
-                col_widths.get("angle", 0), tw(full_a) + CELL_PAD_MAIN * 2
-            )
-
-    throw_headers = ["x", "z", "Angle", "Error"]
-    throw_rows_data = []
-    for ti, t in enumerate(eye_throws):
-        if show_adj_count and ti in adj_count_by_throw:
-            aw_str, cnt_str, _ = adj_count_by_throw[ti]
-            angle_cell = aw_str + (cnt_str if cnt_str else "")
-        else:
-            angle_cell = f"{t.get('angleWithoutCorrection', 0.0):.2f}"
+def _render_offloaded(name, render, *args, **kwargs):
+    # In a render worker when the pool is running, in-process otherwise or
+    # when the worker fails.
+    global _render_pool
+    if _render_pool is not None:
+        try:
+            return _render_pool.render(name, *args, **kwargs)
+        except RenderWorkerError as e:
+            log(f"[Render] Render worker failed, rendering in-process: {e}")
+            if not _render_pool.alive:
+                _render_pool = None
+    return render(*args, **kwargs)
 
-        x_val = t.get("xInOverworld", 0.0) or 0.0
-        z_val = t.get("zInOverworld", 0.0) or 0.0
 
-        throw_rows_data.append(
-            (
-                f"{float(x_val):.2f}",
-                f"{float(z_val):.2f}",
-                angle_cell,
-                f"{t.get('error', 0.0):.4f}",
-            )
-        )
+def _render_nb(*args, **kwargs):
+    with _profiler.stage("raster"):
+        return _render_offloaded("nb_stronghold", _render_nb_stronghold, *args, **kwargs)
 
-    throw_nat = [tw(h, small_font) + CELL_PAD_THROW * 2 for h in throw_headers]
-    for trow in throw_rows_data:
-        for i, cell in enumerate(trow):
-            throw_nat[i] = max(throw_nat[i], tw(cell, small_font) + CELL_PAD_THROW * 2)
-
-    main_table_w = sum(col_widths[k] for k in col_keys)
-
-    min_blind_text_w = 0
-    if blind_result is not None:
-        evaluation = blind_result.get("evaluation", "")
-        x_nether = blind_result.get("xInNether", 0)
-        z_nether = blind_result.get("zInNether", 0)
-        highroll_prob = blind_result.get("highrollProbability", 0) * 100
-        highroll_thresh = blind_result.get("highrollThreshold", 400)
-        improve_dir = blind_result.get("improveDirection", 0)
-        improve_dist = blind_result.get("improveDistance", 0)
-        _eval_text = format_blind_evaluation(evaluation)
-        _prefix = f"Blind coords ({round(x_nether)}, {round(z_nether)}) are "
-        _l2p = f"{highroll_prob:.1f}%"
-        _l2s = f" chance of <{int(highroll_thresh)} block blind"
-        _l3 = f"Head {math.degrees(improve_dir):.0f}°, {round(improve_dist)} blocks away, for better coords."
-        min_blind_text_w = (
-            max(
-                tw(_prefix) + tw(_eval_text),
-                tw(_l2p) + tw(_l2s),
-                tw(_l3),
-            )
-            + CELL_PAD_MAIN * 2
-        )
-    elif failed:
-        _fl = [
-            "Could not determine the stronghold chunk.",
-            "",
-            "You probably misread one of the eyes.",
-        ]
-        min_blind_text_w = max(tw(line) for line in _fl if line) + CELL_PAD_MAIN * 2
-
-    rep_loc_sample = f"({12345}, {12345})"
-    rep_cert_sample = "100.0%"
-    rep_dist_sample = "10000"
-    rep_nether_sample = rep_loc_sample
-    rep_angle_sample = "180.0 (-> 180.0)"
-
-    calc_col_w = {}
-    for key in col_keys:
-        if key == "loc":
-            sample = rep_loc_sample
-        elif key == "cert":
-            sample = rep_cert_sample
-        elif key == "dist":
-            sample = rep_dist_sample
-        elif key == "nether":
-            sample = rep_nether_sample
-        elif key == "angle":
-            sample = rep_angle_sample
-        else:
-            sample = hdr_labels.get(key, "")
-        calc_col_w[key] = max(
-            col_widths.get(key, 0), tw(sample, hdr_font) + CELL_PAD_MAIN * 2
-        )
 
-    calc_main_table_w = sum(calc_col_w[k] for k in col_keys)
+def _render_custom(name, *args, **kwargs):
+    if _render_pool is None:
+        return _RENDERERS[name](*args, **kwargs)
+    with _profiler.stage("raster"):
+        return _render_offloaded(name, _RENDERERS[name], *args, **kwargs)
 
-    rep_throw_samples = ["12345.67", "12345.67", "180.0", "0.0000"]
-    calc_throw_nat = [tw(h, small_font) + CELL_PAD_THROW * 2 for h in throw_headers]
-    for i, sample in enumerate(rep_throw_samples):
-        calc_throw_nat[i] = max(
-            calc_throw_nat[i], tw(sample, small_font) + CELL_PAD_THROW * 2
-        )
 
-    img_w = max(
-        main_table_w,
-        sum(throw_nat),
-        min_blind_text_w,
-        calc_main_table_w,
-        sum(calc_throw_nat),
-    )
+def _schedule(fn):
+    if HEADLESS:
+        fn()
+    else:
+        _scheduler.schedule(fn)
 
-    current_main_w = sum(col_widths[k] for k in col_keys)
-
-    if current_main_w < img_w:
-        extra = img_w - current_main_w
-        expand_keys = [k for k in col_keys if k != "angle"]
-        if not expand_keys:
-            expand_keys = col_keys
-        per_col = extra // len(expand_keys)
-        for k in expand_keys:
-            col_widths[k] += per_col
-
-        col_widths[expand_keys[-1]] += img_w - sum(col_widths[k] for k in col_keys)
-
-    leftover = img_w - sum(throw_nat)
-    if leftover < 0:
-        leftover = 0
-
-    outer_bonus = int(leftover * 0.20)
-    centre_bonus = int(leftover * 0.30)
-    throw_col_widths = list(throw_nat)
-    throw_col_widths[0] += outer_bonus
-    throw_col_widths[1] += centre_bonus
-    throw_col_widths[2] += centre_bonus
-    throw_col_widths[3] += outer_bonus
-    throw_total = sum(throw_col_widths)
-    if throw_total < img_w:
-        diff = img_w - throw_total
-        throw_col_widths[0] += diff // 4
-        throw_col_widths[1] += diff // 4
-        throw_col_widths[2] += diff // 4
-        throw_col_widths[3] += img_w - throw_total - 3 * (diff // 4)
-
-    show_portal_warning = any(m.get("type") == "PORTAL_LINKING" for m in info_messages)
-
-    top_headers_h = hdr_h
-
-    _row_slot = body_h + (ROW_SEP if not hide_row_dividers else 0)
-    main_h = (
-        new_header_h
-        + HDR_SEP
-        + HDR_SEP
-        + top_headers_h
-        + HDR_SEP
-        + num_display_rows * _row_slot
-    )
 
-    _display_info_messages = [
-        m
-        for m in info_messages
-        if m.get("type")
-        in (
-            "PORTAL_LINKING",
-            "NEXT_THROW_DIRECTION",
-            "MISMEASURE",
-            "COMBINED_CERTAINTY",
-        )
-    ]
-    warn_text_h = th(portal_warn_font)
-    _TWO_LINE_TYPES = (
-        "NEXT_THROW_DIRECTION",
-        "MISMEASURE",
-        "PORTAL_LINKING",
-        "COMBINED_CERTAINTY",
+def _render_nb_stronghold(*args, **kwargs):
+    return render_nb_stronghold(
+        *args, version=APP_VERSION, stage=_profiler.stage, **kwargs
     )
 
-    def _info_msg_h(msg):
-        if msg.get("type") in _TWO_LINE_TYPES:
-            return warn_text_h * 2 + 4 + 6
-        return warn_text_h + 6
-
-    total_info_h = sum(_info_msg_h(m) for m in _display_info_messages)
-    if _display_info_messages:
-        total_info_h += ROW_SEP
-    if len(_display_info_messages) > 1:
-        total_info_h += ROW_SEP * (len(_display_info_messages) - 1)
-    main_h += total_info_h
-
-    num_throw_rows = max(len(throw_rows_data), 3)
-    throw_h = 0
-    if num_throw_rows:
-        throw_h = (
-            HDR_SEP
-            + hdr_h
-            + small_h
-            + HDR_SEP
-            + num_throw_rows * (throw_body_h + ROW_SEP)
-        )
-
-    img_h = main_h + throw_h
 
-    img = Image.new("RGBA", (img_w, img_h), _NB_ROW_BG)
-    draw = ImageDraw.Draw(img)
+def _render_custom_overlay(*args, **kwargs):
+    return render_custom_overlay(*args, stage=_profiler.stage, **kwargs)
 
-    draw.rectangle([0, 0, img_w - 1, new_header_h - 1], fill=_NEW_HEADER_BG)
-    nh_text_x = CELL_PAD_MAIN + 4
-    nh_text_y = (new_header_h - th(new_header_font)) // 2
-    draw.text((nh_text_x, nh_text_y), "NBTrackr", font=new_header_font, fill=_NB_TEXT)
-    ver_x = nh_text_x + tw("NBTrackr", new_header_font) + 8
-    a_title, d_title = new_header_font.getmetrics()
-    a_ver, d_ver = new_header_ver_font.getmetrics()
 
-    title_baseline = nh_text_y + a_title
-    ver_y = title_baseline - a_ver
-    try:
-        draw.text(
-            (ver_x, ver_y), APP_VERSION, font=new_header_ver_font, fill=_NEW_HDR_VER_FG
-        )
-    except Exception:
-        pass
-
-    _boat_icon_map = {
-        "VALID": "boat_green_icon.png",
-        "ERROR": "boat_red_icon.png",
-        "MEASURING": "boat_blue_icon.png",
-        "NONE": "boat_gray_icon.png",
-    }
-    _boat_icon_file = _boat_icon_map.get(boat_state)
-    if _boat_icon_file:
-        _boat_icon_path = os.path.join(_get_assets_dir(), _boat_icon_file)
-        try:
-            _icon_size = new_header_h - 8
-            with Image.open(_boat_icon_path) as _bicon:
-                _bicon = _bicon.convert("RGBA").resize(
-                    (_icon_size, _icon_size), Image.Resampling.LANCZOS
-                )
-                _bicon = _apply_img_opacity(_bicon, text_opacity)
-                _icon_x = img_w - _icon_size - 20
-                _icon_y = (new_header_h - _icon_size) // 2
-                img.alpha_composite(_bicon, (_icon_x, _icon_y))
-        except Exception:
-            pass
+def _render_custom_blind(*args, **kwargs):
+    return render_custom_blind(*args, stage=_profiler.stage, **kwargs)
 
-    new_header_bottom = new_header_h + HDR_SEP
-
-    top_header_y0 = new_header_bottom
-    top_header_y1 = top_header_y0 + hdr_h - 1
-    if not (blind_result is not None or failed):
-        draw.rectangle(
-            [0, top_header_y0, img_w - 1, top_header_y0 + HDR_SEP - 1], fill=_NB_HDR_SEP
-        )
-        draw.rectangle(
-            [0, top_header_y0 + HDR_SEP, img_w - 1, top_header_y1 + HDR_SEP],
-            fill=_NB_HEADER_BG,
-        )
-        x = 0
-        for key in col_keys:
-            cw = col_widths[key]
-            lbl = hdr_labels[key]
-            lw = tw(lbl, hdr_font)
-            if key == "angle" and show_angle:
-                rep_base = tw("000.00", hdr_font)
-                rep_dir = tw(" (-> 000.0)", hdr_font)
-                rep_full = rep_base + rep_dir
-                cell_bx = x + (cw - rep_full) // 2
-                dir_start = cell_bx + rep_base
-                text_x = dir_start + (rep_dir - lw) // 2
-                text_x = max(x, min(text_x, x + cw - lw))
-            else:
-                text_x = x + (cw - lw) // 2
-            draw.text(
-                (text_x, top_header_y0 + HDR_SEP + (hdr_h - th(hdr_font)) // 2),
-                lbl,
-                font=hdr_font,
-                fill=_NB_TEXT,
-            )
-            x += cw
-        draw.rectangle(
-            [
-                0,
-                top_header_y1 + HDR_SEP + 1,
-                img_w - 1,
-                top_header_y1 + HDR_SEP + 1 + HDR_SEP - 1,
-            ],
-            fill=_NB_HDR_SEP,
-        )
 
-    row_area_y = new_header_bottom + HDR_SEP + hdr_h + HDR_SEP
+def _render_custom_text(*args, **kwargs):
+    with _profiler.stage("raster"):
+        return render_custom_text(*args, **kwargs)
 
-    for row_idx in range(num_display_rows):
-        row_slot = body_h + (ROW_SEP if not hide_row_dividers else 0)
-        y = row_area_y + row_idx * row_slot
-        if (not hide_row_dividers and row_idx < num_display_rows - 1) or (
-            show_portal_warning and row_idx == num_display_rows - 1
-        ):
-            draw.rectangle(
-                [0, y + body_h, img_w - 1, y + body_h + ROW_SEP - 1], fill=_NB_ROW_SEP
-            )
 
-        a_body, d_body = body_font.getmetrics()
-        text_y = y + (body_h - (a_body + d_body)) // 2
-        x = 0
-
-        def draw_cell_centered(key, text, fill=_NB_TEXT, fnt=body_font):
-            nonlocal x
-            cw = col_widths[key]
-            tw_ = dummy_draw.textbbox((0, 0), text, font=fnt)[2]
-            draw.text((x + (cw - tw_) // 2, text_y), text, font=fnt, fill=fill)
-            x += cw
-
-        def draw_coord_cell(key, coord_pair):
-            nonlocal x
-            cw = col_widths[key]
-            cx_v, cz_v = coord_pair
-            parts = [
-                ("(", _NB_TEXT),
-                (
-                    str(cx_v),
-                    _tc(neg_coords_rgb)
-                    if neg_coords_enabled and cx_v < 0
-                    else _NB_TEXT,
-                ),
-                (", ", _NB_TEXT),
-                (
-                    str(cz_v),
-                    _tc(neg_coords_rgb)
-                    if neg_coords_enabled and cz_v < 0
-                    else _NB_TEXT,
-                ),
-                (")", _NB_TEXT),
-            ]
-            full_w = sum(tw(p[0]) for p in parts)
-            bx = x + (cw - full_w) // 2
-            for pt, pc in parts:
-                draw.text((bx, text_y), pt, font=body_font, fill=pc)
-                bx += tw(pt)
-            x += cw
-
-        if row_idx >= len(rows):
-            x = 0
-            for key in col_keys:
-                x += col_widths[key]
-        else:
-            r = rows[row_idx]
-            x = 0
-            draw_coord_cell("loc", r["loc"])
-            cert_txt = f"{r['cert_pct']:.1f}%"
-            draw_cell_centered(
-                "cert", cert_txt, fill=_tc_dyn(certainty_color(r["cert_pct"]))
-            )
-            draw_cell_centered("dist", str(r["dist"]))
-            draw_coord_cell("nether", r["nether"])
-
-            if show_angle and r["angle"] is not None:
-                cw = col_widths["angle"]
-                base_str = r["angle"]
-                dir_part = ""
-                dir_col = _NB_TEXT
-                if r["dir"] is not None:
-                    arrow = "->" if r["dir"] > 0 else "<-"
-                    dir_part = f" ({arrow} {abs(r['dir']):.1f})"
-                    dir_col = _tc_dyn(gradient_color(abs(r["dir"])))
-                full_w = tw(base_str) + tw(dir_part)
-                bx = x + (cw - full_w) // 2
-                draw.text((bx, text_y), base_str, font=body_font, fill=_NB_TEXT)
-                if dir_part:
-                    draw.text(
-                        (bx + tw(base_str), text_y),
-                        dir_part,
-                        font=body_font,
-                        fill=dir_col,
-                    )
-                x += cw
-
-    if _display_info_messages:
-        info_area_start_y = row_area_y + num_display_rows * _row_slot
-
-        def _split_two_lines(msg_type, text):
-            if msg_type == "NEXT_THROW_DIRECTION":
-                marker = "after next"
-                idx = text.find(marker)
-                if idx != -1:
-                    split_pos = idx + len(marker)
-                    line1 = text[:split_pos].rstrip()
-                    line2 = text[split_pos:].lstrip()
-                    if line2:
-                        return line1, line2
-                return text, None
-            if msg_type == "MISMEASURE":
-                marker = "mismeasured or"
-                idx = text.find(marker)
-                if idx != -1:
-                    split_pos = idx + len(marker)
-                    line1 = text[:split_pos].rstrip()
-                    line2 = text[split_pos:].lstrip()
-                    if line2:
-                        return line1, line2
-                return text, None
-            if msg_type == "PORTAL_LINKING":
-                marker = "due to"
-                idx = text.find(marker)
-                if idx != -1:
-                    split_pos = idx + len(marker)
-                    line1 = text[:split_pos].rstrip()
-                    line2 = text[split_pos:].lstrip()
-                    if line2:
-                        return line1, line2
-                return text, None
-            if msg_type == "COMBINED_CERTAINTY":
-                marker = "stronghold (it"
-                idx = text.find(marker)
-                if idx != -1:
-                    split_pos = idx + len(marker)
-                    line1 = text[:split_pos].rstrip()
-                    line2 = text[split_pos:].lstrip()
-                    if line2:
-                        return line1, line2
-                return text, None
-            return text, None
-
-        current_info_y = info_area_start_y
-        draw.rectangle(
-            [0, current_info_y, img_w - 1, current_info_y + ROW_SEP - 1],
-            fill=_NB_ROW_SEP,
-        )
-        current_info_y += ROW_SEP
-        for msg_idx, msg in enumerate(_display_info_messages):
-            severity = msg.get("severity", "WARNING")
-            msg_type = msg.get("type", "")
-            text = _strip_html(msg.get("message", ""))
-            text_h = th(portal_warn_font)
-            icon_size = int(text_h * 1.1)
-            this_msg_h = _info_msg_h(msg)
-            row_y = current_info_y
-
-            if severity == "INFO":
-                icon_file = "info_icon.png"
-            else:
-                icon_file = "warning_icon.png"
-            icon_path = os.path.join(_get_assets_dir(), icon_file)
-            try:
-                with Image.open(icon_path) as icon_img:
-                    icon_img = icon_img.convert("RGBA").resize(
-                        (icon_size, icon_size), Image.Resampling.LANCZOS
-                    )
-                    icon_img = _apply_img_opacity(icon_img, text_opacity)
-                    icon_y = row_y + (this_msg_h - icon_size) // 2
-                    img.alpha_composite(icon_img, (CELL_PAD_MAIN, icon_y))
-                text_start_x = CELL_PAD_MAIN + icon_size + 8
-            except Exception:
-                text_start_x = CELL_PAD_MAIN
-
-            if msg_type in _TWO_LINE_TYPES:
-                line1, line2 = _split_two_lines(msg_type, text)
-                if line2:
-                    line_gap = 4
-                    total_text_h = text_h * 2 + line_gap
-                    text_y1 = row_y + (this_msg_h - total_text_h) // 2
-                    text_y2 = text_y1 + text_h + line_gap
-                    if msg_type == "COMBINED_CERTAINTY":
-                        pct_match = re.search(r"(\d+\.?\d*%)", line1)
-                        if pct_match:
-                            before = line1[: pct_match.start()]
-                            pct_str = pct_match.group(1)
-                            after = line1[pct_match.end() :]
-                            try:
-                                pct_val = float(pct_str.rstrip("%"))
-                                pct_color = _tc_dyn(_nb_certainty_color(pct_val))
-                            except Exception:
-                                pct_color = _PORTAL_WARN_COLOR
-                            bx = text_start_x
-                            draw.text(
-                                (bx, text_y1),
-                                before,
-                                font=portal_warn_font,
-                                fill=_PORTAL_WARN_COLOR,
-                            )
-                            bx += tw(before, portal_warn_font)
-                            draw.text(
-                                (bx, text_y1),
-                                pct_str,
-                                font=portal_warn_font,
-                                fill=pct_color,
-                            )
-                            bx += tw(pct_str, portal_warn_font)
-                            draw.text(
-                                (bx, text_y1),
-                                after,
-                                font=portal_warn_font,
-                                fill=_PORTAL_WARN_COLOR,
-                            )
-                        else:
-                            draw.text(
-                                (text_start_x, text_y1),
-                                line1,
-                                font=portal_warn_font,
-                                fill=_PORTAL_WARN_COLOR,
-                            )
-                        draw.text(
-                            (text_start_x, text_y2),
-                            line2,
-                            font=portal_warn_font,
-                            fill=_PORTAL_WARN_COLOR,
-                        )
-                    else:
-                        draw.text(
-                            (text_start_x, text_y1),
-                            line1,
-                            font=portal_warn_font,
-                            fill=_PORTAL_WARN_COLOR,
-                        )
-                        draw.text(
-                            (text_start_x, text_y2),
-                            line2,
-                            font=portal_warn_font,
-                            fill=_PORTAL_WARN_COLOR,
-                        )
-                else:
-                    ty = row_y + (this_msg_h - text_h) // 2
-                    draw.text(
-                        (text_start_x, ty),
-                        line1,
-                        font=portal_warn_font,
-                        fill=_PORTAL_WARN_COLOR,
-                    )
-            else:
-                ty = row_y + (this_msg_h - text_h) // 2
-                draw.text(
-                    (text_start_x, ty),
-                    text,
-                    font=portal_warn_font,
-                    fill=_PORTAL_WARN_COLOR,
-                )
-
-            current_info_y += this_msg_h
-            if msg_idx < len(_display_info_messages) - 1:
-                draw.rectangle(
-                    [0, current_info_y, img_w - 1, current_info_y + ROW_SEP - 1],
-                    fill=_NB_ROW_SEP,
-                )
-                current_info_y += ROW_SEP
-
-    if blind_result is not None:
-        eval_color = _tc_dyn(blind_evaluation_color(evaluation))
-        txt_x = CELL_PAD_MAIN
-        txt_y = new_header_bottom + (body_h - th(body_font)) // 2
-        lsep = body_h
-        draw.text((txt_x, txt_y), _prefix, font=body_font, fill=_NB_TEXT)
-        draw.text(
-            (txt_x + tw(_prefix), txt_y), _eval_text, font=body_font, fill=eval_color
-        )
-        draw.text((txt_x, txt_y + lsep), _l2p, font=body_font, fill=eval_color)
-        draw.text((txt_x + tw(_l2p), txt_y + lsep), _l2s, font=body_font, fill=_NB_TEXT)
-        draw.text((txt_x, txt_y + lsep * 2), _l3, font=body_font, fill=_NB_TEXT)
-    elif failed:
-        txt_x = CELL_PAD_MAIN
-        for li, line in enumerate(_fl):
-            if not line:
-                continue
-            ty = new_header_bottom + li * body_h + (body_h - th(body_font)) // 2
-            draw.text((txt_x, ty), line, font=body_font, fill=_NB_TEXT)
-
-    if num_throw_rows:
-        throw_base_y = main_h
-        draw.rectangle(
-            [0, throw_base_y, img_w - 1, throw_base_y + HDR_SEP - 1], fill=_NB_HDR_SEP
-        )
-        th_title_y = throw_base_y + HDR_SEP
-        draw.rectangle(
-            [0, th_title_y, img_w - 1, th_title_y + hdr_h - 1], fill=_NB_HEADER_BG
-        )
-        title_ty = th_title_y + (hdr_h - th(hdr_font)) // 2
-        draw.text(
-            (CELL_PAD_MAIN + 6, title_ty),
-            "Ender eye throws",
-            font=hdr_font,
-            fill=_NB_TEXT,
-        )
-
-        th_hdr_y = th_title_y + hdr_h
-        draw.rectangle(
-            [0, th_hdr_y, img_w - 1, th_hdr_y + small_h - 1], fill=_NB_HEADER_BG
-        )
-        x = 0
-        for i, thdr in enumerate(throw_headers):
-            cw = throw_col_widths[i]
-            lw = tw(thdr, small_font)
-            ty = th_hdr_y + (small_h - th(small_font)) // 2
-            draw.text((x + (cw - lw) // 2, ty), thdr, font=small_font, fill=_NB_TEXT)
-            x += cw
-
-        sep2_y = th_hdr_y + small_h
-        draw.rectangle([0, sep2_y, img_w - 1, sep2_y + HDR_SEP - 1], fill=_NB_HDR_SEP)
-
-        for ti in range(num_throw_rows):
-            ty = sep2_y + HDR_SEP + ti * (throw_body_h + ROW_SEP)
-            if ti < num_throw_rows - 1:
-                draw.rectangle(
-                    [0, ty + throw_body_h, img_w - 1, ty + throw_body_h + ROW_SEP - 1],
-                    fill=_NB_ROW_SEP,
-                )
-            x = 0
-            if ti < len(throw_rows_data):
-                trow = throw_rows_data[ti]
-                for i, cell in enumerate(trow):
-                    cw = throw_col_widths[i]
-                    a_small, _ = small_font.getmetrics()
-                    ty2 = ty + (throw_body_h - a_small) // 2
-                    if failed and i == 3:
-                        x += cw
-                        continue
-                    if i == 2 and show_adj_count and ti in adj_count_by_throw:
-                        aw_str, cnt_str, cnt_raw = adj_count_by_throw[ti]
-                        if cnt_str:
-                            adj_col = _tc_dyn(
-                                ADJ_COUNT_POSITIVE
-                                if (cnt_raw is None or cnt_raw >= 0)
-                                else ADJ_COUNT_NEGATIVE
-                            )
-                            full_w = tw(aw_str, small_font) + tw(cnt_str, small_font)
-                            bx = x + (cw - full_w) // 2
-                            draw.text(
-                                (bx, ty2),
-                                aw_str,
-                                font=small_font,
-                                fill=_NB_THROW_HDR_FG,
-                            )
-                            draw.text(
-                                (bx + tw(aw_str, small_font), ty2),
-                                cnt_str,
-                                font=small_font,
-                                fill=adj_col,
-                            )
-                        else:
-                            cw_ = tw(aw_str, small_font)
-                            draw.text(
-                                (x + (cw - cw_) // 2, ty2),
-                                aw_str,
-                                font=small_font,
-                                fill=_NB_THROW_HDR_FG,
-                            )
-                    else:
-                        cw_ = tw(cell, small_font)
-                        draw.text(
-                            (x + (cw - cw_) // 2, ty2),
-                            cell,
-                            font=small_font,
-                            fill=_NB_THROW_HDR_FG,
-                        )
-                    x += cw
-            else:
-                for cw in throw_col_widths:
-                    x += cw
-    return img
-
-
-def certainty_color_for_turn(abs_turn):
-    return gradient_color(abs_turn)
-
-
-def _render_nb_failed_standalone(font_size, bg_opacity=1.0, text_opacity=1.0):
-    font = _load_nb_font(font_size)
-    a, d = font.getmetrics()
-    body_h = a + d + 10
-    dummy_img = Image.new("RGBA", (1, 1))
-    dummy_draw = ImageDraw.Draw(dummy_img)
-    lines = [
-        "Could not determine the stronghold chunk.",
-        "You probably misread one of the eyes.",
-    ]
-    max_w = max(dummy_draw.textbbox((0, 0), line, font=font)[2] for line in lines)
-    PAD = 20
-    img_w = max_w + PAD * 2
-    img_h = body_h * len(lines) + PAD
-    img = Image.new("RGBA", (img_w, img_h), with_alpha(NB_ROW_BG[:3], bg_opacity))
-    draw = ImageDraw.Draw(img)
-    t_col = with_alpha(NB_TEXT, text_opacity)
-    for i, line in enumerate(lines):
-        y = PAD // 2 + i * body_h
-        lw = dummy_draw.textbbox((0, 0), line, font=font)[2]
-        draw.text(
-            ((img_w - lw) // 2, y + (body_h - (a + d)) // 2),
-            line,
-            font=font,
-            fill=t_col,
-        )
-    return img
+# Everything the render workers can draw, by job name.
+_RENDERERS = {
+    "nb_stronghold": _render_nb_stronghold,
+    "custom_overlay": _render_custom_overlay,
+    "custom_blind": _render_custom_blind,
+    "custom_text": _render_custom_text,
+}
 
 
 # --------------------- END Generate default pinned image overlay -----------
@@ -1536,85 +710,39 @@ def generate_custom_pinned_image():
         _last_blind_resp, \
         _last_info_resp
 
-    global _cached_customizations, _last_custom_mtime
-    try:
-        mtime = os.path.getmtime(CUSTOMIZATIONS_FILE)
-        if _cached_customizations is not None and mtime == _last_custom_mtime:
-            custom = _cached_customizations
-        else:
-            with open(CUSTOMIZATIONS_FILE, "r") as f:
-                custom = json.load(f)
-            _cached_customizations = custom
-            _last_custom_mtime = mtime
-            log("[Config] Customizations reloaded from disk")
-    except Exception as e:
-        log("Failed to read customizations:", e)
-        return
+    custom = get_customizations()
 
     bg_hex = custom.get("background_color", "#1E1E1E")
     text_hex = custom.get("text_color", "#000000")
-    bg_rgb = hex_to_rgb(bg_hex, fallback=(255, 255, 255))
-    text_rgb = hex_to_rgb(text_hex, fallback=(0, 0, 0))
+    style = custom_style(custom)
+    text_opacity = style["text_opacity"]
     bg_opacity = max(0.0, min(1.0, float(custom.get("background_opacity", 1.0))))
-    text_opacity = max(0.0, min(1.0, float(custom.get("text_opacity", 1.0))))
-    text_outline_enabled = bool(custom.get("text_outline_enabled", False))
-    text_outline_color_hex = custom.get("text_outline_color", "#000000")
-    text_outline_rgb = hex_to_rgb(text_outline_color_hex, (0, 0, 0))
-    try:
-        text_outline_width = int(custom.get("text_outline_width", 2))
-        text_outline_width = max(1, min(10, text_outline_width))
-    except Exception:
-        text_outline_width = 2
-
-    bg_rgba = (bg_rgb[0], bg_rgb[1], bg_rgb[2], int(bg_opacity * 255))
-    text_rgba = (*text_rgb, int(text_opacity * 255))
-    outline_rgba = (*text_outline_rgb, int(text_opacity * 255))
-
-    stroke_kwargs = {}
-    stroke_width_kwargs = {}
-    if text_outline_enabled:
-        stroke_kwargs = {
-            "stroke_width": text_outline_width,
-            "stroke_fill": outline_rgba,
-        }
-        stroke_width_kwargs = {
-            "stroke_width": text_outline_width,
-        }
     show_boat_icon = custom.get("show_boat_icon", False)
-    show_coords_by_dim = custom.get("show_coords_based_on_dimension", True)
     show_error_message = custom.get("show_error_message", False)
     show_blind_info = custom.get("show_blind_info", True)
     blind_hide_after = custom.get("blind_info_hide_after", 20)
     blind_hide_after_enabled = custom.get("blind_info_hide_after_enabled", False)
     font_size = custom.get("font_size", 18)
-    show_adj_count = custom.get("show_angle_adjustment_count", False)
-    ow_coords_format = custom.get("overworld_coords_format", "four_four")
-    neg_coords_enabled = custom.get("negative_coords_color_enabled", False)
-    neg_coords_hex = custom.get("negative_coords_color", "#CC6E72")
-    neg_coords_rgb = hex_to_rgb(neg_coords_hex, fallback=(204, 110, 114))
-    portal_nether_enabled = custom.get("portal_nether_color_enabled", True)
-    portal_nether_hex = custom.get("portal_nether_color", "#FFA500")
-    portal_nether_rgb = hex_to_rgb(portal_nether_hex, fallback=(255, 165, 0))
-    show_angle_error = custom.get("show_angle_error", False)
-    angle_display_mode = custom.get("angle_display_mode", "angle_and_change")
-    show_overlay_header = custom.get("show_overlay_header", False)
 
-    with status_lock:
+    with _profiler.stage("snapshot"), status_lock:
+        _profiler.stamp(status["generation"], status["arrived"])
         boat_resp = dict(status["boat_resp"])
         stronghold_resp = dict(status["stronghold_resp"])
         blind_resp = dict(status["blind_resp"])
         info_resp = dict(status["info_resp"])
         show_until = status.get("showUntil", 0)
 
-    if (
-        custom == _last_custom
-        and boat_resp == _last_boat
-        and stronghold_resp == _last_stronghold
-        and blind_resp == _last_blind_resp
-        and info_resp == _last_info_resp
-        and (HEADLESS or _window_visible)
-        and show_until == _last_show_until
-    ):
+    with _profiler.stage("cache_key"):
+        unchanged = (
+            custom == _last_custom
+            and boat_resp == _last_boat
+            and stronghold_resp == _last_stronghold
+            and blind_resp == _last_blind_resp
+            and info_resp == _last_info_resp
+            and (HEADLESS or _window_visible)
+            and show_until == _last_show_until
+        )
+    if unchanged:
         return
 
     (
@@ -1705,106 +833,17 @@ def generate_custom_pinned_image():
 
             _last_blind = blind_cache_key
 
-            evaluation = blind_result.get("evaluation", "")
-            x_nether = blind_result.get("xInNether", 0)
-            z_nether = blind_result.get("zInNether", 0)
-            highroll_prob = blind_result.get("highrollProbability", 0) * 100
-            highroll_thresh = blind_result.get("highrollThreshold", 400)
-            improve_dir = blind_result.get("improveDirection", 0)
-            improve_dist = blind_result.get("improveDistance", 0)
-
-            eval_text = format_blind_evaluation(evaluation)
-            line1_pre = f"Blind coords ({round(x_nether)}, {round(z_nether)}) are "
-            line1_eval = eval_text
-            highroll_pct_text = f"{highroll_prob:.1f}%"
-            line2_post = f" chance of <{int(highroll_thresh)} block blind"
-            improve_deg = math.degrees(improve_dir)
-            line3 = f"Head {improve_deg:.0f}°, {round(improve_dist)} blocks away, for better coords."
-
-            font_name = custom.get("font_name", "")
-            font = None
-            if font_name:
-                try:
-                    font = ImageFont.truetype(font_name, font_size)
-                except Exception:
-                    pass
-            if font is None:
-                _default_font_path = os.path.join(
-                    _get_assets_dir(), "LiberationSans", "LiberationSans-Bold.ttf"
-                )
-                try:
-                    font = ImageFont.truetype(_default_font_path, font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-
-            dummy = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
-            w_line1_pre = dummy.textbbox(
-                (0, 0), line1_pre, font=font, **stroke_width_kwargs
-            )[2]
-            w_line1_eval = dummy.textbbox(
-                (0, 0), line1_eval, font=font, **stroke_width_kwargs
-            )[2]
-            w_line2_pct = dummy.textbbox(
-                (0, 0), highroll_pct_text, font=font, **stroke_width_kwargs
-            )[2]
-            w_line2_post = dummy.textbbox(
-                (0, 0), line2_post, font=font, **stroke_width_kwargs
-            )[2]
-            w_line3 = dummy.textbbox((0, 0), line3, font=font, **stroke_width_kwargs)[2]
-            max_w = max(w_line1_pre + w_line1_eval, w_line2_pct + w_line2_post, w_line3)
-
-            ascent, descent = font.getmetrics()
-            line_h = ascent + descent + 6
-            height = line_h * 3 + 20
-            pad = 10
-
-            img = Image.new("RGBA", (int(max_w + 2 * pad), height), bg_rgba)
-            draw = ImageDraw.Draw(img)
-            eval_color_rgba = (
-                *blind_evaluation_color(evaluation),
-                int(text_opacity * 255),
-            )
-
-            x, y = pad, 10
-            draw.text((x, y), line1_pre, font=font, fill=text_rgba, **stroke_kwargs)
-            draw.text(
-                (x + w_line1_pre, y),
-                line1_eval,
-                font=font,
-                fill=eval_color_rgba,
-                **stroke_kwargs,
-            )
-            x = pad
-            y += line_h
-            draw.text(
-                (x, y),
-                highroll_pct_text,
-                font=font,
-                fill=eval_color_rgba,
-                **stroke_kwargs,
-            )
-            draw.text(
-                (x + w_line2_pct, y),
-                line2_post,
-                font=font,
-                fill=text_rgba,
-                **stroke_kwargs,
-            )
-            y += line_h
-            draw.text((pad, y), line3, font=font, fill=text_rgba, **stroke_kwargs)
+            img = _render_custom("custom_blind", custom, blind_result, style=style)
 
-            try:
-                img.save(IMAGE_PATH)
+            if _write_overlay_png(img):
                 log(
                     f"[Render] Saved blind overlay image (Expires: {blind_show_until:.2f})"
                 )
-            except Exception as e:
-                log("[Render] Failed to save blind overlay image:", e)
 
             with status_lock:
                 status["blindCurrentlyShowing"] = True
 
-            _schedule(lambda im=img: apply_overlay_from_pil(im))
+            _apply_later(img)
             return
 
     if result_type == "TRIANGULATION":
@@ -1815,45 +854,14 @@ def generate_custom_pinned_image():
 
     if show_error_message and result_type == "FAILED":
         _last_custom, _last_boat, _last_stronghold = custom, boat_resp, stronghold_resp
-        _cached_customizations = custom
-        text = "Could not determine the stronghold chunk."
-        font_name = custom.get("font_name", "")
-        font = None
-        if font_name:
-            try:
-                font = ImageFont.truetype(font_name, font_size)
-            except Exception:
-                pass
-        if font is None:
-            _default_font_path = os.path.join(
-                _get_assets_dir(), "LiberationSans", "LiberationSans-Bold.ttf"
-            )
-            try:
-                font = ImageFont.truetype(_default_font_path, font_size)
-            except Exception:
-                font = ImageFont.load_default()
-
-        dummy = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
-        bbox = dummy.textbbox((0, 0), text, font=font, **stroke_kwargs)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
-        offset_x = bbox[0]
-        offset_y = bbox[1]
-        pad = 10
-        img = Image.new("RGBA", (text_w + 2 * pad, text_h + 2 * pad), bg_rgba)
-        draw = ImageDraw.Draw(img)
-        draw.text(
-            (pad - offset_x, pad - offset_y),
-            text,
-            font=font,
-            fill=text_rgba,
-            **stroke_kwargs,
+        img = _render_custom(
+            "custom_text",
+            custom,
+            "Could not determine the stronghold chunk.",
+            style=style,
         )
-        try:
-            img.save(IMAGE_PATH)
-        except Exception as e:
-            log("[Render] Failed to save overlay image (Error message):", e)
-        _schedule(lambda im=img: apply_overlay_from_pil(im))
+        _write_overlay_png(img)
+        _apply_later(img)
         return
 
     with status_lock:
@@ -1869,32 +877,13 @@ def generate_custom_pinned_image():
             return
 
         if boat_state == last_shown and now < show_until:
-            icon_file = (
-                "boat_green_icon.png" if boat_state == "VALID" else "boat_red_icon.png"
-            )
-            icon_path = os.path.join(os.path.dirname(__file__), "assets", icon_file)
             try:
-                icon = Image.open(icon_path).convert("RGBA")
-                icon = icon.resize((64, 64), Image.LANCZOS)
-                icon = _apply_img_opacity(icon, text_opacity)
+                icon = render_custom_boat_icon(boat_state, text_opacity)
             except Exception as e:
                 log("[Render] Failed to load/process icon:", e)
             else:
-                tmp = IMAGE_PATH + ".tmp.png"
-                try:
-                    icon.save(tmp, format="PNG")
-                    try:
-                        os.replace(tmp, IMAGE_PATH)
-                    except Exception:
-                        try:
-                            if os.path.exists(IMAGE_PATH):
-                                os.remove(IMAGE_PATH)
-                            os.rename(tmp, IMAGE_PATH)
-                        except Exception as e2:
-                            log("[Render] Failed to save boat icon to IMAGE_PATH:", e2)
-                except Exception as e:
-                    log("[Render] Failed to save boat icon:", e)
-                _schedule(lambda im=icon: apply_overlay_from_pil(im, 64, 64))
+                _write_overlay_png(icon)
+                _apply_later(icon, 64, 64)
         else:
             if not bool(custom.get("auto_hide_window", True)):
                 _render_and_apply_blank_custom_overlay(custom)
@@ -1910,122 +899,10 @@ def generate_custom_pinned_image():
     h_ang = player_pos.get("horizontalAngle")
     in_nether = player_pos.get("isInNether", False)
 
-    shown_count = custom.get("shown_measurements", 5)
-    order = custom.get("text_order", [])
-    enabled = custom.get("text_enabled", {})
-    text_header = custom.get("text_header", {})
-    HEADER_LABELS = {
-        "distance": "Dist.",
-        "certainty_percentage": "%",
-        "angle": "Angle",
-        "overworld_coords": "Chunk" if ow_coords_format == "chunk" else "Location",
-        "nether_coords": "Nether",
-    }
-
-    lines = []
-    adj_count_overlays = []
-    angle_error_overlays = []
-
-    _portal_link_flags = []
-    if portal_nether_enabled and eye_throws:
-        _ft = eye_throws[0]
-        _approx_nx = (_ft.get("xInOverworld") or 0.0) / 8.0
-        _approx_nz = (_ft.get("zInOverworld") or 0.0) / 8.0
-        for pred in preds[:shown_count]:
-            cx = pred.get("chunkX", 0)
-            cz = pred.get("chunkZ", 0)
-            _best_nx = cx * 16 / 8.0 + 0.5
-            _best_nz = cz * 16 / 8.0 + 0.5
-            _max_axis = max(abs(_approx_nx - _best_nx), abs(_approx_nz - _best_nz))
-            _portal_link_flags.append(_max_axis < 24)
-    else:
-        _portal_link_flags = [False] * shown_count
-
-    for pred_idx, pred in enumerate(preds[:shown_count]):
-        cx, cz = pred.get("chunkX"), pred.get("chunkZ")
-        cert = pred.get("certainty")
-        dist = pred.get("overworldDistance")
-        if None in (cx, cz, cert, dist):
-            continue
-
-        parts = []
-        for key in order:
-            if not enabled.get(key, True):
-                continue
-
-            if key == "distance":
-                d = dist / 8 if in_nether else dist
-                parts.append(("distance", (str(int(d)), d)))
-
-            elif key == "certainty_percentage":
-                pct = round(cert * 100, 1)
-                parts.append(("certainty", f"{pct}%"))
-
-            elif key == "angle" and None not in (h_ang, player_x, player_z):
-                sx = cx * 16 + 4
-                sz = cz * 16 + 4
-                if in_nether:
-                    sx /= 8.0
-                    sz /= 8.0
-                    p_x = player_x / 8.0
-                    p_z = player_z / 8.0
-                else:
-                    p_x = player_x
-                    p_z = player_z
-                dx = sx - p_x
-                dz = sz - p_z
-                tgt = (math.degrees(math.atan2(dz, dx)) + 270) % 360
-                signed = ((tgt + 180) % 360) - 180
-                turn = ((tgt - (h_ang % 360) + 180) % 360) - 180
-                show_ang = angle_display_mode in ("angle_and_change", "angle_only")
-                show_change = angle_display_mode in ("angle_and_change", "change_only")
-                if show_ang:
-                    parts.append(("text", f"{signed:.2f}"))
-                if show_change:
-                    arrow = "->" if turn > 0 else "<-"
-                    parts.append(("angle_change", (arrow, f"{abs(turn):.1f}")))
-            elif key == "overworld_coords":
-                if ow_coords_format == "chunk":
-                    ox, oz = cx, cz
-                elif ow_coords_format == "eight_eight":
-                    ox, oz = cx * 16 + 8, cz * 16 + 8
-                else:
-                    ox, oz = cx * 16 + 4, cz * 16 + 4
-                if show_coords_by_dim and in_nether:
-                    ox, oz = round(ox / 8), round(oz / 8)
-                parts.append(("coords", (ox, oz)))
-            elif key == "nether_coords":
-                nx, nz = cx * 16 + 4, cz * 16 + 4
-                if not (show_coords_by_dim and not in_nether):
-                    nx, nz = round(nx / 8), round(nz / 8)
-                parts.append(("nether_coords_val", (nx, nz)))
-        if parts:
-            _flag = (
-                _portal_link_flags[pred_idx]
-                if pred_idx < len(_portal_link_flags)
-                else False
-            )
-            lines.append((parts, _flag))
-
-    adj_count_overlays = []
-    angle_error_overlays = []
-    if eye_throws:
-        for throw_idx, throw in enumerate(eye_throws):
-            if show_adj_count:
-                angle_without = throw.get("angleWithoutCorrection", 0.0)
-                increments = throw.get("correctionIncrements", 0) or 0
-
-                if increments != 0:
-                    sign = "+" if increments >= 0 else ""
-                    adj_count_overlays.append(
-                        (f"{angle_without:.2f}", f"{sign}{increments}", increments)
-                    )
-                else:
-                    adj_count_overlays.append((f"{angle_without:.2f}", None, None))
-            if show_angle_error:
-                error_val = throw.get("error", None)
-                if error_val is not None:
-                    angle_error_overlays.append((f"{error_val:.4f}",))
+    lines = custom_lines(
+        custom, preds, eye_throws, player_x, player_z, h_ang, in_nether
+    )
+    adj_count_overlays, angle_error_overlays = custom_bottom_rows(custom, eye_throws)
 
     if not lines:
         if not bool(custom.get("auto_hide_window", True)):
@@ -2035,446 +912,18 @@ def generate_custom_pinned_image():
             _schedule(clear_overlay_image)
             return
 
-    font_name = custom.get("font_name", "")
-    font = None
-    if font_name:
-        try:
-            font = ImageFont.truetype(font_name, font_size)
-        except Exception:
-            pass
-    if font is None:
-        _default_font_path = os.path.join(
-            _get_assets_dir(), "LiberationSans", "LiberationSans-Bold.ttf"
-        )
-        try:
-            font = ImageFont.truetype(_default_font_path, font_size)
-        except Exception:
-            font = ImageFont.load_default()
-
-    ascent, descent = font.getmetrics()
-    line_h = ascent + descent + 6
-
-    has_header = any(
-        text_header.get(k, "Text") == "Text" for k in order if enabled.get(k, True)
+    img = _render_custom(
+        "custom_overlay",
+        custom,
+        lines,
+        adj_count_overlays,
+        angle_error_overlays,
+        style=style,
     )
-    header_h = line_h if has_header else 0
 
-    n_bottom_rows = max(len(adj_count_overlays), len(angle_error_overlays))
-    small_font_size = max(8, int(font_size * 0.90))
-    small_font = None
-    if font_name:
-        try:
-            small_font = ImageFont.truetype(font_name, small_font_size)
-        except Exception:
-            pass
-    if small_font is None:
-        _default_font_path = os.path.join(
-            _get_assets_dir(), "LiberationSans", "LiberationSans-Bold.ttf"
-        )
-        try:
-            small_font = ImageFont.truetype(_default_font_path, small_font_size)
-        except Exception:
-            small_font = ImageFont.load_default()
-
-    small_ascent, small_descent = small_font.getmetrics()
-    small_line_h = small_ascent + small_descent + 4
-
-    overlay_header_h_calc = (
-        small_line_h if (show_overlay_header and n_bottom_rows > 0) else 0
-    )
-    bottom_extra_h = (
-        (overlay_header_h_calc + (small_line_h - 2) * n_bottom_rows + 4)
-        if n_bottom_rows > 0
-        else 0
-    )
-    height = header_h + line_h * len(lines) + 10 + bottom_extra_h
-
-    dummy = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
-
-    def _item_display_width(kind, val):
-        if kind == "distance":
-            txt = val[0] if isinstance(val, tuple) else str(val)
-        elif kind in ("coords", "nether_coords_val"):
-            cx_v, cz_v = val
-            parts = ["(", str(cx_v), ", ", str(cz_v), ")"]
-            total = sum(
-                dummy.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                for p in parts
-            )
-            return total + 14, f"({cx_v}, {cz_v})"
-        elif kind == "angle_change":
-            arrow, num = val
-            full_change = f"({arrow} {num})"
-            return dummy.textbbox(
-                (0, 0), full_change, font=font, **stroke_width_kwargs
-            )[2] + 14, full_change
-        else:
-            txt = str(val)
-        return dummy.textbbox((0, 0), txt, font=font, **stroke_width_kwargs)[
-            2
-        ] + 14, txt
-
-    col_widths = []
-    for parts, _plink in lines:
-        for slot_idx, item in enumerate(parts):
-            w, _ = _item_display_width(item[0], item[1])
-            if slot_idx >= len(col_widths):
-                col_widths.append(w)
-            else:
-                col_widths[slot_idx] = max(col_widths[slot_idx], w)
-
-    required_w = 10 + sum(col_widths) + 10
-    img = Image.new("RGBA", (int(required_w + 10), height), bg_rgba)
-    draw = ImageDraw.Draw(img)
-
-    col_x = []
-    cx_acc = 10
-    for w in col_widths:
-        col_x.append(cx_acc)
-        cx_acc += w
-    _last_turn_pct = [0.0]
-
-    if has_header:
-        visible_keys = [k for k in order if enabled.get(k, True)]
-        key_slots = {}
-        slot = 0
-        for key in visible_keys:
-            if key == "angle":
-                slots = []
-                if angle_display_mode in ("angle_and_change", "angle_only"):
-                    slots.append(slot)
-                    slot += 1
-                if angle_display_mode in ("angle_and_change", "change_only"):
-                    slots.append(slot)
-                    slot += 1
-                key_slots[key] = slots
-            else:
-                key_slots[key] = [slot]
-                slot += 1
-        for key in visible_keys:
-            if text_header.get(key, "Text") != "Text":
-                continue
-            slots = key_slots.get(key, [])
-            if not slots:
-                continue
-            first_slot = slots[0]
-            last_slot = slots[-1]
-            if first_slot >= len(col_x) or last_slot >= len(col_widths):
-                continue
-            hdr_txt = HEADER_LABELS.get(key, "")
-            if not hdr_txt:
-                continue
-            tw_val = draw.textbbox((0, 0), hdr_txt, font=font, **stroke_width_kwargs)[2]
-            if key == "angle" and angle_display_mode in ("angle_and_change",):
-                change_slot = slots[-1]
-                if change_slot < len(col_x) and change_slot < len(col_widths):
-                    hx = col_x[change_slot] + (col_widths[change_slot] - tw_val) // 2
-                else:
-                    hx = col_x[first_slot] + (col_widths[first_slot] - tw_val) // 2
-            else:
-                span_start = col_x[first_slot]
-                span_end = col_x[last_slot] + col_widths[last_slot]
-                hx = span_start + (span_end - span_start - tw_val) // 2
-            draw.text((hx, 5), hdr_txt, font=font, fill=text_rgba, **stroke_kwargs)
-
-    for row, (parts, _portal_link) in enumerate(lines):
-        y = 5 + header_h + row * line_h
-        for _item in parts:
-            if _item[0] == "angle_change":
-                try:
-                    _last_turn_pct[0] = float(_item[1][1])
-                except Exception:
-                    pass
-                break
-
-        for slot_idx, item in enumerate(parts):
-            kind = item[0]
-            val = item[1]
-            col_left = col_x[slot_idx] if slot_idx < len(col_x) else 10
-            col_w = col_widths[slot_idx] if slot_idx < len(col_widths) else 0
-
-            def _cx(txt):
-                tw_v = draw.textbbox((0, 0), txt, font=font, **stroke_width_kwargs)[2]
-                return col_left + (col_w - tw_v) // 2
-
-            if kind == "certainty":
-                txt = val
-                try:
-                    pct = float(txt.rstrip("%"))
-                    fill = (*certainty_color(pct), int(text_opacity * 255))
-                except Exception:
-                    fill = text_rgba
-                draw.text((_cx(txt), y), txt, font=font, fill=fill, **stroke_kwargs)
-
-            elif kind == "angle_change":
-                arrow, num = val
-                try:
-                    _last_turn_pct[0] = float(num)
-                except Exception:
-                    pass
-                fill = (*gradient_color(_last_turn_pct[0]), int(text_opacity * 255))
-                full_change = f"({arrow} {num})"
-                cw_ = draw.textbbox(
-                    (0, 0), full_change, font=font, **stroke_width_kwargs
-                )[2]
-                draw.text(
-                    (col_left + (col_w - cw_) // 2, y),
-                    full_change,
-                    font=font,
-                    fill=fill,
-                    **stroke_kwargs,
-                )
-
-            elif kind == "distance":
-                txt = val[0] if isinstance(val, tuple) else str(val)
-                draw.text(
-                    (_cx(txt), y), txt, font=font, fill=text_rgba, **stroke_kwargs
-                )
-
-            elif kind == "coords":
-                cx_v, cz_v = val
-                x_str = str(cx_v)
-                z_str = str(cz_v)
-                x_fill = (
-                    (*neg_coords_rgb, int(text_opacity * 255))
-                    if neg_coords_enabled and cx_v < 0
-                    else text_rgba
-                )
-                z_fill = (
-                    (*neg_coords_rgb, int(text_opacity * 255))
-                    if neg_coords_enabled and cz_v < 0
-                    else text_rgba
-                )
-                _coord_parts = [
-                    ("(", text_rgba),
-                    (x_str, x_fill),
-                    (", ", text_rgba),
-                    (z_str, z_fill),
-                    (")", text_rgba),
-                ]
-                _coord_total_w = sum(
-                    draw.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p, _ in _coord_parts
-                )
-                bx = col_left + (col_w - _coord_total_w) // 2
-                for part_txt, part_fill in _coord_parts:
-                    draw.text(
-                        (bx, y), part_txt, font=font, fill=part_fill, **stroke_kwargs
-                    )
-                    bx += draw.textbbox(
-                        (0, 0), part_txt, font=font, **stroke_width_kwargs
-                    )[2]
-
-            elif kind == "nether_coords_val":
-                cx_v, cz_v = val
-                x_str = str(cx_v)
-                z_str = str(cz_v)
-                _is_portal = portal_nether_enabled and _portal_link
-                punct_fill = (
-                    (*portal_nether_rgb, int(text_opacity * 255))
-                    if _is_portal
-                    else text_rgba
-                )
-                x_fill = (
-                    (*portal_nether_rgb, int(text_opacity * 255))
-                    if _is_portal
-                    else (
-                        (*neg_coords_rgb, int(text_opacity * 255))
-                        if neg_coords_enabled and cx_v < 0
-                        else text_rgba
-                    )
-                )
-                z_fill = (
-                    (*portal_nether_rgb, int(text_opacity * 255))
-                    if _is_portal
-                    else (
-                        (*neg_coords_rgb, int(text_opacity * 255))
-                        if neg_coords_enabled and cz_v < 0
-                        else text_rgba
-                    )
-                )
-                _nether_parts = [
-                    ("(", punct_fill),
-                    (x_str, x_fill),
-                    (", ", punct_fill),
-                    (z_str, z_fill),
-                    (")", punct_fill),
-                ]
-                _nether_total_w = sum(
-                    draw.textbbox((0, 0), p, font=font, **stroke_width_kwargs)[2]
-                    for p, _ in _nether_parts
-                )
-                bx = col_left + (col_w - _nether_total_w) // 2
-                for part_txt, part_fill in _nether_parts:
-                    draw.text(
-                        (bx, y), part_txt, font=font, fill=part_fill, **stroke_kwargs
-                    )
-                    bx += draw.textbbox(
-                        (0, 0), part_txt, font=font, **stroke_width_kwargs
-                    )[2]
-
-            else:
-                txt = str(val)
-                draw.text(
-                    (_cx(txt), y), txt, font=font, fill=text_rgba, **stroke_kwargs
-                )
-
-    actual_left = actual_right = None
-    for parts, _plink_last in lines[-1:]:
-        for slot_idx, item in enumerate(parts):
-            kind, val = item[0], item[1]
-            if slot_idx >= len(col_x) or slot_idx >= len(col_widths):
-                continue
-            c_left = col_x[slot_idx]
-            c_w = col_widths[slot_idx]
-            if kind == "distance":
-                txt = val[0] if isinstance(val, tuple) else str(val)
-            elif kind in ("coords", "nether_coords_val"):
-                cx_v, cz_v = val
-                txt = f"({cx_v}, {cz_v})"
-            elif kind == "angle_change":
-                arrow, num = val
-                arrow_w = draw.textbbox((0, 0), arrow, font=font)[2]
-                total_w = arrow_w + 4 + draw.textbbox((0, 0), num, font=font)[2]
-                cs = c_left + (c_w - total_w) // 2
-                ce = cs + total_w
-                actual_left = cs if actual_left is None else min(actual_left, cs)
-                actual_right = ce if actual_right is None else max(actual_right, ce)
-                continue
-            else:
-                txt = str(val)
-            txt_w = draw.textbbox((0, 0), txt, font=font)[2]
-            cs = c_left + (c_w - txt_w) // 2
-            ce = cs + txt_w
-            actual_left = cs if actual_left is None else min(actual_left, cs)
-            actual_right = ce if actual_right is None else max(actual_right, ce)
-    if actual_left is None:
-        actual_left = 10
-    if actual_right is None:
-        actual_right = 10
-
-    n_overlay_rows = max(len(adj_count_overlays), len(angle_error_overlays))
-    if n_overlay_rows > 0:
-        overlay_header_h = overlay_header_h_calc
-        base_y = header_h + line_h * len(lines) + 10
-        first_err_x = first_err_w = first_adj_x = first_adj_total_w = None
-
-        for oi in range(n_overlay_rows):
-            row_y = base_y + overlay_header_h + oi * (small_line_h - 2) - 2
-            if oi < len(adj_count_overlays):
-                angle_txt, count_txt, adj_raw = adj_count_overlays[oi]
-                angle_w = draw.textbbox(
-                    (0, 0), angle_txt, font=small_font, **stroke_width_kwargs
-                )[2]
-                count_w = (
-                    draw.textbbox(
-                        (0, 0), count_txt, font=small_font, **stroke_width_kwargs
-                    )[2]
-                    if count_txt
-                    else 0
-                )
-                total_w = angle_w + count_w
-                adj_x = (
-                    actual_right - total_w
-                    if oi == 0
-                    else first_adj_x + (first_adj_total_w - total_w) // 2
-                )
-                if oi == 0:
-                    first_adj_x = adj_x
-                    first_adj_total_w = total_w
-                draw.text(
-                    (adj_x, row_y),
-                    angle_txt,
-                    font=small_font,
-                    fill=text_rgba,
-                    **stroke_kwargs,
-                )
-                if count_txt:
-                    base_color = (
-                        ADJ_COUNT_POSITIVE
-                        if (adj_raw is None or adj_raw >= 0)
-                        else ADJ_COUNT_NEGATIVE
-                    )
-                    adj_fill = (*base_color, int(text_opacity * 255))
-                    draw.text(
-                        (adj_x + angle_w, row_y),
-                        count_txt,
-                        font=small_font,
-                        fill=adj_fill,
-                        **stroke_kwargs,
-                    )
-            if oi < len(angle_error_overlays):
-                err_txt = angle_error_overlays[oi][0]
-                err_txt_w = draw.textbbox(
-                    (0, 0), err_txt, font=small_font, **stroke_width_kwargs
-                )[2]
-                err_x = (
-                    actual_left
-                    if oi == 0
-                    else first_err_x + (first_err_w - err_txt_w) // 2
-                )
-                if oi == 0:
-                    first_err_x = err_x
-                    first_err_w = err_txt_w
-                draw.text(
-                    (err_x, row_y),
-                    err_txt,
-                    font=small_font,
-                    fill=text_rgba,
-                    **stroke_kwargs,
-                )
-
-        if show_overlay_header and n_overlay_rows > 0:
-            hdr_y = base_y - 2
-            if (
-                angle_error_overlays
-                and first_err_x is not None
-                and first_err_w is not None
-            ):
-                w_e = draw.textbbox(
-                    (0, 0), "Error", font=small_font, **stroke_width_kwargs
-                )[2]
-                draw.text(
-                    (first_err_x + (first_err_w - w_e) // 2, hdr_y),
-                    "Error",
-                    font=small_font,
-                    fill=text_rgba,
-                    **stroke_kwargs,
-                )
-            if (
-                adj_count_overlays
-                and first_adj_x is not None
-                and first_adj_total_w is not None
-            ):
-                w_a = draw.textbbox(
-                    (0, 0), "Angle", font=small_font, **stroke_width_kwargs
-                )[2]
-                draw.text(
-                    (first_adj_x + (first_adj_total_w - w_a) // 2, hdr_y),
-                    "Angle",
-                    font=small_font,
-                    fill=text_rgba,
-                    **stroke_kwargs,
-                )
-
-    tmp = IMAGE_PATH + ".tmp.png"
-    try:
-        img.save(tmp, format="PNG")
-        try:
-            os.replace(tmp, IMAGE_PATH)
-            log(f"[Render] Saved overlay image: {IMAGE_PATH}")
-        except Exception:
-            try:
-                if os.path.exists(IMAGE_PATH):
-                    os.remove(IMAGE_PATH)
-                os.rename(tmp, IMAGE_PATH)
-                log(f"[Render] Saved overlay image (Fallback rename): {IMAGE_PATH}")
-            except Exception as e:
-                log("[Render] Failed to move tmp overlay file into place:", e)
-    except Exception as e:
-        log("[Render] Failed to save overlay image:", e)
-
-    _schedule(lambda im=img: apply_overlay_from_pil(im))
+    if _write_overlay_png(img):
+        log(f"[Render] Saved overlay image: {IMAGE_PATH}")
+    _apply_later(img)
 
 
 # --------------------- END Generate custom pinned image overlay ----------------------
@@ -2487,124 +936,14 @@ def get_window_hiding_method():
     global _window_hiding_method
     if _window_hiding_method is not None:
         return _window_hiding_method
-    try:
-        with open(CUSTOMIZATIONS_FILE, "r") as f:
-            data = json.load(f)
-        _window_hiding_method = data.get("hide_method", "withdraw")
-    except Exception:
-        _window_hiding_method = "withdraw"
+    _window_hiding_method = get_customizations().get("hide_method", "withdraw")
     log(f"[Window] Hide method loaded from config: '{_window_hiding_method}'")
     return _window_hiding_method
 
 
-# ---------------------- Qt Scheduler ----------------------
-
-
-class _Scheduler(QObject):
-    _fn_signal = pyqtSignal(object)
-
-    def __init__(self):
-        super().__init__()
-        self._fn_signal.connect(self._invoke, Qt.QueuedConnection)
-
-    @staticmethod
-    def _invoke(fn):
-        try:
-            fn()
-        except Exception as e:
-            log(f"[Scheduler] Exception in scheduled call: {e}")
-
-    def schedule(self, fn):
-        self._fn_signal.emit(fn)
-
-
-# ---------------------- Qt Overlay Window ----------------------
-
-
-class OverlayWindow(QWidget):
-    def __init__(self):
-        super().__init__()
-
-        if CLICK_THROUGH:
-            self.setWindowFlags(
-                Qt.FramelessWindowHint
-                | Qt.WindowStaysOnTopHint
-                | Qt.Tool
-                | Qt.X11BypassWindowManagerHint
-                | Qt.WindowTransparentForInput
-            )
-        else:
-            self.setWindowFlags(
-                Qt.FramelessWindowHint
-                | Qt.WindowStaysOnTopHint
-                | Qt.Tool
-                | Qt.X11BypassWindowManagerHint
-            )
-        self.setAttribute(Qt.WA_TranslucentBackground)
-        self.setAttribute(Qt.WA_NoSystemBackground)
-        self.setContentsMargins(0, 0, 0, 0)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(0)
-
-        self._label = QLabel(self)
-        self._label.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(self._label)
-
-        self._drag_pos = None
-
-    def mousePressEvent(self, event):
-        if not LOCK_OVERLAY and event.button() == Qt.LeftButton:
-            self._drag_pos = event.globalPos() - self.frameGeometry().topLeft()
-            event.accept()
-
-    def mouseMoveEvent(self, event):
-        if (
-            not LOCK_OVERLAY
-            and self._drag_pos is not None
-            and event.buttons() & Qt.LeftButton
-        ):
-            self.move(event.globalPos() - self._drag_pos)
-            event.accept()
-
-    def mouseReleaseEvent(self, event):
-        if (
-            not LOCK_OVERLAY
-            and event.button() == Qt.LeftButton
-            and self._drag_pos is not None
-        ):
-            self._drag_pos = None
-            if self.width() > 1 and self.height() > 1:
-                save_config()
-                log(
-                    f"[Window] Manual window repositioning finished (pos: {self.x()},{self.y()})"
-                )
-            event.accept()
-
-
 # ---------------------- Helpers ----------------------
 
 
-def pil_to_qpixmap(pil_img):
-    if pil_img.mode != "RGBA":
-        pil_img = pil_img.convert("RGBA")
-    data = pil_img.tobytes("raw", "RGBA")
-    qimage = QImage(
-        data, pil_img.width, pil_img.height, pil_img.width * 4, QImage.Format_RGBA8888
-    )
-    return QPixmap.fromImage(qimage)
-
-
-def _apply_img_opacity(img, op):
-    if op >= 1.0:
-        return img
-    img = img.convert("RGBA")
-    _a = img.split()[-1].point(lambda i: int(i * op))
-    img.putalpha(_a)
-    return img
-
-
 def show_window():
     if HEADLESS:
         return
@@ -2691,24 +1030,30 @@ def _render_and_apply_blank_custom_overlay(custom):
 
 
 def apply_overlay_from_pil(pil_img, width=None, height=None):
+    # Only a frame showing Ninjabrain Bot data counts, not the blank fallback.
+    if _startup.enabled and status["stronghold_resp"]:
+        _startup.first_frame()
     if HEADLESS:
         w = int(width) if width is not None else pil_img.width
         h = int(height) if height is not None else pil_img.height
         log(f"[System] Headless mode: overlay written ({w}x{h}px)")
         return
     try:
-        qpixmap = pil_to_qpixmap(pil_img)
-        label.setPixmap(qpixmap)
+        with _profiler.stage("qt_convert"):
+            qpixmap = pil_to_qpixmap(pil_img)
 
-        w = int(width) if width is not None else pil_img.width
-        h = int(height) if height is not None else pil_img.height
+        with _profiler.stage("show"):
+            label.setPixmap(qpixmap)
+
+            w = int(width) if width is not None else pil_img.width
+            h = int(height) if height is not None else pil_img.height
 
-        global _last_overlay_w, _last_overlay_h
-        if w > 100:
-            _last_overlay_w, _last_overlay_h = w, h
+            global _last_overlay_w, _last_overlay_h
+            if w > 100:
+                _last_overlay_w, _last_overlay_h = w, h
 
-        place_window(w, h)
-        show_window()
+            place_window(w, h)
+            show_window()
 
         log(f"[Window] Applying overlay ({w}x{h}px) at ({window.x()},{window.y()})")
     except Exception as e:
@@ -2716,14 +1061,15 @@ def apply_overlay_from_pil(pil_img, width=None, height=None):
 
 
 def check_ninjabrainbot_version():
-    sent_print_error = False
+    client = NinjabrainBotClient(timeout=3, recorder=_recorder)
     required = [1, 5, 2]
 
+    # The API polling thread already tells the user when Ninjabrain Bot is not
+    # reachable, this only waits for it to connect and then reads the version.
     while True:
+        _nb_connected.wait()
         try:
-            resp = requests.get("http://localhost:52533/api/v1/version", timeout=3)
-            resp.raise_for_status()
-            data = resp.json()
+            data = client.get("version")
             version_str = data.get("version", "")
             parts = [int(x) for x in version_str.split(".")]
             if parts < required:
@@ -2733,26 +1079,160 @@ def check_ninjabrainbot_version():
                     f"Please update to the latest version:\n"
                     f"https://github.com/Ninjabrain1/Ninjabrain-Bot/releases/latest"
                 )
-                sys.exit(1)
-            return
-        except SystemExit:
-            raise
+                return False
+            log(f"[Startup] Ninjabrain Bot version {version_str}")
+            return True
         except Exception as e:
             log(f"Could not connect to Ninjabrain Bot to verify version: {e}\n")
-            if not sent_print_error:
+            time.sleep(1)
+
+
+def request_exit(code=0):
+    global _exit_code
+    _exit_code = code
+    if HEADLESS:
+        _shutdown.set()
+    else:
+        _schedule(lambda: app.exit(code))
+
+
+# Ctrl+C, a closed terminal or a kill end NBTrackr through request_exit, so the
+# atexit handlers still write settings the JsonWriters are holding back. A
+# second signal ends it right away.
+EXIT_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+def _exit_on_signal(signum, _frame):
+    for signum_ in EXIT_SIGNALS:
+        signal.signal(signum_, signal.SIG_DFL)
+    log(f"[System] Received signal {signum}, exiting")
+    request_exit(128 + signum)
+
+
+def install_exit_signals():
+    for signum in EXIT_SIGNALS:
+        signal.signal(signum, _exit_on_signal)
+
+
+def nb_version_check_thread():
+    if not check_ninjabrainbot_version():
+        request_exit(1)
+
+
+def release_check_thread():
+    from core.updater import check_for_update
+
+    latest = check_for_update(APP_VERSION)
+    if latest and not bool(get_customizations().get("background_updates_enabled", False)):
+        print("=== New Release Available! ===")
+        print(f"Version: {latest}")
+        print("You should update to the latest version!")
+        print("Run `nbtrackr --update` to automatically update to the latest version.\n")
+
+
+BACKGROUND_UPDATE_DELAY = 120
+BACKGROUND_UPDATE_INTERVAL = 6 * 60 * 60
+
+
+def background_update_thread():
+    from core.updater import fetch_release, lower_thread_priority, stage_update
+
+    lower_thread_priority()
+    install_dir = os.path.dirname(os.path.abspath(__file__))
+    announced = None
+    time.sleep(BACKGROUND_UPDATE_DELAY)
+    while True:
+        try:
+            release = fetch_release()
+            staged = stage_update(release, install_dir, APP_VERSION)
+            if staged and announced != release["tag_name"]:
+                announced = release["tag_name"]
                 print(
-                    "ERROR: Cannot connect to Ninjabrain Bot. Make sure it is running and API is enabled in Ninjabrain Bot > Settings > Advanced."
+                    f"NBTrackr {announced} was downloaded in the background and will "
+                    f"be installed the next time NBTrackr starts.\n"
                 )
-                sent_print_error = True
-            time.sleep(1)
+        except Exception as e:
+            log(f"[Updater] Background update failed: {e}")
+        time.sleep(BACKGROUND_UPDATE_INTERVAL)
+
+
+def _warm_render_worker():
+    custom = get_customizations()
+    try:
+        font_size = int(custom.get("font_size", 18))
+    except Exception:
+        font_size = 18
+    _render_nb_stronghold(
+        [],
+        [],
+        None,
+        None,
+        None,
+        False,
+        font_size,
+        False,
+        (0, 0, 0),
+        custom.get("overworld_coords_format", "four_four"),
+        False,
+        boat_state="NONE",
+        force_empty=True,
+        user_font_path=custom.get("font_name", ""),
+    )
+    if bool(custom.get("use_custom_pinned_image", False)):
+        render_custom_text(custom, "0")
+
+
+def start_render_pool():
+    custom = get_customizations()
+    if not bool(custom.get("render_worker_enabled", False)):
+        return None
+    try:
+        workers = max(1, int(custom.get("render_workers", 1)))
+    except Exception:
+        workers = 1
+    try:
+        pool = RenderWorkerPool(
+            _RENDERERS,
+            workers=workers,
+            warmup=_warm_render_worker,
+        )
+    except Exception as e:
+        log(f"[Render] Could not start render worker: {e}")
+        return None
+    atexit.register(pool.close)
+    log(f"[Render] Started {workers} render worker process(es)")
+    return pool
+
+
+def start_session_recorder():
+    path = RECORD_PATH or default_recording_path()
+    try:
+        recorder = SessionRecorder(path, log=log, version=APP_VERSION)
+    except OSError as e:
+        print(f"Could not record to {path}: {e}")
+        return None
+    atexit.register(recorder.close)
+    print(f"Recording Ninjabrain Bot responses to {path}")
+    return recorder
 
 
 # ---------------------- Helpers - END ----------------------
 
 # --------------------- Config load/save --------------------------
 
+# The tracker is the only writer of settings.json, the position is read from
+# disk once and kept in memory after that. Saves are written in the background.
+_settings_writer = JsonWriter(CONFIG_FILE, indent=2, log=log)
+atexit.register(_settings_writer.flush)
+_window_position = None
+_window_position_loaded = False
+
 
 def load_config():
+    global _window_position, _window_position_loaded
+    if _window_position_loaded:
+        return _window_position
+    _window_position_loaded = True
     try:
         if not os.path.exists(CONFIG_DIR):
             os.makedirs(CONFIG_DIR, exist_ok=True)
@@ -2765,26 +1245,32 @@ def load_config():
                 y = pos.get("y")
                 if isinstance(x, int) and isinstance(y, int):
                     log(f"[Config] Loaded window position: x={x}, y={y}")
-                    return x, y
+                    _window_position = (x, y)
     except Exception as e:
         log(f"[Config] Failed to load settings.json: {e}")
-    return None
+    return _window_position
 
 
 def save_config():
+    global _window_position, _window_position_loaded
     try:
-        if not os.path.exists(CONFIG_DIR):
-            os.makedirs(CONFIG_DIR, exist_ok=True)
         x = window.x()
         y = window.y()
-        config = {"position": {"x": x, "y": y}}
-        with open(CONFIG_FILE, "w") as f:
-            json.dump(config, f, indent=2)
+        _window_position = (x, y)
+        _window_position_loaded = True
+        _settings_writer.save({"position": {"x": x, "y": y}})
         log(f"[Config] Saved window position: x={x}, y={y}")
     except Exception as e:
         log(f"[Config] Failed to save settings.json: {e}")
 
 
+def _window_moved():
+    save_config()
+    log(
+        f"[Window] Manual window repositioning finished (pos: {window.x()},{window.y()})"
+    )
+
+
 def load_customizations():
     try:
         if os.path.exists(CUSTOMIZATIONS_FILE):
@@ -2804,27 +1290,21 @@ def load_customizations():
 # --------------------- Startup --------------------------
 
 if __name__ == "__main__":
-    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    _startup.mark("imports and module body")
+    install_exit_signals()
+    _profiler.install_dump_signal()
+    if _profiler.enabled:
+        log(f"[Profiler] Collecting frame timings, dump with: kill -USR1 {os.getpid()}")
     print(f"NBTrackr version: {APP_VERSION}\n")
 
-    os.environ["QT_QPA_PLATFORM"] = "xcb"
-    log(f"[System] QT_QPA_PLATFORM set to: {os.environ.get('QT_QPA_PLATFORM')}")
+    if UPDATE_FLAG:
+        from core.updater import check_and_update
 
-    check_ninjabrainbot_version()
+        check_and_update(APP_VERSION, os.path.dirname(os.path.abspath(__file__)))
+        sys.exit(0)
 
-    latest = check_for_update(APP_VERSION)
-    if latest:
-        print("=== New Release Available! ===")
-        print(f"Version: {latest}")
-        print("You should update to the latest version!")
-        print("1) Continue with the current version")
-        print("2) Automatically update to the latest version")
-        choice = input("Enter choice [1/2]: ").strip()
-        print()
-        if choice == "2":
-            check_and_update(APP_VERSION, os.path.dirname(os.path.abspath(__file__)))
-        else:
-            print("Skipping update. Continuing with current version", APP_VERSION, "\n")
+    os.environ["QT_QPA_PLATFORM"] = "xcb"
+    log(f"[System] QT_QPA_PLATFORM set to: {os.environ.get('QT_QPA_PLATFORM')}")
 
 # --------------------- Qt Application & Overlay Window --------------------------
 
@@ -2833,16 +1313,33 @@ IMAGE_PATH = "/tmp/imgpin-overlay.png"
 GREEN_IMG = os.path.join(os.path.dirname(__file__), "assets/boat_green.png")
 RED_IMG = os.path.join(os.path.dirname(__file__), "assets/boat_red.png")
 
+# Must run before QApplication and the worker threads exist, the render
+# workers are forked from this process. Nothing is started when the tracker is
+# only imported (benchmarks/render_bench.py).
+_render_pool = start_render_pool() if __name__ == "__main__" else None
+_startup.mark("render pool")
+
 if HEADLESS:
     app = None
     window = None
     label = None
     _scheduler = None
 else:
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from core.overlay_window import OverlayWindow, Scheduler, pil_to_qpixmap
+
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
+    _scheduler = Scheduler(log)
+    # Signal handlers only run when the main thread runs Python code, the
+    # timer makes sure it does while Qt's event loop is idle.
+    _signal_timer = QTimer()
+    _signal_timer.timeout.connect(lambda: None)
+    _signal_timer.start(250)
+    _startup.mark("qt application")
 
-    window = OverlayWindow()
+    window = OverlayWindow(CLICK_THROUGH, LOCK_OVERLAY, on_moved=_window_moved)
 
     saved_pos = load_config()
     if saved_pos:
@@ -2867,8 +1364,7 @@ else:
         save_config()
 
     label = window._label
-
-_scheduler = _Scheduler() if not HEADLESS else None
+    _startup.mark("overlay window")
 
 
 # --------------------- Status & Thread Setup --------------------------
@@ -2890,46 +1386,81 @@ status = {
     "stronghold_resp": {},
     "blind_resp": {},
     "info_resp": {},
+    "generation": 0,
+    # time.monotonic() when the current generation came back from Ninjabrain Bot
+    "arrived": None,
 }
 
 USE_CUSTOM_PINNED_IMAGE = load_customizations()
 
 
-def idle_update_frequency():
-    with status_lock:
-        result_type = status["resultType"]
-        blind_showing = status.get("blindCurrentlyShowing", False)
+# Set by the polling thread whenever Ninjabrain Bot's data changed, the image
+# thread renders right away instead of waiting out its interval.
+_data_changed = threading.Event()
+_poll_interval = None
+# Set while the polling thread is connected to Ninjabrain Bot.
+_nb_connected = threading.Event()
+
 
-    if result_type == "TRIANGULATION" or (result_type == "BLIND" and blind_showing):
+def idle_update_frequency():
+    if _poll_interval is None:
         return MAX_API_POLLING_RATE
-    return IDLE_API_POLLING_RATE
+    return _poll_interval
+
+
+def _poll_cpu_budget():
+    try:
+        return float(get_customizations().get("poll_cpu_budget", DEFAULT_CPU_BUDGET))
+    except (TypeError, ValueError):
+        return DEFAULT_CPU_BUDGET
+
+
+NB_UNREACHABLE_MESSAGE = (
+    "ERROR: Cannot connect to Ninjabrain Bot. Make sure it is running and API is "
+    "enabled in Ninjabrain Bot > Settings > Advanced."
+)
 
 
 def api_polling_thread():
+    global _poll_interval
     log("[System] API polling thread started")
+    client = NinjabrainBotClient(timeout=0.5, recorder=_recorder)
+    planner = PollPlanner(log=log)
+    rate = PollRateController(log=log)
+    backoff = Backoff()
     _nb_was_connected = False
     _nb_error_printed = False
 
     while True:
+        if not _nb_was_connected and not client.probe():
+            if not _nb_error_printed:
+                print(NB_UNREACHABLE_MESSAGE)
+                log("[Connection] Ninjabrain Bot is not listening")
+                _nb_error_printed = True
+            time.sleep(backoff.next())
+            continue
+
+        changed = False
+        fetch_start = time.monotonic()
+        cpu_start = time.thread_time()
         try:
-            boat_resp = requests.get(
-                "http://localhost:52533/api/v1/boat", timeout=0.5
-            ).json()
-            stronghold_resp = requests.get(
-                "http://localhost:52533/api/v1/stronghold", timeout=0.5
-            ).json()
-            blind_resp = requests.get(
-                "http://localhost:52533/api/v1/blind", timeout=0.5
-            ).json()
-            info_resp = requests.get(
-                "http://localhost:52533/api/v1/information-messages", timeout=0.5
-            ).json()
+            responses = planner.poll(
+                client, get_customizations(), USE_CUSTOM_PINNED_IMAGE
+            )
+            fetched_at = time.monotonic()
+            _profiler.fetched(fetched_at - fetch_start)
+            boat_resp = responses["boat"]
+            stronghold_resp = responses["stronghold"]
+            blind_resp = responses["blind"]
+            info_resp = responses["information-messages"]
 
             if not _nb_was_connected:
                 print("Connected to Ninjabrain Bot.")
                 log("[Connection] Successfully connected to Ninjabrain Bot API")
                 _nb_was_connected = True
                 _nb_error_printed = False
+                backoff.reset()
+                _nb_connected.set()
 
             boat_state = boat_resp.get("boatState")
             boat_angle = boat_resp.get("boatAngle", None)
@@ -2953,6 +1484,15 @@ def api_polling_thread():
                 expired = now >= status["showUntil"]
                 prev_blind_result = status["blindResult"]
                 prev_blind_enabled = status["blindModeEnabled"]
+                if (
+                    boat_resp != status["boat_resp"]
+                    or stronghold_resp != status["stronghold_resp"]
+                    or blind_resp != status["blind_resp"]
+                    or info_resp != status["info_resp"]
+                ):
+                    status["generation"] += 1
+                    status["arrived"] = fetched_at
+                    changed = True
 
                 status["boatState"] = boat_state
                 status["boatAngle"] = boat_angle
@@ -3063,42 +1603,65 @@ def api_polling_thread():
                 log(f"[Connection] Connection lost: {e}")
                 _nb_was_connected = False
                 _nb_error_printed = False
+                _nb_connected.clear()
+                planner.reset()
+                # Once per disconnect, not on every failed attempt after it.
+                with status_lock:
+                    status.update(
+                        {
+                            "boatState": None,
+                            "boatAngle": None,
+                            "resultType": None,
+                            "isInNether": False,
+                            "lastShown": None,
+                            "showUntil": 0,
+                            "lastAngle": None,
+                            "blindModeEnabled": False,
+                            "blindResult": None,
+                            "blindShowUntil": 0,
+                            "blindCurrentlyShowing": False,
+                            "info_resp": {},
+                        }
+                    )
+                    status["generation"] += 1
+                    status["arrived"] = time.monotonic()
+                _data_changed.set()
             if not _nb_error_printed:
-                print(
-                    "ERROR: Cannot connect to Ninjabrain Bot. Make sure it is running and API is enabled in Ninjabrain Bot > Settings > Advanced."
-                )
+                print(NB_UNREACHABLE_MESSAGE)
                 log(f"[Connection] Failed to connect: {e}")
                 _nb_error_printed = True
+            time.sleep(backoff.next())
+            continue
 
-            with status_lock:
-                status.update(
-                    {
-                        "boatState": None,
-                        "boatAngle": None,
-                        "resultType": None,
-                        "isInNether": False,
-                        "lastShown": None,
-                        "showUntil": 0,
-                        "lastAngle": None,
-                        "blindModeEnabled": False,
-                        "blindResult": None,
-                        "blindShowUntil": 0,
-                        "blindCurrentlyShowing": False,
-                        "info_resp": {},
-                    }
-                )
-
-        time.sleep(MAX_API_POLLING_RATE)
+        if changed:
+            _data_changed.set()
+        _poll_interval = rate.update(
+            changed,
+            time.monotonic() - fetch_start,
+            time.thread_time() - cpu_start,
+            MAX_API_POLLING_RATE,
+            IDLE_API_POLLING_RATE,
+            _poll_cpu_budget(),
+        )
+        time.sleep(_poll_interval)
 
 
 def image_update_thread():
     log("[System] Image generation thread started")
+    next_config_check = 0
     while True:
-        if USE_CUSTOM_PINNED_IMAGE:
-            generate_custom_pinned_image()
-        else:
-            generate_default_pinned_image()
-        time.sleep(idle_update_frequency())
+        if time.monotonic() >= next_config_check:
+            reload_customizations_if_changed()
+            next_config_check = time.monotonic() + CONFIG_CHECK_INTERVAL
+        _data_changed.clear()
+        _profiler.begin_frame()
+        with _render_lock:
+            if USE_CUSTOM_PINNED_IMAGE:
+                generate_custom_pinned_image()
+            else:
+                generate_default_pinned_image()
+        _profiler.drop_frame()
+        _data_changed.wait(idle_update_frequency())
 
 
 def blind_timer_monitor_thread():
@@ -3128,16 +1691,209 @@ def blind_timer_monitor_thread():
             time.sleep(1)
 
 
-threading.Thread(target=api_polling_thread, daemon=True).start()
-threading.Thread(target=image_update_thread, daemon=True).start()
-threading.Thread(target=blind_timer_monitor_thread, daemon=True).start()
+# --------------------- Live config --------------------------
 
-if HEADLESS:
-    print("Running in headless mode. Writing overlay to", IMAGE_PATH)
+# Settings saved in the Customizer are pushed over IPC and take effect on the
+# next tick, the tracker then writes customizations.json itself. The file is
+# only checked once a second, for edits made while no tracker was listening.
+
+CONFIG_CHECK_INTERVAL = 1.0
+_config_lock = threading.Lock()
+_customizations_writer = JsonWriter(CUSTOMIZATIONS_FILE, log=log)
+atexit.register(_customizations_writer.flush)
+
+
+def _apply_runtime_settings(custom):
+    global IDLE_API_POLLING_RATE, MAX_API_POLLING_RATE, USE_CUSTOM_PINNED_IMAGE
+    global _window_hiding_method, _last_custom, _last_default_stronghold
+    use_custom = custom.get("use_custom_pinned_image", False)
+    use_custom = use_custom if isinstance(use_custom, bool) else False
+    with _render_lock:
+        try:
+            IDLE_API_POLLING_RATE = float(
+                custom.get("idle_api_polling_rate", IDLE_API_POLLING_RATE)
+            )
+            MAX_API_POLLING_RATE = float(
+                custom.get("max_api_polling_rate", MAX_API_POLLING_RATE)
+            )
+        except (TypeError, ValueError):
+            pass
+        if use_custom != USE_CUSTOM_PINNED_IMAGE:
+            overlay = "custom" if use_custom else "default"
+            log(f"[Config] Switched to the {overlay} overlay")
+        USE_CUSTOM_PINNED_IMAGE = use_custom
+        _window_hiding_method = custom.get("hide_method", "withdraw")
+        # Not every setting is part of the renderers' cache keys, draw the
+        # overlay again on the next tick.
+        _last_custom = None
+        _last_default_stronghold = None
+
+
+def apply_customizations(changes, removed=()):
+    global _cached_customizations
+    if not isinstance(changes, dict) or not isinstance(removed, (list, tuple)):
+        raise ValueError("bad customizations")
+    with _config_lock:
+        custom = dict(get_customizations())
+        custom.update(changes)
+        for key in removed:
+            custom.pop(key, None)
+        validate_customizations(custom, IDLE_API_POLLING_RATE, MAX_API_POLLING_RATE)
+        _cached_customizations = custom
+        _customizations_writer.save(custom)
+    # Saved by the user, written right away rather than after the delay.
+    _customizations_writer.flush()
+    _apply_runtime_settings(custom)
+    log(f"[Config] Applied {len(changes) + len(removed)} changed setting(s)")
+    return custom
+
+
+def reload_customizations_if_changed():
+    global _cached_customizations, _last_custom_file
+    generation = file_generation(CUSTOMIZATIONS_FILE)
+    if generation is None or generation == _last_custom_file:
+        return
     try:
-        while True:
-            time.sleep(1)
-    except KeyboardInterrupt:
-        pass
-else:
-    sys.exit(app.exec_())
+        with open(CUSTOMIZATIONS_FILE, "r") as f:
+            custom = json.load(f)
+        if not isinstance(custom, dict):
+            raise ValueError("not an object")
+    except Exception as e:
+        # Keeps running with the last good settings, until the file changes.
+        _last_custom_file = generation
+        _report_config(f"Ignoring customizations.json: {e}")
+        return
+    custom = _usable_customizations(custom)
+    with _config_lock:
+        _last_custom_file = generation
+        # Our own write of the settings applied over IPC.
+        if custom == _cached_customizations:
+            return
+        _cached_customizations = custom
+    _apply_runtime_settings(custom)
+    log("[Config] Customizations reloaded from disk")
+
+
+# --------------------- IPC --------------------------
+
+# The Customizer asks the running tracker for its data, renders previews of
+# unsaved settings here, where fonts and layouts are already warm, and pushes
+# saved settings through "apply".
+
+
+def _ipc_apply(req):
+    try:
+        apply_customizations(req.get("changes"), req.get("removed", []))
+    except ValueError as e:
+        raise IPCRejected(str(e))
+    return {"ok": True}, None
+
+
+def _ipc_ping(req):
+    return {"ok": True, "version": APP_VERSION, "pid": os.getpid()}, None
+
+
+def _ipc_generation(req):
+    with status_lock:
+        return {"ok": True, "generation": status["generation"]}, None
+
+
+def _ipc_snapshot(req):
+    with status_lock:
+        snapshot = {
+            key: status[key]
+            for key in ("boat_resp", "stronghold_resp", "blind_resp", "info_resp")
+        }
+        generation = status["generation"]
+    return {"ok": True, "generation": generation, "snapshot": snapshot}, None
+
+
+def _ipc_frame(req):
+    img = _last_frame
+    if img is None:
+        return {"ok": True}, None
+    return image_reply(img)
+
+
+def _ipc_preview(req):
+    kind = req.get("kind")
+    settings = req.get("settings")
+    if kind not in PREVIEW_KINDS or not isinstance(settings, dict):
+        raise ValueError("bad preview request")
+
+    with status_lock:
+        boat_resp = status["boat_resp"]
+        stronghold_resp = status["stronghold_resp"]
+        blind_resp = status["blind_resp"]
+        info_resp = status["info_resp"]
+        generation = status["generation"]
+    blind_result = blind_resp.get("blindResult") or {}
+    if kind in ("blind", "default_blind"):
+        has_data = blind_result.get("evaluation") is not None
+    else:
+        has_data = bool(stronghold_resp.get("predictions"))
+    if not has_data:
+        return {"ok": True, "generation": generation}, None
+
+    data = {
+        "preds": stronghold_resp.get("predictions", []),
+        "eye_throws": stronghold_resp.get("eyeThrows", []),
+        "player": stronghold_resp.get("playerPosition", {}),
+        "blind_result": blind_result,
+        "boat_state": boat_resp.get("boatState"),
+        "info_messages": info_resp.get("informationMessages", []),
+    }
+    with _render_lock:
+        img = render_preview(kind, settings, data, APP_VERSION)
+    if img is None:
+        return {"ok": True, "generation": generation}, None
+    return image_reply(img, generation=generation)
+
+
+IPC_HANDLERS = {
+    "ping": _ipc_ping,
+    "generation": _ipc_generation,
+    "snapshot": _ipc_snapshot,
+    "frame": _ipc_frame,
+    "preview": _ipc_preview,
+    "apply": _ipc_apply,
+}
+
+
+def start_ipc_server():
+    server = IPCServer(IPC_HANDLERS, log=log)
+    try:
+        if not server.start():
+            return None
+    except OSError as e:
+        log(f"[IPC] Could not open {server.path}: {e}")
+        return None
+    atexit.register(server.close)
+    return server
+
+
+if __name__ == "__main__":
+    if RECORD_FLAG:
+        _recorder = start_session_recorder()
+    threading.Thread(target=api_polling_thread, daemon=True).start()
+    threading.Thread(target=image_update_thread, daemon=True).start()
+    threading.Thread(target=blind_timer_monitor_thread, daemon=True).start()
+    # The version handshake and the release check run next to the poller so
+    # nothing before the first overlay frame waits on the network.
+    threading.Thread(target=nb_version_check_thread, daemon=True).start()
+    if not NO_UPDATE_CHECK_FLAG:
+        threading.Thread(target=release_check_thread, daemon=True).start()
+        if bool(get_customizations().get("background_updates_enabled", False)):
+            threading.Thread(target=background_update_thread, daemon=True).start()
+    start_ipc_server()
+    _startup.mark("threads")
+
+    if HEADLESS:
+        print("Running in headless mode. Writing overlay to", IMAGE_PATH)
+        try:
+            _shutdown.wait()
+        except KeyboardInterrupt:
+            pass
+        sys.exit(_exit_code)
+    else:
+        sys.exit(app.exec_())
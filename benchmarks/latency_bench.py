@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+from core.profiler import percentile  # noqa: E402
+from nb_loadgen import LoadGenerator, scenario_config  # noqa: E402
+from pipeline_bench import load_default_customizations, run_tracker  # noqa: E402
+
+# Measures how long a new stronghold result takes from Ninjabrain Bot to the
+# overlay. The synthetic Ninjabrain Bot changes its result every change_period
+# seconds, so the moment each result appeared is known. The tracker stamps the
+# snapshot with the time the poll brought it back, and the profiler closes the
+# first frame that shows it once the overlay file is renamed into place (sink)
+# and once apply_overlay_from_pil has run (pixel). Everything is read from
+# time.monotonic(), which Linux shares between processes.
+
+# name: customizations applied on top of the Customizer's defaults
+CONFIGS = {
+    "default": {},
+    "custom": {"use_custom_pinned_image": True},
+    "default_outline": {"text_outline_enabled": True},
+    "custom_outline": {"use_custom_pinned_image": True, "text_outline_enabled": True},
+    "render_worker": {"render_worker_enabled": True},
+    "custom_render_worker": {"use_custom_pinned_image": True, "render_worker_enabled": True},
+    "slow_poll": {"idle_api_polling_rate": 0.3, "max_api_polling_rate": 0.15},
+}
+
+# span: (from, to)
+SPANS = {
+    "poll": ("change", "arrived"),
+    "render": ("arrived", "shown"),
+    "sink": ("change", "sink"),
+    "pixel": ("change", "shown"),
+}
+
+
+def latencies(frames, loadgen):
+    # Milliseconds per span for every frame that was the first to show a new
+    # result. Frames without an e2e only redrew a result already shown.
+    out = {span: [] for span in SPANS}
+    for f in frames:
+        if f.get("e2e_ms") is None:
+            continue
+        arrived = f["arrived"]
+        times = {
+            "change": loadgen.last_change(arrived),
+            "arrived": arrived,
+            "shown": f["shown"],
+        }
+        if f.get("e2e_sink_ms") is not None:
+            times["sink"] = arrived + f["e2e_sink_ms"] / 1000.0
+        for span, (start, end) in SPANS.items():
+            if end in times:
+                out[span].append((times[end] - times[start]) * 1000.0)
+    return out
+
+
+def _stats(values):
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+        "max_ms": values[-1] if values else None,
+    }
+
+
+def run_config(name, overrides, settings, args, workdir):
+    config = scenario_config(
+        "throws", change_period=args.change_period, latency_ms=args.latency_ms
+    )
+    loadgen = LoadGenerator(config)
+    loadgen.start()
+    try:
+        run = run_tracker(
+            os.path.join(workdir, name),
+            loadgen,
+            dict(settings, **overrides),
+            args.warmup,
+            args.seconds,
+            headless=not args.window,
+        )
+    finally:
+        loadgen.close()
+    spans = latencies(run["frames"], loadgen)
+    return {
+        "customizations": overrides,
+        "spans": {span: _stats(values) for span, values in spans.items()},
+    }
+
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Measure NBTrackr's latency from a new Ninjabrain Bot result "
+        "to the overlay"
+    )
+    parser.add_argument(
+        "-c",
+        "--config",
+        action="append",
+        choices=sorted(CONFIGS),
+        help="configuration to run, can be repeated (default: all)",
+    )
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument(
+        "--change-period",
+        type=float,
+        default=4.0,
+        help="seconds between new stronghold results, longer than the poll rate's "
+        "2 s fast hold so polling has slowed down again",
+    )
+    parser.add_argument(
+        "--latency-ms", type=float, help="added to every Ninjabrain Bot response"
+    )
+    parser.add_argument(
+        "--window",
+        action="store_true",
+        help="show the overlay window instead of running headless, needs a display",
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    names = args.config or list(CONFIGS)
+    width = max(len(n) for n in names)
+    print(
+        f"{'config':<{width}}  {'span':<6}  {'n':>4}  {'p50 ms':>8}  "
+        f"{'p95 ms':>8}  {'p99 ms':>8}  {'max ms':>8}"
+    )
+    settings = load_default_customizations()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="nbtrackr-latency-") as workdir:
+        for name in names:
+            res = results[name] = run_config(
+                name, CONFIGS[name], settings, args, workdir
+            )
+            for span, st in res["spans"].items():
+                print(
+                    f"{name:<{width}}  {span:<6}  {st['count']:>4}  "
+                    f"{_fmt(st['p50_ms']):>8}  {_fmt(st['p95_ms']):>8}  "
+                    f"{_fmt(st['p99_ms']):>8}  {_fmt(st['max_ms']):>8}",
+                    flush=True,
+                )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "generated": time.time(),
+                    "python": sys.version.split()[0],
+                    "change_period": args.change_period,
+                    "headless": not args.window,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print("Results written to", args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
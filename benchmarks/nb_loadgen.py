@@ -0,0 +1,228 @@
+import argparse
+import copy
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+sys.path.insert(0, ROOT)
+
+from core.nb_client import NB_PORT  # noqa: E402
+
+API_PREFIX = "/api/v1/"
+NB_VERSION = {"version": "1.5.3"}
+
+# Knobs of a synthetic Ninjabrain Bot. A scenario overrides any of them.
+DEFAULTS = {
+    "fixture": "triangulation",  # file in benchmarks/fixtures/ the data starts from
+    "change_every_request": False,  # new predictions on every /stronghold request
+    "change_period": None,  # or new predictions every this many seconds
+    "eye_throws": None,  # repeat the fixture's throws up to this many
+    "info_messages": None,  # repeat the fixture's messages up to this many
+    "boat_flip_period": None,  # seconds between VALID and ERROR boat states
+    "latency_ms": 0.0,  # added to every response
+    "jitter_ms": 0.0,  # random extra latency, up to this much
+    "error_rate": 0.0,  # fraction of requests answered with HTTP 500
+    "slowloris_ms": 0.0,  # the body is sent in small pieces over this long
+}
+
+SCENARIOS = {
+    "steady": {},
+    "changing": {"change_every_request": True},
+    "long_throws": {"change_every_request": True, "eye_throws": 40},
+    "many_messages": {"fixture": "triangulation_warnings", "info_messages": 24},
+    "boat_flip": {"fixture": "boat_valid", "boat_flip_period": 0.25},
+    "slow": {"latency_ms": 60.0, "jitter_ms": 40.0},
+    "flaky": {"change_every_request": True, "error_rate": 0.2},
+    "slowloris": {"slowloris_ms": 300.0},
+    "throws": {"change_period": 4.0},
+}
+
+
+def scenario_config(name, **overrides):
+    config = dict(DEFAULTS)
+    config.update(SCENARIOS[name])
+    config.update({k: v for k, v in overrides.items() if v is not None})
+    return config
+
+
+def _repeat(items, count):
+    if not items or count is None:
+        return items
+    return [copy.deepcopy(items[i % len(items)]) for i in range(count)]
+
+
+class LoadGenerator:
+    def __init__(self, config, host="127.0.0.1", port=NB_PORT, seed=0):
+        self.config = config
+        with open(os.path.join(FIXTURES_DIR, config["fixture"] + ".json"), "r") as f:
+            self.data = json.load(f)
+        stronghold = self.data["stronghold"]
+        stronghold["eyeThrows"] = _repeat(
+            stronghold.get("eyeThrows", []), config["eye_throws"]
+        )
+        messages = self.data["information-messages"]
+        messages["informationMessages"] = _repeat(
+            messages.get("informationMessages", []), config["info_messages"]
+        )
+        self.requests = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._counter = 0
+        self._start = time.monotonic()
+        server = ThreadingHTTPServer((host, port), _LoadHandler)
+        server.daemon_threads = True
+        server.loadgen = self
+        self._server = server
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def total_requests(self):
+        with self._lock:
+            return sum(self.requests.values())
+
+    def last_change(self, t):
+        # When the stronghold result served at time.monotonic() t first
+        # appeared, for scenarios with a change_period.
+        period = self.config["change_period"]
+        return self._start + (t - self._start) // period * period
+
+    def _count(self, endpoint):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+            self._counter += 1
+            return self._counter, self._random.random(), self._random.random()
+
+    def respond(self, endpoint):
+        # Returns (status, body, delay before sending, slowloris duration).
+        n, roll, jitter = self._count(endpoint)
+        c = self.config
+        delay = (c["latency_ms"] + jitter * c["jitter_ms"]) / 1000.0
+        if roll < c["error_rate"]:
+            with self._lock:
+                self.errors += 1
+            return 500, b"", delay, 0.0
+        if endpoint == "version":
+            response = NB_VERSION
+        elif endpoint not in self.data:
+            return 404, b"", delay, 0.0
+        else:
+            response = self._response(endpoint, n)
+        body = json.dumps(response).encode()
+        return 200, body, delay, c["slowloris_ms"] / 1000.0
+
+    def _response(self, endpoint, n):
+        c = self.config
+        response = self.data[endpoint]
+        if c["change_period"]:
+            n = int((time.monotonic() - self._start) / c["change_period"])
+        changing = c["change_every_request"] or c["change_period"]
+        if endpoint == "stronghold" and changing:
+            response = copy.deepcopy(response)
+            for i, pred in enumerate(response.get("predictions", [])):
+                pred["certainty"] = ((n + i) % 1000) / 1000.0
+                pred["overworldDistance"] = float(1000 + (n * 7 + i) % 3000)
+            for throw in response.get("eyeThrows", []):
+                angle = throw.get("angle", 0) + (n % 90) / 100.0
+                throw["angleWithoutCorrection"] = round(angle, 2)
+        elif endpoint == "boat" and c["boat_flip_period"]:
+            flips = int((time.monotonic() - self._start) / c["boat_flip_period"])
+            response = dict(response, boatState="ERROR" if flips % 2 else "VALID")
+        return response
+
+
+class _LoadHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        endpoint = ""
+        if self.path.startswith(API_PREFIX):
+            endpoint = self.path[len(API_PREFIX):]
+        status, body, delay, dribble = self.server.loadgen.respond(endpoint)
+        if delay > 0:
+            time.sleep(delay)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            if dribble > 0 and body:
+                chunk = max(1, len(body) // 20)
+                for i in range(0, len(body), chunk):
+                    self.wfile.write(body[i:i + chunk])
+                    self.wfile.flush()
+                    time.sleep(dribble / 20)
+            else:
+                self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            # The tracker gave up on a response slower than its timeout.
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+def add_knob_arguments(parser):
+    parser.add_argument("--change-period", type=float)
+    parser.add_argument("--latency-ms", type=float)
+    parser.add_argument("--jitter-ms", type=float)
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--slowloris-ms", type=float)
+    parser.add_argument("--eye-throws", type=int)
+    parser.add_argument("--info-messages", type=int)
+
+
+def knob_overrides(args):
+    return {
+        "change_period": args.change_period,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "slowloris_ms": args.slowloris_ms,
+        "eye_throws": args.eye_throws,
+        "info_messages": args.info_messages,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Synthetic Ninjabrain Bot API for stress-testing NBTrackr"
+    )
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--port", type=int, default=NB_PORT)
+    add_knob_arguments(parser)
+    args = parser.parse_args()
+
+    config = scenario_config(args.scenario, **knob_overrides(args))
+    loadgen = LoadGenerator(config, port=args.port)
+    loadgen.start()
+    print(f"Serving scenario {args.scenario} on port {args.port}: {json.dumps(config)}")
+    try:
+        while True:
+            time.sleep(5)
+            print(
+                f"{loadgen.total_requests()} requests, {loadgen.errors} errors",
+                flush=True,
+            )
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loadgen.close()
+
+
+if __name__ == "__main__":
+    main()
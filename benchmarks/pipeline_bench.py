@@ -0,0 +1,242 @@
+import argparse
+import importlib.util
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACKER = os.path.join(ROOT, "NBTrackr-imgpin.py")
+
+sys.path.insert(0, ROOT)
+
+from core.profiler import percentile  # noqa: E402
+from nb_loadgen import (  # noqa: E402
+    SCENARIOS,
+    LoadGenerator,
+    add_knob_arguments,
+    knob_overrides,
+    scenario_config,
+)
+
+DUMP_TIMEOUT = 5.0
+# The profiler keeps its last 600 frames, dumping this often reads every frame
+# of the measured window up to 300 frames/s.
+DUMP_INTERVAL = 2.0
+
+
+# Runs NBTrackr-imgpin.py --headless --debug --no-update-check against the
+# synthetic Ninjabrain Bot in nb_loadgen.py, one process per scenario with its
+# own HOME, and reads the frame timings back through the profiler's SIGUSR1
+# dump. Frames belong to the measured window by the time.monotonic() they were
+# shown at, which Linux shares between processes.
+
+
+def load_default_customizations():
+    spec = importlib.util.spec_from_file_location(
+        "customizer_bench", os.path.join(ROOT, "Customizer-imgpin.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.DEFAULT_CUSTOMIZATIONS
+
+
+def _cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat", "r") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+def _memory_kib(pid):
+    mem = {}
+    with open(f"/proc/{pid}/status", "r") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                mem[key] = int(value.split()[0])
+    return mem
+
+
+def _dump_frames(proc, path):
+    if os.path.exists(path):
+        os.remove(path)
+    proc.send_signal(signal.SIGUSR1)
+    deadline = time.monotonic() + DUMP_TIMEOUT
+    while time.monotonic() < deadline:
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return json.load(f)["frames"]
+        time.sleep(0.05)
+    raise RuntimeError("the tracker did not write its profile, see " + path)
+
+
+def _stats(values):
+    values = sorted(v for v in values if v is not None)
+    return {
+        "p50_ms": percentile(values, 50),
+        "p90_ms": percentile(values, 90),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+    }
+
+
+def run_tracker(home, loadgen, settings, warmup, seconds, headless=True):
+    # Returns the frames the tracker profiled in the measured window, and how
+    # much CPU, memory and requests it took.
+    config_dir = os.path.join(home, ".config", "NBTrackr")
+    os.makedirs(config_dir)
+    with open(os.path.join(config_dir, "customizations.json"), "w") as f:
+        json.dump(settings, f)
+    env = dict(
+        os.environ,
+        HOME=home,
+        TMPDIR=home,
+        XDG_RUNTIME_DIR=home,
+        XDG_CACHE_HOME=os.path.join(home, ".cache"),
+    )
+
+    log = open(os.path.join(home, "tracker.log"), "w")
+    proc = subprocess.Popen(
+        [sys.executable, TRACKER, "--debug", "--no-update-check"]
+        + (["--headless"] if headless else []),
+        cwd=ROOT,
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+    dump_path = os.path.join(home, f"nbtrackr-profile-{proc.pid}.json")
+    shown = {}
+    try:
+        time.sleep(warmup)
+        cpu0, requests0 = _cpu_seconds(proc.pid), loadgen.total_requests()
+        t0 = time.monotonic()
+        end = t0 + seconds
+        while time.monotonic() + DUMP_INTERVAL < end:
+            time.sleep(DUMP_INTERVAL)
+            shown.update((f["shown"], f) for f in _dump_frames(proc, dump_path))
+        time.sleep(max(0.0, end - time.monotonic()))
+        cpu1, requests1 = _cpu_seconds(proc.pid), loadgen.total_requests()
+        t1 = time.monotonic()
+        memory = _memory_kib(proc.pid)
+        shown.update((f["shown"], f) for f in _dump_frames(proc, dump_path))
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        log.close()
+
+    frames = [shown[t] for t in sorted(shown) if t0 <= t <= t1]
+    return {
+        "frames": frames,
+        "elapsed": t1 - t0,
+        "cpu_seconds": cpu1 - cpu0,
+        "requests": requests1 - requests0,
+        "memory": memory,
+    }
+
+
+def run_scenario(name, config, settings, args, workdir):
+    loadgen = LoadGenerator(config)
+    loadgen.start()
+    try:
+        run = run_tracker(
+            os.path.join(workdir, name),
+            loadgen,
+            dict(settings, use_custom_pinned_image=args.custom),
+            args.warmup,
+            args.seconds,
+        )
+    finally:
+        loadgen.close()
+
+    elapsed, frames, memory = run["elapsed"], run["frames"], run["memory"]
+    return {
+        "config": config,
+        "requests_per_s": run["requests"] / elapsed,
+        "errors": loadgen.errors,
+        "fps": len(frames) / elapsed,
+        "frame": _stats(f["total_ms"] for f in frames),
+        "e2e": _stats(f["e2e_ms"] for f in frames),
+        "cpu_pct": run["cpu_seconds"] / elapsed * 100,
+        "rss_kib": memory.get("VmRSS"),
+        "peak_rss_kib": memory.get("VmHWM"),
+    }
+
+
+def _fmt(value, spec=".2f"):
+    return "-" if value is None else format(value, spec)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Run NBTrackr headless against a synthetic Ninjabrain Bot"
+    )
+    parser.add_argument(
+        "-s",
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        help="scenario to run, can be repeated (default: all)",
+    )
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--warmup", type=float, default=3.0)
+    parser.add_argument(
+        "--custom", action="store_true", help="use the custom overlay renderer"
+    )
+    parser.add_argument("--json", help="write the results to this file")
+    add_knob_arguments(parser)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    names = args.scenario or list(SCENARIOS)
+    width = max(len(n) for n in names)
+    print(
+        f"{'scenario':<{width}}  {'req/s':>7}  {'errors':>6}  {'fps':>6}  "
+        f"{'p50 ms':>7}  {'p99 ms':>7}  {'e2e p50':>8}  {'e2e p99':>8}  "
+        f"{'cpu %':>6}  {'RSS MiB':>8}"
+    )
+    settings = load_default_customizations()
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="nbtrackr-pipeline-") as workdir:
+        for name in names:
+            config = scenario_config(name, **knob_overrides(args))
+            res = results[name] = run_scenario(
+                name, config, settings, args, workdir
+            )
+            peak = res["peak_rss_kib"]
+            frame, e2e = res["frame"], res["e2e"]
+            print(
+                f"{name:<{width}}  {res['requests_per_s']:>7.1f}  "
+                f"{res['errors']:>6}  {res['fps']:>6.1f}  "
+                f"{_fmt(frame['p50_ms']):>7}  {_fmt(frame['p99_ms']):>7}  "
+                f"{_fmt(e2e['p50_ms']):>8}  {_fmt(e2e['p99_ms']):>8}  "
+                f"{res['cpu_pct']:>6.1f}  "
+                f"{_fmt(peak / 1024.0 if peak else None, '.1f'):>8}",
+                flush=True,
+            )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "generated": time.time(),
+                    "python": sys.version.split()[0],
+                    "custom": args.custom,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print("Results written to", args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
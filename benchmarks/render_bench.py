@@ -0,0 +1,346 @@
+import argparse
+import gc
+import glob
+import importlib.util
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+sys.path.insert(0, ROOT)
+
+from core.profiler import FrameProfiler, percentile  # noqa: E402
+
+FONT_SIZES = (12, 18, 28)
+OUTLINES = (False, True)
+PREVIEWS = (
+    "render_default_preview",
+    "render_default_blind_preview",
+    "render_eye_throws_preview",
+    "render_blind_preview",
+)
+
+
+def _load_module(name, filename):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_tracker(workdir):
+    # The tracker reads its flags from argv at import time, --headless keeps Qt
+    # out of it. Threads and the render pool only start when run as a script.
+    argv = sys.argv
+    sys.argv = [os.path.join(ROOT, "NBTrackr-imgpin.py"), "--headless"]
+    try:
+        tracker = _load_module("nbtrackr_bench", "NBTrackr-imgpin.py")
+    finally:
+        sys.argv = argv
+    tracker.log = lambda *args: None
+    tracker.IMAGE_PATH = os.path.join(workdir, "overlay.png")
+    tracker.CUSTOMIZATIONS_FILE = os.path.join(workdir, "customizations.json")
+    tracker._profiler = FrameProfiler(
+        enabled=True, summary_interval=float("inf"), log=tracker.log
+    )
+    return tracker
+
+
+def load_fixtures(pattern=None):
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if pattern and pattern not in name:
+            continue
+        with open(path, "r") as f:
+            fixtures[name] = json.load(f)
+    return fixtures
+
+
+# ---- Tracker state ----
+
+
+def write_settings(tracker, settings):
+    with open(tracker.CUSTOMIZATIONS_FILE, "w") as f:
+        json.dump(settings, f)
+    tracker._cached_customizations = None
+    tracker._last_custom_file = None
+
+
+def apply_fixture(tracker, fixture):
+    # Same fields the API polling thread derives, with every timer held open so
+    # each frame renders the full overlay.
+    boat = fixture["boat"]
+    stronghold = fixture["stronghold"]
+    blind = fixture["blind"]
+    result_type = stronghold.get("resultType")
+    boat_state = boat.get("boatState")
+    blind_result = blind.get("blindResult") or {}
+    has_blind = blind_result.get("evaluation") is not None
+    shows_boat = result_type in ("NONE", "BLIND") and boat_state in ("VALID", "ERROR")
+
+    with tracker.status_lock:
+        tracker.status.update(
+            {
+                "boatState": boat_state,
+                "boatAngle": boat.get("boatAngle"),
+                "resultType": result_type,
+                "isInNether": stronghold.get("playerPosition", {}).get(
+                    "isInNether", False
+                ),
+                "lastShown": boat_state if shows_boat else None,
+                "showUntil": float("inf") if shows_boat else 0,
+                "lastAngle": None,
+                "blindModeEnabled": blind.get("isBlindModeEnabled", False),
+                "blindResult": blind_result if has_blind else None,
+                "blindShowUntil": float("inf") if has_blind else 0,
+                "blindCurrentlyShowing": False,
+                "boat_resp": boat,
+                "stronghold_resp": stronghold,
+                "blind_resp": blind,
+                "info_resp": fixture["information-messages"],
+            }
+        )
+
+
+def reset_frame_caches(tracker):
+    tracker._last_default_stronghold = None
+    tracker._last_default_boat = None
+    tracker._last_custom = None
+    tracker._last_blind = None
+    with tracker.status_lock:
+        tracker.status["blindCurrentlyShowing"] = False
+        if tracker.status["blindResult"] is not None:
+            tracker.status["blindShowUntil"] = float("inf")
+
+
+# ---- Cases ----
+
+
+def bench_settings(base, font_size, outline, custom):
+    settings = dict(base)
+    settings.update(
+        {
+            "use_custom_pinned_image": custom,
+            "font_size": font_size,
+            "text_outline_enabled": outline,
+            "boat_info_hide_after_enabled": False,
+            "render_worker_enabled": False,
+        }
+    )
+    return settings
+
+
+def build_cases(tracker, customizer, fixtures, pattern=None):
+    base = customizer.DEFAULT_CUSTOMIZATIONS
+    cases = []
+
+    for name, fixture in fixtures.items():
+        for font_size in FONT_SIZES:
+            settings = bench_settings(base, font_size, False, False)
+            cases.append(
+                (
+                    f"default/{name}/{font_size}px",
+                    settings,
+                    fixture,
+                    tracker.generate_default_pinned_image,
+                )
+            )
+            for outline in OUTLINES:
+                settings = bench_settings(base, font_size, outline, True)
+                suffix = "/outline" if outline else ""
+                cases.append(
+                    (
+                        f"custom/{name}/{font_size}px{suffix}",
+                        settings,
+                        fixture,
+                        tracker.generate_custom_pinned_image,
+                    )
+                )
+
+    for preview in PREVIEWS:
+        render = getattr(customizer, preview)
+        for font_size in FONT_SIZES:
+            for outline in OUTLINES:
+                settings = bench_settings(base, font_size, outline, False)
+                suffix = "/outline" if outline else ""
+                cases.append(
+                    (
+                        f"preview/{preview[len('render_'):]}/{font_size}px{suffix}",
+                        settings,
+                        None,
+                        lambda render=render, settings=settings: render(settings),
+                    )
+                )
+
+    if pattern:
+        cases = [c for c in cases if pattern in c[0]]
+    return cases
+
+
+# ---- Measurement ----
+
+
+def run_case(tracker, case, iterations, warmup, memory_iterations):
+    name, settings, fixture, render = case
+    profiler = tracker._profiler
+
+    write_settings(tracker, settings)
+    if fixture is not None:
+        apply_fixture(tracker, fixture)
+
+    def frame():
+        if fixture is None:
+            render()
+            return
+        reset_frame_caches(tracker)
+        profiler.begin_frame()
+        render()
+        profiler.drop_frame()
+
+    for _ in range(warmup):
+        frame()
+
+    profiler.reset()
+    times = []
+    gc.collect()
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        frame()
+        times.append(time.perf_counter() - t0)
+    stages = profiler.summary()["stages"]
+
+    tracemalloc.start()
+    for _ in range(memory_iterations):
+        frame()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times.sort()
+    total = sum(times)
+    return {
+        "iterations": iterations,
+        "fps": round(iterations / total, 1) if total else None,
+        "mean_ms": round(total / iterations * 1000.0, 3),
+        "p50_ms": round(percentile(times, 50) * 1000.0, 3),
+        "p99_ms": round(percentile(times, 99) * 1000.0, 3),
+        "peak_kib": round(peak / 1024.0, 1),
+        "stages": {
+            k: v["p50_ms"]
+            for k, v in stages.items()
+            if k in ("layout", "raster", "encode", "write")
+        },
+    }
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, res in results.items():
+        old = baseline.get(name)
+        if not old or not old.get("p50_ms"):
+            continue
+        change = res["p50_ms"] / old["p50_ms"] - 1.0
+        if change > threshold:
+            regressions.append((name, old["p50_ms"], res["p50_ms"], change))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Headless render benchmark for the NBTrackr overlays"
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument(
+        "--memory-iterations",
+        type=int,
+        default=5,
+        help="frames rendered under tracemalloc for the peak memory column",
+    )
+    parser.add_argument("-k", "--filter", help="only run cases containing this text")
+    parser.add_argument("--json", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline written earlier with --json")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="p50 slowdown that counts as a regression (default 0.2 = 20%%)",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory(prefix="nbtrackr-bench-") as workdir:
+        return run(args, workdir)
+
+
+def run(args, workdir):
+    tracker = load_tracker(workdir)
+    customizer = _load_module("customizer_bench", "Customizer-imgpin.py")
+    cases = build_cases(tracker, customizer, load_fixtures(), args.filter)
+    if not cases:
+        print("No benchmark cases match", args.filter)
+        return 1
+
+    width = max(len(c[0]) for c in cases)
+    print(
+        f"{'case':<{width}}  {'fps':>8}  {'p50 ms':>8}  {'p99 ms':>8}  "
+        f"{'layout':>7}  {'raster':>7}  {'encode':>7}  {'peak KiB':>9}"
+    )
+
+    results = {}
+    for case in cases:
+        res = run_case(
+            tracker, case, args.iterations, args.warmup, args.memory_iterations
+        )
+        results[case[0]] = res
+        st = res["stages"]
+        stage_cols = "  ".join(
+            f"{st[k]:>7.2f}" if k in st else f"{'-':>7}"
+            for k in ("layout", "raster", "encode")
+        )
+        print(
+            f"{case[0]:<{width}}  {res['fps']:>8.1f}  {res['p50_ms']:>8.2f}  "
+            f"{res['p99_ms']:>8.2f}  {stage_cols}  {res['peak_kib']:>9.1f}",
+            flush=True,
+        )
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"\nPeak RSS: {max_rss / 1024.0:.1f} MiB")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {
+                    "generated": time.time(),
+                    "python": sys.version.split()[0],
+                    "max_rss_kib": max_rss,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print("Results written to", args.json)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f).get("results", {})
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline:")
+            for name, old, new, change in regressions:
+                print(f"  {name}: {old:.2f} -> {new:.2f} ms (+{change * 100:.0f}%)")
+            return 1
+        print("\nNo regressions against", args.compare)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
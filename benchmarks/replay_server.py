@@ -0,0 +1,157 @@
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+
+from core.nb_client import NB_PORT  # noqa: E402
+from core.session_recorder import RECORDING_FORMAT  # noqa: E402
+
+API_PREFIX = "/api/v1/"
+
+
+def load_recording(path):
+    # Returns {endpoint: (times, responses)} and the recording's length. A
+    # response of None stands for a request that failed while recording.
+    timelines = {}
+    duration = 0.0
+    last = {}
+    with open(path, "r") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("nbtrackr_recording") != RECORDING_FORMAT:
+            raise ValueError(f"{path} is not an NBTrackr session recording")
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # The last line of a recording that was cut off.
+                break
+            endpoint = entry["e"]
+            if "err" in entry:
+                response = None
+                last.pop(endpoint, None)
+            elif "r" in entry:
+                response = last[endpoint] = entry["r"]
+            else:
+                response = last.get(endpoint)
+            duration = max(duration, entry["t"])
+            times, responses = timelines.setdefault(endpoint, ([], []))
+            if responses and responses[-1] == response:
+                continue
+            times.append(entry["t"])
+            responses.append(response)
+    return timelines, duration
+
+
+class ReplayServer:
+    # Serves a recording as Ninjabrain Bot's API. Every endpoint answers with
+    # the response it gave at the same point of the recorded session, scaled
+    # by speed. Requests made before an endpoint's first response, or while it
+    # was failing, get a 503.
+
+    def __init__(self, path, speed=1.0, loop=False, host="127.0.0.1", port=NB_PORT):
+        self.timelines, self.duration = load_recording(path)
+        self.speed = speed
+        self.loop = loop
+        self.requests = 0
+        self._start = None
+        server = ThreadingHTTPServer((host, port), _ReplayHandler)
+        server.daemon_threads = True
+        server.replay = self
+        self._server = server
+
+    def start(self):
+        self._start = time.monotonic()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def elapsed(self):
+        t = (time.monotonic() - self._start) * self.speed
+        if self.loop and self.duration > 0:
+            t %= self.duration
+        return t
+
+    def finished(self):
+        return not self.loop and self.elapsed() > self.duration
+
+    def response(self, endpoint):
+        timeline = self.timelines.get(endpoint)
+        if timeline is None:
+            return None
+        times, responses = timeline
+        i = bisect.bisect_right(times, self.elapsed()) - 1
+        return responses[i] if i >= 0 else None
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        replay = self.server.replay
+        replay.requests += 1
+        response = None
+        if self.path.startswith(API_PREFIX):
+            response = replay.response(self.path[len(API_PREFIX):])
+        if response is None:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve a session recorded with `nbtrackr --record` as "
+        "Ninjabrain Bot's API."
+    )
+    parser.add_argument("recording")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed, 2 plays twice as fast"
+    )
+    parser.add_argument("--loop", action="store_true", help="start over at the end")
+    parser.add_argument("--port", type=int, default=NB_PORT)
+    args = parser.parse_args()
+
+    replay = ReplayServer(
+        args.recording, speed=args.speed, loop=args.loop, port=args.port
+    )
+    replay.start()
+    endpoints = ", ".join(sorted(replay.timelines))
+    print(
+        f"Replaying {replay.duration:.1f} s ({endpoints}) at {args.speed:g}x "
+        f"on port {args.port}"
+    )
+    try:
+        while not replay.finished():
+            time.sleep(0.2)
+        print(
+            f"End of recording after {replay.requests} requests, "
+            "serving the last state."
+        )
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        replay.close()
+
+
+if __name__ == "__main__":
+    main()
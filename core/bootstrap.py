@@ -0,0 +1,38 @@
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACKER_SCRIPT = "NBTrackr-imgpin.py"
+
+
+def run_script(filename, argv):
+    # Scripts started with `python script.py` are compiled on every launch.
+    # Loading them as __main__ through the regular source loader reuses the
+    # bytecode install.sh precompiled into __pycache__.
+    path = os.path.join(ROOT, filename)
+    sys.path[0] = ROOT
+    if filename == TRACKER_SCRIPT:
+        from core.staged_update import apply_staged_update
+
+        # A release staged by the background updater is swapped in before
+        # anything is loaded from the install. Modules already imported from
+        # the old tree are dropped so the new ones are used from here on.
+        if apply_staged_update(ROOT):
+            for name in [m for m in sys.modules if m == "core" or m.startswith("core.")]:
+                del sys.modules[name]
+        from core.staged_update import hold_install_lock
+
+        hold_install_lock(ROOT)
+    sys.argv = [path] + argv
+    spec = importlib.util.spec_from_file_location("__main__", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["__main__"] = module
+    spec.loader.exec_module(module)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("usage: bootstrap.py SCRIPT [ARGS...]")
+        sys.exit(2)
+    run_script(sys.argv[1], sys.argv[2:])
@@ -0,0 +1,108 @@
+# Checks for the keys of customizations.json, shared by the tracker and the
+# Customizer. Keys without a check are passed through as they are.
+
+HIDE_METHODS = ("withdraw", "one_pixel", "offscreen")
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _positive_number(value):
+    return _number(value) and value > 0
+
+
+def _unit_number(value):
+    return _number(value) and 0 <= value <= 1
+
+
+def _hex_color(value):
+    if not isinstance(value, str) or len(value) != 7 or value[0] != "#":
+        return False
+    try:
+        int(value[1:], 16)
+    except ValueError:
+        return False
+    return True
+
+
+def _bool(value):
+    return isinstance(value, bool)
+
+
+def _int_between(low, high):
+    return lambda v: _number(v) and v == int(v) and low <= v <= high
+
+
+CONFIG_CHECKS = {
+    "use_custom_pinned_image": _bool,
+    "idle_api_polling_rate": _positive_number,
+    "max_api_polling_rate": _positive_number,
+    "poll_cpu_budget": _positive_number,
+    "hide_method": lambda v: v in HIDE_METHODS,
+    "auto_hide_window": _bool,
+    "font_size": lambda v: _positive_number(v) and v == int(v),
+    "font_name": lambda v: isinstance(v, str),
+    "background_color": _hex_color,
+    "text_color": _hex_color,
+    "background_opacity": _unit_number,
+    "text_opacity": _unit_number,
+    "text_outline_enabled": _bool,
+    "text_outline_color": _hex_color,
+    "text_outline_width": _int_between(1, 10),
+    "negative_coords_color_enabled": _bool,
+    "negative_coords_color": _hex_color,
+    "portal_nether_color_enabled": _bool,
+    "portal_nether_color": _hex_color,
+    "overworld_coords_format": lambda v: v in ("four_four", "eight_eight", "chunk"),
+    "shown_measurements": _int_between(1, 5),
+    "show_angle_adjustment_count": _bool,
+    "show_boat_icon": _bool,
+    "show_error_message": _bool,
+    "show_blind_info": _bool,
+    "boat_info_hide_after": _positive_number,
+    "boat_info_hide_after_enabled": _bool,
+    "blind_info_hide_after": _positive_number,
+    "blind_info_hide_after_enabled": _bool,
+    "render_worker_enabled": _bool,
+    "render_workers": _int_between(1, 16),
+    "background_updates_enabled": _bool,
+    "debug_mode": _bool,
+    "text_order": lambda v: isinstance(v, list),
+    "text_enabled": lambda v: isinstance(v, dict),
+    "text_header": lambda v: isinstance(v, dict),
+}
+
+_RATE_KEYS = ("idle_api_polling_rate", "max_api_polling_rate")
+
+
+def customization_errors(custom, idle_rate=None, max_rate=None):
+    # Maps every rejected key to the reason. idle_rate and max_rate stand in
+    # for a polling rate that is missing or rejected, the idle rate may not be
+    # below the max rate.
+    errors = {}
+    for key, value in custom.items():
+        check = CONFIG_CHECKS.get(key)
+        if check is not None and not check(value):
+            errors[key] = f"invalid value for {key}: {value!r}"
+    if "idle_api_polling_rate" in custom and "idle_api_polling_rate" not in errors:
+        idle_rate = custom["idle_api_polling_rate"]
+    if "max_api_polling_rate" in custom and "max_api_polling_rate" not in errors:
+        max_rate = custom["max_api_polling_rate"]
+    if idle_rate is not None and max_rate is not None and idle_rate < max_rate:
+        for key in _RATE_KEYS:
+            if key in custom and key not in errors:
+                errors[key] = "idle_api_polling_rate is below max_api_polling_rate"
+    return errors
+
+
+def validate_customizations(custom, idle_rate=None, max_rate=None):
+    errors = customization_errors(custom, idle_rate, max_rate)
+    if errors:
+        raise ValueError(next(iter(errors.values())))
+
+
+def usable_customizations(custom, idle_rate=None, max_rate=None):
+    # Drops only the rejected keys, their defaults are used instead.
+    errors = customization_errors(custom, idle_rate, max_rate)
+    return {k: v for k, v in custom.items() if k not in errors}, errors
@@ -0,0 +1,167 @@
+import json
+import os
+import subprocess
+
+# Index of installed fonts for the Customizer's font dropdown, so opening the
+# settings no longer walks every font directory before the window appears.
+# A directory whose mtime is unchanged is trusted as-is, only directories that
+# gained or lost entries are listed again and only new or changed font files
+# are opened to read their names and metrics.
+
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "NBTrackr"
+)
+FONT_INDEX_FILE = os.path.join(CACHE_DIR, "font-index.json")
+FONT_INDEX_VERSION = 1
+FONT_SEARCH_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    "/run/current-system/sw/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+]
+FONT_EXTENSIONS = (".ttf", ".otf")
+METRICS_SIZE = 64
+
+
+def _empty_index():
+    return {"version": FONT_INDEX_VERSION, "dirs": {}, "fonts": {}}
+
+
+def load_font_index():
+    try:
+        with open(FONT_INDEX_FILE, "r") as f:
+            data = json.load(f)
+        if (
+            isinstance(data, dict)
+            and data.get("version") == FONT_INDEX_VERSION
+            and isinstance(data.get("dirs"), dict)
+            and isinstance(data.get("fonts"), dict)
+        ):
+            return data
+    except Exception:
+        pass
+    return _empty_index()
+
+
+def save_font_index(index):
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = FONT_INDEX_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp, FONT_INDEX_FILE)
+    except Exception:
+        pass
+
+
+def font_info(path):
+    info = {"family": None, "style": None, "ascent": None, "descent": None}
+    try:
+        st = os.stat(path)
+        info["mtime"] = st.st_mtime_ns
+        info["size"] = st.st_size
+    except OSError:
+        return None
+    try:
+        from PIL import ImageFont
+
+        font = ImageFont.truetype(path, METRICS_SIZE)
+        info["family"], info["style"] = font.getname()
+        info["ascent"], info["descent"] = font.getmetrics()
+    except Exception:
+        pass
+    return info
+
+
+# ---- Scanning ----
+
+
+def _scan_dir(path, old, new):
+    try:
+        st = os.stat(path)
+    except OSError:
+        return
+    prev = old["dirs"].get(path)
+    unchanged = prev is not None and prev.get("mtime") == st.st_mtime_ns
+    if unchanged:
+        files, subdirs = prev["files"], prev["subdirs"]
+    else:
+        files, subdirs = [], []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.name.lower().endswith(FONT_EXTENSIONS) and entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return
+        files.sort()
+        subdirs.sort()
+    new["dirs"][path] = {"mtime": st.st_mtime_ns, "files": files, "subdirs": subdirs}
+
+    for name in files:
+        font_path = os.path.join(path, name)
+        cached = old["fonts"].get(font_path)
+        if cached is not None and unchanged:
+            new["fonts"][font_path] = cached
+            continue
+        _index_file(font_path, cached, new)
+    for name in subdirs:
+        _scan_dir(os.path.join(path, name), old, new)
+
+
+def _index_file(path, cached, new):
+    if cached is not None:
+        try:
+            st = os.stat(path)
+            if cached.get("mtime") == st.st_mtime_ns and cached.get("size") == st.st_size:
+                new["fonts"][path] = cached
+                return
+        except OSError:
+            return
+    info = font_info(path)
+    if info is not None:
+        new["fonts"][path] = info
+
+
+def _fc_list_files():
+    try:
+        result = subprocess.run(
+            ["fc-list", "--format=%{file}\n"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except Exception:
+        return []
+    paths = []
+    for line in result.stdout.splitlines():
+        path = line.strip()
+        if path and path.lower().endswith(FONT_EXTENSIONS) and os.path.isfile(path):
+            paths.append(path)
+    return paths
+
+
+def refresh_font_index(index=None, search_dirs=None):
+    old = index if index is not None else load_font_index()
+    new = _empty_index()
+    for d in search_dirs if search_dirs is not None else FONT_SEARCH_DIRS:
+        if os.path.isdir(d):
+            _scan_dir(d, old, new)
+
+    if not new["fonts"]:
+        for path in _fc_list_files():
+            _index_file(path, old["fonts"].get(path), new)
+    return new
+
+
+def font_choices(index):
+    fonts = {}
+    for path in index["fonts"]:
+        fonts[os.path.splitext(os.path.basename(path))[0]] = path
+    return dict(sorted(fonts.items(), key=lambda x: x[0].lower()))
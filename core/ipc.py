@@ -0,0 +1,157 @@
+import json
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+
+# Local control channel between a running tracker and the Customizer. Every
+# request is a single JSON line on its own connection. The reply is a JSON
+# line, followed by `length` bytes of payload when the header has one (raw
+# RGBA pixels for images, so nothing has to be encoded on either side).
+
+SOCKET_NAME = "nbtrackr.sock"
+MAX_REQUEST = 1024 * 1024
+
+
+class IPCError(Exception):
+    pass
+
+
+# Raised by a handler that understood the request and refused it, e.g. settings
+# that don't validate. The client raises it again, so callers can tell it apart
+# from a tracker that isn't running or didn't answer.
+class IPCRejected(IPCError):
+    pass
+
+
+def socket_path():
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.join(tempfile.gettempdir(), f"nbtrackr-{os.getuid()}.sock")
+
+
+def image_reply(img, **fields):
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    header = dict(fields, ok=True, width=img.width, height=img.height, mode="RGBA")
+    return header, img.tobytes("raw", "RGBA")
+
+
+def reply_image(header, payload):
+    from PIL import Image
+
+    if not payload:
+        return None
+    return Image.frombytes(header["mode"], (header["width"], header["height"]), payload)
+
+
+# ---- Server ----
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        payload = None
+        try:
+            req = json.loads(self.rfile.readline(MAX_REQUEST))
+            handler = self.server.handlers[req["cmd"]]
+        except Exception:
+            header = {"ok": False, "error": "bad request"}
+        else:
+            try:
+                header, payload = handler(req)
+            except IPCRejected as e:
+                self.server.log(f"[IPC] {req.get('cmd')} rejected: {e}")
+                header, payload = {"ok": False, "error": str(e), "rejected": True}, None
+            except Exception as e:
+                self.server.log(f"[IPC] {req.get('cmd')} failed: {e}")
+                header, payload = {"ok": False, "error": str(e)}, None
+        if payload is not None:
+            header["length"] = len(payload)
+        try:
+            self.wfile.write(json.dumps(header).encode() + b"\n")
+            if payload is not None:
+                self.wfile.write(payload)
+        except OSError:
+            pass
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class IPCServer:
+    def __init__(self, handlers, log=print, path=None):
+        self.handlers = handlers
+        self.log = log
+        self.path = path or socket_path()
+        self._server = None
+
+    def start(self):
+        if os.path.exists(self.path):
+            try:
+                request("ping", timeout=0.5, path=self.path)
+            except IPCError:
+                # Left behind by a tracker that did not shut down cleanly.
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            else:
+                self.log(f"[IPC] Another NBTrackr is already listening on {self.path}")
+                return False
+
+        old_umask = os.umask(0o177)
+        try:
+            server = _UnixServer(self.path, _Handler)
+        finally:
+            os.umask(old_umask)
+        server.handlers = self.handlers
+        server.log = self.log
+        self._server = server
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.log(f"[IPC] Listening on {self.path}")
+        return True
+
+    def close(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+# ---- Client ----
+
+
+def _recv_exact(f, n):
+    data = f.read(n)
+    if data is None or len(data) != n:
+        raise IPCError("connection closed mid-reply")
+    return data
+
+
+def request(cmd, timeout=0.5, path=None, **fields):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or socket_path())
+        sock.sendall(json.dumps(dict(fields, cmd=cmd)).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            header = json.loads(f.readline(MAX_REQUEST) or b"null")
+            if not isinstance(header, dict):
+                raise IPCError("empty reply")
+            payload = _recv_exact(f, header["length"]) if "length" in header else None
+    except (OSError, ValueError) as e:
+        raise IPCError(str(e))
+    finally:
+        sock.close()
+    if not header.get("ok", False):
+        error = IPCRejected if header.get("rejected") else IPCError
+        raise error(header.get("error", "request failed"))
+    return header, payload
@@ -0,0 +1,85 @@
+import http.client
+import json
+import random
+import socket
+
+# Not "localhost": getaddrinfo may return ::1 first, and a Ninjabrain Bot that
+# is not running then costs two connect attempts per probe.
+NB_HOST = "127.0.0.1"
+NB_PORT = 52533
+PROBE_TIMEOUT = 0.2
+
+
+class NinjabrainBotError(Exception):
+    pass
+
+
+class NinjabrainBotClient:
+    # Plain http.client instead of requests, which takes ~100 ms to import and
+    # sat on the way to the first overlay frame. Every call uses its own
+    # connection: servers that write the headers and the body separately stall
+    # a reused connection on delayed ACKs, a fresh one to localhost is cheap.
+
+    def __init__(self, host=NB_HOST, port=NB_PORT, timeout=0.5, recorder=None):
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._recorder = recorder
+
+    def get(self, endpoint):
+        if self._recorder is None:
+            return self._get(endpoint)
+        try:
+            data = self._get(endpoint)
+        except Exception as e:
+            self._recorder.record(endpoint, error=str(e))
+            raise
+        self._recorder.record(endpoint, data)
+        return data
+
+    def _get(self, endpoint):
+        path = "/api/v1/" + endpoint
+        conn = http.client.HTTPConnection(self._host, self._port, timeout=self._timeout)
+        try:
+            conn.request(
+                "GET",
+                path,
+                headers={"Accept": "application/json", "Connection": "close"},
+            )
+            resp = conn.getresponse()
+            body = resp.read()
+        finally:
+            conn.close()
+        if resp.status != 200:
+            raise NinjabrainBotError(f"{path} returned HTTP {resp.status}")
+        try:
+            return json.loads(body)
+        except ValueError:
+            raise NinjabrainBotError(f"{path} returned invalid JSON")
+
+    def probe(self, timeout=PROBE_TIMEOUT):
+        # A single TCP connect, far cheaper than a failing HTTP request when
+        # Ninjabrain Bot is not running.
+        try:
+            socket.create_connection((self._host, self._port), timeout=timeout).close()
+        except OSError:
+            return False
+        return True
+
+
+class Backoff:
+    # Jittered exponential backoff between reconnect attempts.
+
+    def __init__(self, initial=0.2, maximum=2.0, factor=2.0):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self._delay = initial
+
+    def reset(self):
+        self._delay = self.initial
+
+    def next(self):
+        delay = self._delay
+        self._delay = min(self.maximum, self._delay * self.factor)
+        return delay * random.uniform(0.5, 1.0)
@@ -0,0 +1,92 @@
+from PyQt5.QtWidgets import QLabel, QWidget, QVBoxLayout
+from PyQt5.QtCore import Qt, QObject, pyqtSignal
+from PyQt5.QtGui import QPixmap, QImage
+
+
+class Scheduler(QObject):
+    _fn_signal = pyqtSignal(object)
+
+    def __init__(self, log=print):
+        super().__init__()
+        self._log = log
+        self._fn_signal.connect(self._invoke, Qt.QueuedConnection)
+
+    def _invoke(self, fn):
+        try:
+            fn()
+        except Exception as e:
+            self._log(f"[Scheduler] Exception in scheduled call: {e}")
+
+    def schedule(self, fn):
+        self._fn_signal.emit(fn)
+
+
+class OverlayWindow(QWidget):
+    def __init__(self, click_through=False, lock_overlay=False, on_moved=None):
+        super().__init__()
+        self._lock_overlay = lock_overlay
+        self._on_moved = on_moved
+
+        if click_through:
+            self.setWindowFlags(
+                Qt.FramelessWindowHint
+                | Qt.WindowStaysOnTopHint
+                | Qt.Tool
+                | Qt.X11BypassWindowManagerHint
+                | Qt.WindowTransparentForInput
+            )
+        else:
+            self.setWindowFlags(
+                Qt.FramelessWindowHint
+                | Qt.WindowStaysOnTopHint
+                | Qt.Tool
+                | Qt.X11BypassWindowManagerHint
+            )
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setContentsMargins(0, 0, 0, 0)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+
+        self._label = QLabel(self)
+        self._label.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self._label)
+
+        self._drag_pos = None
+
+    def mousePressEvent(self, event):
+        if not self._lock_overlay and event.button() == Qt.LeftButton:
+            self._drag_pos = event.globalPos() - self.frameGeometry().topLeft()
+            event.accept()
+
+    def mouseMoveEvent(self, event):
+        if (
+            not self._lock_overlay
+            and self._drag_pos is not None
+            and event.buttons() & Qt.LeftButton
+        ):
+            self.move(event.globalPos() - self._drag_pos)
+            event.accept()
+
+    def mouseReleaseEvent(self, event):
+        if (
+            not self._lock_overlay
+            and event.button() == Qt.LeftButton
+            and self._drag_pos is not None
+        ):
+            self._drag_pos = None
+            if self.width() > 1 and self.height() > 1 and self._on_moved is not None:
+                self._on_moved()
+            event.accept()
+
+
+def pil_to_qpixmap(pil_img):
+    if pil_img.mode != "RGBA":
+        pil_img = pil_img.convert("RGBA")
+    data = pil_img.tobytes("raw", "RGBA")
+    qimage = QImage(
+        data, pil_img.width, pil_img.height, pil_img.width * 4, QImage.Format_RGBA8888
+    )
+    return QPixmap.fromImage(qimage)
@@ -0,0 +1,145 @@
+import time
+
+# Decides which Ninjabrain Bot endpoints are fetched on a polling tick. The
+# stronghold endpoint drives everything else and is fetched every tick. The
+# others are fetched at most every STALE_AFTER seconds, with a short budget
+# while the overlay shows what they return and a long one while it does not.
+# Information messages only change along with the stronghold result, they are
+# fetched again as soon as it changes.
+
+ENDPOINTS = ("stronghold", "boat", "blind", "information-messages")
+
+STALE_AFTER = {
+    # endpoint: (relevant, not relevant)
+    "stronghold": (0.0, 0.0),
+    "boat": (0.2, 2.0),
+    "blind": (0.0, 1.0),
+    "information-messages": (2.0, 5.0),
+}
+STATS_INTERVAL = 60.0
+
+
+def relevant_endpoints(stronghold_resp, blind_resp, custom, use_custom_renderer):
+    result_type = stronghold_resp.get("resultType")
+    relevant = {"stronghold"}
+    if bool(custom.get("show_boat_icon", True)) and result_type in (
+        None,
+        "NONE",
+        "BLIND",
+    ):
+        relevant.add("boat")
+    if bool(custom.get("show_blind_info", True)) and (
+        result_type == "BLIND" or blind_resp.get("isBlindModeEnabled", False)
+    ):
+        relevant.add("blind")
+    # Only the default overlay shows Ninjabrain Bot's information messages.
+    if not use_custom_renderer and result_type not in (None, "NONE"):
+        relevant.add("information-messages")
+    return relevant
+
+
+class PollPlanner:
+    def __init__(self, stale_after=STALE_AFTER, log=None):
+        self.stale_after = stale_after
+        self.log = log
+        self.responses = {}
+        self._fetched_at = {}
+        self._counts = dict.fromkeys(ENDPOINTS, 0)
+        self._stats_since = time.monotonic()
+
+    def reset(self):
+        self.responses.clear()
+        self._fetched_at.clear()
+
+    def _due(self, endpoint, relevant, now):
+        fetched_at = self._fetched_at.get(endpoint)
+        if fetched_at is None:
+            return True
+        budget = self.stale_after[endpoint][0 if endpoint in relevant else 1]
+        return now - fetched_at >= budget
+
+    def _fetch(self, client, endpoint, now):
+        self.responses[endpoint] = client.get(endpoint)
+        self._fetched_at[endpoint] = now
+        self._counts[endpoint] += 1
+
+    def poll(self, client, custom, use_custom_renderer):
+        # Returns the latest response of every endpoint, fetched now or reused.
+        now = time.monotonic()
+        previous = self.responses.get("stronghold")
+        self._fetch(client, "stronghold", now)
+        stronghold_resp = self.responses["stronghold"]
+        if stronghold_resp != previous:
+            self._fetched_at.pop("information-messages", None)
+
+        relevant = relevant_endpoints(
+            stronghold_resp, self.responses.get("blind", {}), custom, use_custom_renderer
+        )
+        for endpoint in ENDPOINTS[1:]:
+            if self._due(endpoint, relevant, now):
+                self._fetch(client, endpoint, now)
+
+        if self.log is not None and now - self._stats_since >= STATS_INTERVAL:
+            self._log_stats(now)
+        return self.responses
+
+    def _log_stats(self, now):
+        elapsed = now - self._stats_since
+        rates = {e: n / elapsed for e, n in self._counts.items()}
+        detail = ", ".join(f"{e} {r:.1f}" for e, r in rates.items())
+        self.log(f"[Poll] {sum(rates.values()):.1f} requests/s ({detail})")
+        self._counts = dict.fromkeys(ENDPOINTS, 0)
+        self._stats_since = now
+
+
+# ---- Poll rate ----
+
+# The interval drops to the fastest rate as soon as anything Ninjabrain Bot
+# returns changes, stays there for FAST_HOLD seconds and then grows by DECAY
+# per quiet tick up to the idle rate. It is never shorter than the last round
+# trip, and never so short that polling uses more than the CPU budget (percent
+# of one core, measured on the polling thread).
+
+FAST_HOLD = 2.0
+DECAY = 1.25
+DEFAULT_CPU_BUDGET = 2.0
+EWMA_WEIGHT = 0.2
+
+
+class PollRateController:
+    def __init__(self, log=None):
+        self.log = log
+        self.interval = None
+        self.reason = None
+        self._last_change = float("-inf")
+        self._rtt = 0.0
+        self._cpu = 0.0
+
+    def update(
+        self, changed, rtt, cpu, fastest, slowest, cpu_budget=DEFAULT_CPU_BUDGET
+    ):
+        now = time.monotonic()
+        self._rtt += EWMA_WEIGHT * (rtt - self._rtt)
+        self._cpu += EWMA_WEIGHT * (cpu - self._cpu)
+        slowest = max(slowest, fastest)
+
+        if changed:
+            self._last_change = now
+        if now - self._last_change < FAST_HOLD or self.interval is None:
+            interval, reason = fastest, "change"
+        else:
+            interval = min(slowest, self.interval * DECAY)
+            reason = "idle" if interval >= slowest else "decay"
+
+        if interval < self._rtt:
+            interval, reason = self._rtt, "round trip"
+        if cpu_budget > 0 and interval < self._cpu * 100 / cpu_budget:
+            interval, reason = self._cpu * 100 / cpu_budget, "cpu budget"
+
+        if reason != self.reason and self.log is not None:
+            self.log(
+                f"[Poll] Interval {interval * 1000:.0f} ms ({reason}, round trip "
+                f"{self._rtt * 1000:.1f} ms, cpu {self._cpu * 1000:.2f} ms/poll)"
+            )
+        self.interval, self.reason = interval, reason
+        return interval
@@ -0,0 +1,260 @@
+import json
+import os
+import signal
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+STAGES = (
+    "fetch",
+    "snapshot",
+    "cache_key",
+    "layout",
+    "raster",
+    "encode",
+    "write",
+    "qt_convert",
+    "show",
+)
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = int(round(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(len(sorted_values) - 1, max(0, rank - 1))]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000.0, 3)
+
+
+class FrameProfiler:
+    # A frame starts on the image thread, may be handed to the Qt thread for
+    # conversion/show, and is closed once the pixmap is on the window. Stages
+    # nest; a parent stage only counts time not spent in its children.
+    #
+    # The renderer stamps a frame with the generation of the status snapshot
+    # it draws and the time that snapshot arrived from Ninjabrain Bot. The
+    # first frame that shows a generation gets its end-to-end latency: arrival
+    # to the overlay file being renamed into place (sink) and to the window
+    # being updated (e2e). Later frames of the same generation only redraw.
+
+    def __init__(self, enabled=False, capacity=600, summary_interval=30.0, log=print):
+        self.enabled = enabled
+        self.summary_interval = summary_interval
+        self._log = log
+        self._frames = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_fetch = None
+        self._shown_generation = None
+        self._last_summary = time.monotonic()
+        self._skipped = 0
+
+    # ---- Fetch side (API polling thread) ----
+
+    def fetched(self, duration):
+        if self.enabled:
+            self._last_fetch = duration
+
+    # ---- Frame lifecycle ----
+
+    def begin_frame(self):
+        if not self.enabled:
+            return None
+        frame = {"start": time.monotonic(), "stages": {}, "generation": None}
+        if self._last_fetch is not None:
+            frame["stages"]["fetch"] = self._last_fetch
+        self._local.frame = frame
+        self._local.stack = []
+        return frame
+
+    def drop_frame(self):
+        if not self.enabled:
+            return
+        if getattr(self._local, "frame", None) is not None:
+            self._skipped += 1
+        self._local.frame = None
+
+    def detach(self):
+        if not self.enabled:
+            return None
+        frame = getattr(self._local, "frame", None)
+        self._local.frame = None
+        return frame
+
+    @contextmanager
+    def attached(self, frame):
+        if frame is None:
+            yield
+            return
+        prev = getattr(self._local, "frame", None)
+        self._local.frame = frame
+        self._local.stack = []
+        try:
+            yield
+        finally:
+            self._local.frame = prev
+            self.end_frame(frame)
+
+    def stamp(self, generation, arrived):
+        frame = getattr(self._local, "frame", None) if self.enabled else None
+        if frame is not None:
+            frame["generation"], frame["arrived"] = generation, arrived
+
+    def sink(self):
+        frame = getattr(self._local, "frame", None) if self.enabled else None
+        if frame is not None:
+            frame["sink"] = time.monotonic()
+
+    def end_frame(self, frame):
+        now = time.monotonic()
+        frame["total"] = now - frame["start"]
+        frame["shown"] = now
+        with self._lock:
+            generation = frame["generation"]
+            if (
+                generation is not None
+                and generation != self._shown_generation
+                and frame.get("arrived") is not None
+            ):
+                self._shown_generation = generation
+                frame["e2e"] = now - frame["arrived"]
+                if "sink" in frame:
+                    frame["e2e_sink"] = frame["sink"] - frame["arrived"]
+            self._frames.append(frame)
+        if now - self._last_summary >= self.summary_interval:
+            self._last_summary = now
+            self._log(self.format_summary())
+
+    # ---- Stages ----
+
+    def add(self, name, seconds):
+        frame = getattr(self._local, "frame", None) if self.enabled else None
+        if frame is not None:
+            frame["stages"][name] = frame["stages"].get(name, 0.0) + seconds
+
+    def stage(self, name):
+        if not self.enabled or getattr(self._local, "frame", None) is None:
+            return _NULL_STAGE
+        return self._stage(name)
+
+    @contextmanager
+    def _stage(self, name):
+        frame = self._local.frame
+        stack = self._local.stack
+        stack.append(0.0)
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            dt = time.perf_counter() - t0
+            children = stack.pop()
+            if stack:
+                stack[-1] += dt
+            stages = frame["stages"]
+            stages[name] = stages.get(name, 0.0) + dt - children
+
+    # ---- Reporting ----
+
+    def reset(self):
+        with self._lock:
+            self._frames.clear()
+            self._skipped = 0
+
+    def summary(self):
+        with self._lock:
+            frames = list(self._frames)
+        out = {"frames": len(frames), "skipped_ticks": self._skipped, "stages": {}}
+        for name in STAGES + ("total", "e2e_sink", "e2e"):
+            if name not in STAGES:
+                values = sorted(f[name] for f in frames if name in f)
+            else:
+                values = sorted(
+                    f["stages"][name] for f in frames if name in f["stages"]
+                )
+            if not values:
+                continue
+            out["stages"][name] = {
+                "count": len(values),
+                "p50_ms": _ms(percentile(values, 50)),
+                "p90_ms": _ms(percentile(values, 90)),
+                "p95_ms": _ms(percentile(values, 95)),
+                "p99_ms": _ms(percentile(values, 99)),
+                "max_ms": _ms(values[-1]),
+            }
+        return out
+
+    def format_summary(self):
+        s = self.summary()
+        parts = [f"[Profiler] {s['frames']} frames, {s['skipped_ticks']} idle ticks"]
+        for name, st in s["stages"].items():
+            parts.append(
+                f"{name} p50={st['p50_ms']:.2f} p90={st['p90_ms']:.2f} "
+                f"p99={st['p99_ms']:.2f}ms"
+            )
+        return " | ".join(parts)
+
+    def dump(self, path=None):
+        if path is None:
+            path = os.path.join(
+                tempfile.gettempdir(), f"nbtrackr-profile-{os.getpid()}.json"
+            )
+        with self._lock:
+            frames = list(self._frames)
+        # arrived and shown are time.monotonic() readings, on Linux the clock
+        # is shared by all processes so benchmarks can line them up with
+        # their own.
+        data = {
+            "generated": time.time(),
+            "summary": self.summary(),
+            "frames": [
+                {
+                    "total_ms": _ms(f.get("total")),
+                    "e2e_sink_ms": _ms(f.get("e2e_sink")),
+                    "e2e_ms": _ms(f.get("e2e")),
+                    "generation": f["generation"],
+                    "arrived": f.get("arrived"),
+                    "shown": f["shown"],
+                    "stages_ms": {k: _ms(v) for k, v in f["stages"].items()},
+                }
+                for f in frames
+            ],
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+        return path
+
+    def install_dump_signal(self, signum=getattr(signal, "SIGUSR1", None)):
+        if not self.enabled or signum is None:
+            return
+
+        def _dump():
+            try:
+                path = self.dump()
+                self._log(f"[Profiler] Wrote {len(self._frames)} frames to {path}")
+            except Exception as e:
+                self._log(f"[Profiler] Failed to write profile: {e}")
+
+        # The handler runs on the main thread, possibly while that thread holds
+        # _lock in end_frame, so the dump waits for the lock on its own thread.
+        def _handler(_signum, _frame):
+            threading.Thread(target=_dump, name="profile-dump", daemon=True).start()
+
+        signal.signal(signum, _handler)
@@ -0,0 +1,155 @@
+import itertools
+import threading
+
+from PIL import Image
+
+# multiprocessing is imported by the pool itself, the tracker imports this
+# module on every launch but only starts a pool when it is enabled.
+
+# Frames up to this size are handed back through shared memory, larger ones
+# fall back to being sent through the pipe.
+FRAME_BUFFER_SIZE = 32 * 1024 * 1024
+
+
+class RenderWorkerError(Exception):
+    pass
+
+
+def _worker_main(conn, frame_buf, renderers, warmup):
+    if warmup is not None:
+        try:
+            warmup()
+        except Exception:
+            pass
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            return
+        if job is None:
+            return
+
+        job_id, name, args, kwargs = job
+        try:
+            img = renderers[name](*args, **kwargs)
+            if img is None:
+                conn.send((job_id, "none", None, None))
+                continue
+            if img.mode != "RGBA":
+                img = img.convert("RGBA")
+            data = img.tobytes("raw", "RGBA")
+            if len(data) <= len(frame_buf.buf):
+                frame_buf.buf[: len(data)] = data
+                conn.send((job_id, "shm", img.size, None))
+            else:
+                conn.send((job_id, "bytes", img.size, data))
+        except Exception as e:
+            try:
+                conn.send((job_id, "error", None, repr(e)))
+            except Exception:
+                return
+
+
+class _Worker:
+    def __init__(self, ctx, renderers, warmup):
+        from multiprocessing import shared_memory
+
+        self.frame_buf = shared_memory.SharedMemory(
+            create=True, size=FRAME_BUFFER_SIZE
+        )
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.frame_buf, renderers, warmup),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        # Both processes keep their mapping, dropping the name right away
+        # means nothing is left behind in /dev/shm if we get killed.
+        self.frame_buf.unlink()
+        self.lock = threading.Lock()
+        self.broken = False
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        try:
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.terminate()
+        except Exception:
+            pass
+        try:
+            self.frame_buf.close()
+        except Exception:
+            pass
+
+
+class RenderWorkerPool:
+    # Workers are forked, so the renderers and everything they reference are
+    # inherited as-is and never pickled. Start the pool before any other
+    # threads or the Qt application exist.
+
+    def __init__(self, renderers, workers=1, warmup=None, timeout=2.0):
+        import multiprocessing
+
+        ctx = multiprocessing.get_context("fork")
+        self._timeout = timeout
+        self._job_ids = itertools.count(1)
+        self._workers = [_Worker(ctx, renderers, warmup) for _ in range(workers)]
+
+    @property
+    def alive(self):
+        return any(not w.broken for w in self._workers)
+
+    def _acquire_worker(self):
+        for w in self._workers:
+            if not w.broken and w.lock.acquire(blocking=False):
+                return w
+        for w in self._workers:
+            if not w.broken:
+                w.lock.acquire()
+                if w.broken:
+                    w.lock.release()
+                    continue
+                return w
+        raise RenderWorkerError("no render workers left")
+
+    def render(self, name, *args, **kwargs):
+        worker = self._acquire_worker()
+        try:
+            job_id = next(self._job_ids)
+            try:
+                worker.conn.send((job_id, name, args, kwargs))
+                if not worker.conn.poll(self._timeout):
+                    raise RenderWorkerError("render worker timed out")
+                while True:
+                    rid, kind, size, payload = worker.conn.recv()
+                    if rid == job_id:
+                        break
+            except RenderWorkerError:
+                worker.broken = True
+                worker.process.terminate()
+                raise
+            except (EOFError, OSError) as e:
+                worker.broken = True
+                raise RenderWorkerError(f"render worker died: {e}")
+
+            if kind == "none":
+                return None
+            if kind == "error":
+                raise RenderWorkerError(payload)
+            if kind == "bytes":
+                return Image.frombytes("RGBA", size, payload)
+            n = size[0] * size[1] * 4
+            return Image.frombytes("RGBA", size, bytes(worker.frame_buf.buf[:n]))
+        finally:
+            worker.lock.release()
+
+    def close(self):
+        for w in self._workers:
+            w.close()
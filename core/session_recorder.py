@@ -0,0 +1,75 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+# Records every Ninjabrain Bot response the tracker receives, for replaying a
+# session offline with benchmarks/replay_server.py. The file is JSON lines: a
+# header, then one entry per request with its time in seconds since the start
+# of the recording. A response identical to the previous one of the same
+# endpoint is stored without its body. The poller only queues entries, a
+# background thread serializes and appends them.
+
+RECORDING_FORMAT = 1
+SESSIONS_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "NBTrackr",
+    "sessions",
+)
+
+
+def default_recording_path():
+    return os.path.join(
+        SESSIONS_DIR, datetime.now().strftime("session-%Y%m%d-%H%M%S.jsonl")
+    )
+
+
+class SessionRecorder:
+    def __init__(self, path, log=print, **header):
+        self.path = path
+        self.log = log
+        self._header = dict(
+            header,
+            nbtrackr_recording=RECORDING_FORMAT,
+            started=datetime.now().isoformat(timespec="seconds"),
+        )
+        self._start = time.monotonic()
+        self._queue = queue.SimpleQueue()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a")
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def record(self, endpoint, response=None, error=None):
+        self._queue.put((time.monotonic() - self._start, endpoint, response, error))
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+
+    def _run(self):
+        last = {}
+        f = self._file
+        try:
+            f.write(json.dumps(self._header) + "\n")
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                t, endpoint, response, error = item
+                entry = {"t": round(t, 4), "e": endpoint}
+                if error is not None:
+                    entry["err"] = error
+                    last.pop(endpoint, None)
+                elif last.get(endpoint) != response:
+                    entry["r"] = response
+                    last[endpoint] = response
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+                if self._queue.empty():
+                    f.flush()
+        except OSError as e:
+            self.log(f"[Record] Stopped recording to {self.path}: {e}")
+        finally:
+            f.close()
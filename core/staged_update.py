@@ -0,0 +1,211 @@
+import fcntl
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+
+# Kept free of network and heavy imports, core/bootstrap.py runs this on every
+# launch before the tracker is loaded.
+
+MANIFEST_SKIP = ("venv", "__pycache__", ".git")
+STAGED_MARKER = ".staged.json"
+
+_lock_fd = None
+
+
+def staging_dir(install_dir, tag):
+    parent, name = os.path.split(os.path.abspath(install_dir))
+    return os.path.join(parent, f".{name}.staged-{tag}")
+
+
+def previous_dir(install_dir):
+    parent, name = os.path.split(os.path.abspath(install_dir))
+    return os.path.join(parent, f".{name}.previous")
+
+
+def _lock_path(install_dir):
+    parent, name = os.path.split(os.path.abspath(install_dir))
+    return os.path.join(parent, f".{name}.lock")
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def build_manifest(root):
+    files = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if d not in MANIFEST_SKIP and not d.startswith(".")
+        )
+        for filename in sorted(filenames):
+            if filename.startswith(".") or filename.endswith((".pyc", ".part")):
+                continue
+            path = os.path.join(dirpath, filename)
+            if os.path.islink(path) or not os.path.isfile(path):
+                continue
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            st = os.stat(path)
+            files[rel] = {
+                "sha256": file_sha256(path),
+                "size": st.st_size,
+                "mode": st.st_mode & 0o777,
+            }
+    return files
+
+
+def installed_version(install_dir):
+    try:
+        with open(os.path.join(install_dir, "NBTrackr-imgpin.py"), "r") as f:
+            for _ in range(80):
+                m = re.match(r'APP_VERSION = "([^"]+)"', f.readline())
+                if m:
+                    return m.group(1)
+    except Exception:
+        pass
+    return None
+
+
+# ---- Install lock ----
+
+
+def hold_install_lock(install_dir):
+    # Every running tracker holds a shared lock for its lifetime, a staged
+    # update is only swapped in when nobody else is running from the install.
+    global _lock_fd
+    try:
+        _lock_fd = os.open(_lock_path(install_dir), os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(_lock_fd, fcntl.LOCK_SH | fcntl.LOCK_NB)
+    except OSError:
+        pass
+
+
+def _try_exclusive_lock(install_dir):
+    try:
+        fd = os.open(_lock_path(install_dir), os.O_RDWR | os.O_CREAT, 0o644)
+    except OSError:
+        return None
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        os.close(fd)
+        return None
+    return fd
+
+
+# ---- Apply ----
+
+
+def find_staged(install_dir):
+    parent, name = os.path.split(os.path.abspath(install_dir))
+    for marker_path in glob.glob(os.path.join(parent, f".{name}.staged-*", STAGED_MARKER)):
+        try:
+            with open(marker_path, "r") as f:
+                marker = json.load(f)
+        except Exception:
+            continue
+        return os.path.dirname(marker_path), marker
+    return None
+
+
+def _exchange(a, b):
+    # renameat2(RENAME_EXCHANGE) swaps both directories in one step, there is
+    # no moment where the install path does not exist.
+    try:
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        renameat2 = libc.renameat2
+    except (OSError, AttributeError):
+        return False
+    at_fdcwd, rename_exchange = -100, 2
+    return renameat2(at_fdcwd, os.fsencode(a), at_fdcwd, os.fsencode(b), rename_exchange) == 0
+
+
+def apply_staged_update(install_dir, log=print):
+    install_dir = os.path.abspath(install_dir)
+    found = find_staged(install_dir)
+    if found is None:
+        return None
+    staged, marker = found
+    version = marker.get("version")
+
+    current = installed_version(install_dir)
+    if current is None or marker.get("from") != current:
+        log(f"[Updater] Discarding staged {version}, it was prepared for {marker.get('from')}.")
+        shutil.rmtree(staged, ignore_errors=True)
+        return None
+    if marker.get("requirements_changed"):
+        log(
+            f"[Updater] {version} is downloaded but needs new Python packages, "
+            f"run `nbtrackr --update` to install it."
+        )
+        return None
+
+    lock_fd = _try_exclusive_lock(install_dir)
+    if lock_fd is None:
+        log(f"[Updater] {version} will be installed once no other NBTrackr is running.")
+        return None
+
+    venv_src = os.path.join(install_dir, "venv")
+    venv_dst = os.path.join(staged, "venv")
+    moved_venv = False
+    try:
+        if os.path.isdir(venv_src) and not os.path.exists(venv_dst):
+            os.rename(venv_src, venv_dst)
+            moved_venv = True
+        if not _exchange(staged, install_dir):
+            old = staged + ".old"
+            os.rename(install_dir, old)
+            try:
+                os.rename(staged, install_dir)
+            except OSError:
+                os.rename(old, install_dir)
+                raise
+            os.rename(old, staged)
+    except OSError as e:
+        if moved_venv and not os.path.exists(venv_src):
+            try:
+                os.rename(venv_dst, venv_src)
+            except OSError:
+                pass
+        log(f"[Updater] Could not install {version}: {e}")
+        return None
+    finally:
+        os.close(lock_fd)
+
+    # staged now holds the version that was just replaced.
+    try:
+        os.remove(os.path.join(install_dir, STAGED_MARKER))
+    except OSError:
+        pass
+    previous = previous_dir(install_dir)
+    shutil.rmtree(previous, ignore_errors=True)
+    try:
+        os.rename(staged, previous)
+    except OSError:
+        shutil.rmtree(staged, ignore_errors=True)
+    log(f"[Updater] Updated NBTrackr {current} -> {version}.")
+    return version
+
+
+if __name__ == "__main__":
+    # Used when publishing a release:
+    #   python core/staged_update.py manifest <release dir> <tag> > NBTrackr-imgpin-<tag>.manifest.json
+    if len(sys.argv) != 4 or sys.argv[1] != "manifest":
+        print("usage: staged_update.py manifest RELEASE_DIR TAG")
+        sys.exit(2)
+    json.dump(
+        {"version": sys.argv[3], "files": build_manifest(sys.argv[2])},
+        sys.stdout,
+        indent=2,
+        sort_keys=True,
+    )
+    print()
@@ -0,0 +1,94 @@
+import builtins
+import sys
+import threading
+import time
+
+_start = time.perf_counter()
+
+
+class StartupProfiler:
+    # Import times are collected by wrapping __import__, like -X importtime
+    # but summed per top-level package and thread. Init phases are marked by
+    # the tracker, the report is printed once the first overlay frame is
+    # applied.
+
+    def __init__(self, enabled=False, top=12):
+        self.enabled = enabled
+        self.top = top
+        self._imports = {}
+        self._phases = []
+        self._last_mark = _start
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._reported = False
+        self._orig_import = None
+        if enabled:
+            self._orig_import = builtins.__import__
+            builtins.__import__ = self._timed_import
+
+    # ---- Imports ----
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if level or name in sys.modules or getattr(self._local, "busy", False):
+            return self._orig_import(name, globals, locals, fromlist, level)
+
+        # Only outermost imports are timed, everything they pull in is counted
+        # towards the package that was asked for.
+        self._local.busy = True
+        t0 = time.perf_counter()
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            dt = time.perf_counter() - t0
+            self._local.busy = False
+            key = name.partition(".")[0]
+            with self._lock:
+                self._imports[key] = self._imports.get(key, 0.0) + dt
+
+    def stop_import_timing(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    # ---- Init phases ----
+
+    def mark(self, name):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self._lock:
+            self._phases.append((name, now - self._last_mark))
+            self._last_mark = now
+
+    def first_frame(self):
+        if not self.enabled or self._reported:
+            return
+        self._reported = True
+        self.mark("first frame")
+        self.stop_import_timing()
+        print(self.format_report(), flush=True)
+
+    # ---- Reporting ----
+
+    def format_report(self):
+        with self._lock:
+            imports = sorted(self._imports.items(), key=lambda kv: -kv[1])
+            phases = list(self._phases)
+        total = time.perf_counter() - _start
+        lines = [f"[Startup] {total * 1000.0:.1f} ms from launch to first frame"]
+        lines.append(
+            f"[Startup] Imports (all threads): "
+            f"{sum(v for _, v in imports) * 1000.0:.1f} ms"
+        )
+        for name, seconds in imports[: self.top]:
+            lines.append(f"    {name:<24} {seconds * 1000.0:8.1f} ms")
+        rest = imports[self.top :]
+        if rest:
+            lines.append(
+                f"    {f'({len(rest)} more)':<24} "
+                f"{sum(v for _, v in rest) * 1000.0:8.1f} ms"
+            )
+        lines.append("[Startup] Phases:")
+        for name, seconds in phases:
+            lines.append(f"    {name:<24} {seconds * 1000.0:8.1f} ms")
+        return "\n".join(lines)
@@ -1,17 +1,115 @@
 import requests
 import os
+import glob
+import json
+import time
+import hashlib
+import shutil
 import tempfile
 import tarfile
+import threading
 import sys
+from urllib.parse import quote
+
+from core.staged_update import (
+    STAGED_MARKER,
+    build_manifest,
+    file_sha256,
+    staging_dir,
+)
 
 GITHUB_API = "https://api.github.com/repos/qMaxXen/NBTrackr/releases/latest"
 
-def get_latest_github_release_version():
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "NBTrackr"
+)
+RELEASE_CACHE_FILE = os.path.join(CACHE_DIR, "latest-release.json")
+# GitHub is asked at most once per this many seconds, every other launch
+# answers from RELEASE_CACHE_FILE.
+RELEASE_CHECK_TTL = 24 * 60 * 60
+
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+DOWNLOAD_RETRIES = 5
+
+# Where the background updater fetches single files listed in a release
+# manifest from, unless the manifest names its own base_url.
+RAW_FILE_URL = "https://raw.githubusercontent.com/qMaxXen/NBTrackr/{tag}/{path}"
+
+
+class UpdateError(Exception):
+    pass
+
+
+# ---- Release metadata ----
+
+
+def _load_release_cache():
+    try:
+        with open(RELEASE_CACHE_FILE, "r") as f:
+            data = json.load(f)
+        if isinstance(data, dict) and isinstance(data.get("release"), dict):
+            return data
+    except Exception:
+        pass
+    return {}
+
+
+def _save_release_cache(release, etag=None):
     try:
-        response = requests.get(GITHUB_API, timeout=5)
-        response.raise_for_status()
-        data = response.json()
-        return data.get("tag_name")
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = RELEASE_CACHE_FILE + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"checked_at": time.time(), "etag": etag, "release": release}, f)
+        os.replace(tmp, RELEASE_CACHE_FILE)
+    except Exception:
+        pass
+
+
+def _release_from_api(data):
+    return {
+        "tag_name": data.get("tag_name"),
+        "body": data.get("body") or "",
+        "assets": [
+            {
+                "name": a.get("name"),
+                "browser_download_url": a.get("browser_download_url"),
+                "size": a.get("size"),
+                "digest": a.get("digest"),
+            }
+            for a in data.get("assets", [])
+        ],
+    }
+
+
+def fetch_release(max_age=RELEASE_CHECK_TTL, api_url=GITHUB_API):
+    # Within max_age the cached metadata is returned without a request, after
+    # that it is revalidated with If-None-Match, a 304 costs no rate limit.
+    cached = _load_release_cache()
+    release = cached.get("release")
+    checked_at = cached.get("checked_at", 0)
+    if "release" in cached and max_age and 0 <= time.time() - checked_at < max_age:
+        return release
+
+    headers = {"Accept": "application/vnd.github+json"}
+    if release and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    response = requests.get(api_url, headers=headers, timeout=5)
+    if response.status_code == 304 and release:
+        _save_release_cache(release, cached.get("etag"))
+        return release
+    if response.status_code == 403:
+        # Back off for a full TTL instead of asking again next launch.
+        _save_release_cache(release or {}, cached.get("etag"))
+    response.raise_for_status()
+    release = _release_from_api(response.json())
+    _save_release_cache(release, response.headers.get("ETag"))
+    return release
+
+
+def get_latest_github_release_version(max_age=RELEASE_CHECK_TTL, api_url=GITHUB_API):
+    try:
+        return fetch_release(max_age, api_url).get("tag_name")
     except Exception as e:
         if (
             hasattr(e, "response")
@@ -24,20 +122,338 @@ def get_latest_github_release_version():
         return None
 
 
-def check_for_update(current_version):
-    latest_version = get_latest_github_release_version()
+def check_for_update(current_version, max_age=RELEASE_CHECK_TTL, api_url=GITHUB_API):
+    latest_version = get_latest_github_release_version(max_age, api_url)
     if latest_version and latest_version != current_version:
         return latest_version
     return None
 
 
-def check_and_update(current_version, script_dir):
-    try:
-        resp = requests.get(GITHUB_API, timeout=5)
+# ---- Download ----
+
+
+def find_asset(release, name):
+    return next((a for a in release.get("assets", []) if a.get("name") == name), None)
+
+
+def asset_digest(release, asset):
+    # GitHub publishes "sha256:<hex>" for uploaded assets, older releases can
+    # ship a "<asset>.sha256" file next to the archive instead.
+    digest = asset.get("digest")
+    if digest and ":" in digest:
+        algo, _, value = digest.partition(":")
+        return algo.lower(), value.strip().lower()
+
+    checksum_asset = find_asset(release, asset["name"] + ".sha256")
+    if checksum_asset is None:
+        return None
+    resp = requests.get(checksum_asset["browser_download_url"], timeout=10)
+    resp.raise_for_status()
+    value = resp.text.split()[0].strip().lower() if resp.text.split() else ""
+    if not value:
+        raise UpdateError(f"{checksum_asset['name']} is empty")
+    return "sha256", value
+
+
+class DownloadStream:
+    # Read-only file object over an HTTP download. A dropped connection is
+    # picked up where it stopped with a Range request, every byte passes
+    # through the hash, nothing is written to disk.
+
+    def __init__(self, url, size=None, digest=None, retries=DOWNLOAD_RETRIES):
+        self.url = url
+        self.size = size
+        self.offset = 0
+        self.retries = retries
+        self._digest = digest
+        self._hash = hashlib.new(digest[0]) if digest else None
+        self._buf = bytearray()
+        self._resp = None
+        self._chunks = None
+
+    def _open(self):
+        headers = {"Accept-Encoding": "identity"}
+        if self.offset:
+            headers["Range"] = f"bytes={self.offset}-"
+        resp = requests.get(self.url, headers=headers, stream=True, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
-        latest = data["tag_name"]
+        if self.offset and resp.status_code != 206:
+            resp.close()
+            raise UpdateError("the server does not support resuming downloads")
+        if self.size is None and "Content-Length" in resp.headers:
+            self.size = self.offset + int(resp.headers["Content-Length"])
+        self._resp = resp
+        self._chunks = resp.iter_content(DOWNLOAD_CHUNK_SIZE)
+
+    def _close_response(self):
+        if self._resp is not None:
+            self._resp.close()
+        self._resp = None
+        self._chunks = None
+
+    def _next_chunk(self):
+        failures = 0
+        while True:
+            try:
+                if self._chunks is None:
+                    self._open()
+                chunk = next(self._chunks, b"")
+                if chunk or self.size is None or self.offset >= self.size:
+                    return chunk
+                raise requests.ConnectionError(
+                    f"connection closed after {self.offset} of {self.size} bytes"
+                )
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                self._close_response()
+                failures += 1
+                if failures > self.retries:
+                    raise UpdateError(f"download failed: {e}")
+                print(
+                    f"[Updater] Connection lost at {self.offset} bytes, resuming "
+                    f"({failures}/{self.retries}) …"
+                )
+                time.sleep(min(0.5 * 2**failures, 10))
+
+    def read(self, n=-1):
+        while n is None or n < 0 or len(self._buf) < n:
+            chunk = self._next_chunk()
+            if not chunk:
+                break
+            self.offset += len(chunk)
+            if self._hash is not None:
+                self._hash.update(chunk)
+            self._buf += chunk
+        if n is None or n < 0:
+            n = len(self._buf)
+        data = bytes(self._buf[:n])
+        del self._buf[:n]
+        return data
+
+    def finish(self):
+        # tarfile stops at the end-of-archive marker, the hash needs the rest.
+        while self.read(DOWNLOAD_CHUNK_SIZE):
+            pass
+        self._close_response()
+        if self._hash is not None and self._hash.hexdigest() != self._digest[1]:
+            raise UpdateError(
+                f"checksum mismatch ({self._digest[0]} {self._hash.hexdigest()}, "
+                f"expected {self._digest[1]})"
+            )
+
+    def close(self):
+        self._close_response()
+
+
+def _safe_members(tar, dest):
+    dest = os.path.realpath(dest)
+    for member in tar:
+        target = os.path.realpath(os.path.join(dest, member.name))
+        if target != dest and not target.startswith(dest + os.sep):
+            raise UpdateError(f"refusing to extract {member.name} outside {dest}")
+        if member.issym() or member.islnk():
+            link = os.path.realpath(os.path.join(os.path.dirname(target), member.linkname))
+            if not link.startswith(dest + os.sep):
+                raise UpdateError(f"refusing link {member.name} -> {member.linkname}")
+        yield member
+
+
+def download_and_extract(url, parent_dir, folder_name, size=None, digest=None):
+    # The archive is decompressed and unpacked while it downloads, into a
+    # hidden staging directory that is only renamed into place once the
+    # checksum matched. A failed update leaves nothing behind.
+    folder_path = os.path.join(parent_dir, folder_name)
+    staging = tempfile.mkdtemp(prefix=f".{folder_name}.", dir=parent_dir)
+    stream = DownloadStream(url, size=size, digest=digest)
+    try:
+        with tarfile.open(fileobj=stream, mode="r|xz") as tar:
+            if hasattr(tarfile, "data_filter"):
+                tar.extractall(path=staging, filter="data")
+            else:
+                tar.extractall(path=staging, members=_safe_members(tar, staging))
+        stream.finish()
+
+        extracted = os.path.join(staging, folder_name)
+        if not os.path.isdir(extracted):
+            entries = os.listdir(staging)
+            if len(entries) == 1 and os.path.isdir(os.path.join(staging, entries[0])):
+                extracted = os.path.join(staging, entries[0])
+            else:
+                extracted = staging
+        os.rename(extracted, folder_path)
+    except tarfile.TarError as e:
+        raise UpdateError(f"could not extract the archive: {e}")
+    finally:
+        stream.close()
+        if os.path.isdir(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+    return folder_path
+
+
+# ---- Background staging ----
+
+
+def manifest_asset_name(tag):
+    return f"NBTrackr-imgpin-{tag}.manifest.json"
+
+
+def lower_thread_priority():
+    # On Linux both calls only affect the calling thread.
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, 19)
+    except Exception:
+        pass
+    try:
+        import ctypes
+        import platform
+
+        ioprio_set = {"x86_64": 251, "aarch64": 30, "i686": 289, "armv7l": 315}
+        nr = ioprio_set.get(platform.machine())
+        if nr is not None:
+            # IOPRIO_WHO_PROCESS, IOPRIO_CLASS_IDLE
+            ctypes.CDLL(None, use_errno=True).syscall(nr, 1, tid, 3 << 13)
+    except Exception:
+        pass
+
+
+def _download_file(url, dest, digest, mode=None):
+    stream = DownloadStream(url, digest=digest)
+    part = dest + ".part"
+    try:
+        with open(part, "wb") as f:
+            for chunk in iter(lambda: stream.read(DOWNLOAD_CHUNK_SIZE), b""):
+                f.write(chunk)
+        stream.finish()
+        if mode is not None:
+            os.chmod(part, mode)
+        os.replace(part, dest)
+    except Exception:
+        try:
+            os.remove(part)
+        except OSError:
+            pass
+        raise
+    finally:
+        stream.close()
+
+
+def _fetch_manifest(release, asset):
+    stream = DownloadStream(
+        asset["browser_download_url"], digest=asset_digest(release, asset)
+    )
+    try:
+        data = stream.read()
+        stream.finish()
+    finally:
+        stream.close()
+    manifest = json.loads(data)
+    if not isinstance(manifest.get("files"), dict):
+        raise UpdateError(f"{asset['name']} has no file list")
+    return manifest
+
+
+def _stage_delta(release, manifest_asset, install_dir, staged, tag):
+    # Files whose hash already exists in the current install are copied, only
+    # new or changed ones are downloaded. Files already staged by an earlier,
+    # interrupted run are kept.
+    manifest = _fetch_manifest(release, manifest_asset)
+    base_url = manifest.get("base_url") or RAW_FILE_URL
+    local = build_manifest(install_dir)
+    by_hash = {info["sha256"]: rel for rel, info in local.items()}
+    stats = {"copied": 0, "downloaded": 0, "bytes": 0}
+
+    for rel, info in sorted(manifest["files"].items()):
+        parts = rel.split("/")
+        if rel.startswith("/") or ".." in parts or parts[0] in ("venv", ""):
+            raise UpdateError(f"refusing manifest entry {rel}")
+        dest = os.path.join(staged, *parts)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        sha256 = info["sha256"].lower()
+        mode = info.get("mode")
+        if os.path.isfile(dest) and file_sha256(dest) == sha256:
+            continue
+        src = by_hash.get(sha256)
+        if src is not None:
+            shutil.copyfile(os.path.join(install_dir, *src.split("/")), dest)
+            if mode is not None:
+                os.chmod(dest, mode)
+            stats["copied"] += 1
+        else:
+            url = base_url.format(tag=tag, path=quote(rel))
+            _download_file(url, dest, ("sha256", sha256), mode)
+            stats["downloaded"] += 1
+            stats["bytes"] += info.get("size", 0)
+    return stats
+
+
+def stage_update(release, install_dir, current_version):
+    # Prepares the release as a complete tree next to the install. It is
+    # swapped in by core/staged_update.py on the next launch.
+    tag = release.get("tag_name")
+    if not tag or tag == current_version:
+        return None
+    install_dir = os.path.abspath(install_dir)
+    staged = staging_dir(install_dir, tag)
+    if os.path.isfile(os.path.join(staged, STAGED_MARKER)):
+        return staged
+
+    parent, name = os.path.split(install_dir)
+    for other in glob.glob(os.path.join(parent, f".{name}.staged-*")):
+        if other != staged:
+            shutil.rmtree(other, ignore_errors=True)
+
+    manifest_asset = find_asset(release, manifest_asset_name(tag))
+    if manifest_asset is not None:
+        os.makedirs(staged, exist_ok=True)
+        stats = _stage_delta(release, manifest_asset, install_dir, staged, tag)
+    else:
+        asset = find_asset(release, f"NBTrackr-imgpin-{tag}.tar.xz")
+        if asset is None:
+            raise UpdateError(f"release {tag} has no archive or manifest")
+        shutil.rmtree(staged, ignore_errors=True)
+        download_and_extract(
+            asset["browser_download_url"],
+            parent,
+            os.path.basename(staged),
+            size=asset.get("size"),
+            digest=asset_digest(release, asset),
+        )
+        stats = {"copied": 0, "downloaded": 1, "bytes": asset.get("size") or 0}
+
+    try:
+        import compileall
+
+        compileall.compile_dir(staged, ddir=install_dir, quiet=1)
+    except Exception:
+        pass
+
+    def _requirements(root):
+        path = os.path.join(root, "requirements.txt")
+        return file_sha256(path) if os.path.isfile(path) else None
+
+    marker = {
+        "version": tag,
+        "from": current_version,
+        "requirements_changed": _requirements(staged) != _requirements(install_dir),
+        "stats": stats,
+    }
+    tmp = os.path.join(staged, STAGED_MARKER + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(marker, f)
+    os.replace(tmp, os.path.join(staged, STAGED_MARKER))
+    return staged
+
+
+def check_and_update(current_version, script_dir, api_url=GITHUB_API):
+    try:
+        release = fetch_release(max_age=0, api_url=api_url)
+        latest = release["tag_name"]
         if latest == current_version:
+            print(f"[Updater] Already running the latest version ({latest}).")
             return
         asset_name = f"NBTrackr-imgpin-{latest}.tar.xz"
         folder_name = asset_name.replace(".tar.xz", "")
@@ -49,30 +465,24 @@ def check_and_update(current_version, script_dir):
             print(f"    {folder_path}")
             print("[Updater] Then run the script again from the new version.")
             sys.exit(0)
-        download_url = next(
-            (
-                a["browser_download_url"]
-                for a in data["assets"]
-                if a["name"] == asset_name
-            ),
-            None,
-        )
-        if not download_url:
+        asset = find_asset(release, asset_name)
+        if asset is None:
             print(f"[Updater] Couldn't find asset {asset_name} in release {latest}.")
             return
-        print(f"[Updater] Downloading {asset_name} …")
-        tmpdir = tempfile.mkdtemp()
-        archive_path = os.path.join(tmpdir, asset_name)
-        with requests.get(download_url, stream=True, timeout=10) as dl:
-            dl.raise_for_status()
-            with open(archive_path, "wb") as f:
-                for chunk in dl.iter_content(8192):
-                    f.write(chunk)
-        print(f"[Updater] Extracting to {parent_dir} …")
-        with tarfile.open(archive_path, "r:xz") as tar:
-            tar.extractall(path=parent_dir, filter=lambda tarinfo, memberpath: tarinfo)
-        os.remove(archive_path)
-        body = data.get("body", "").strip()
+        digest = asset_digest(release, asset)
+        if digest is None:
+            print("[Updater] No checksum published for this release, skipping verification.")
+        print(f"[Updater] Downloading and extracting {asset_name} to {parent_dir} …")
+        download_and_extract(
+            asset["browser_download_url"],
+            parent_dir,
+            folder_name,
+            size=asset.get("size"),
+            digest=digest,
+        )
+        if digest is not None:
+            print(f"[Updater] Verified {digest[0]} checksum.")
+        body = release.get("body", "").strip()
         if body:
             print("\n[Updater] What's new:")
             print("-" * 40)
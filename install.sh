@@ -68,6 +68,9 @@ echo "Installing required Python packages..."
 "$FULL_PATH" -m pip install --upgrade pip
 "$FULL_PATH" -m pip install -r requirements.txt
 
+echo "Precompiling NBTrackr..."
+"$FULL_PATH" -m compileall -q NBTrackr-imgpin.py Customizer-imgpin.py core shared
+
 echo
 echo -e "${GREEN}Installation complete!${NC}"
 echo
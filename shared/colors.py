@@ -1,4 +1,7 @@
-def gradient_color(angle: float):
+from functools import lru_cache
+
+
+def _gradient_color(angle: float):
     if angle <= 90:
         t = angle / 90.0
         red = int(255 * t)
@@ -10,9 +13,90 @@ def gradient_color(angle: float):
     return (red, green, 0)
 
 
+def _certainty_color(pct: float):
+    pct = max(0.0, min(100.0, pct))
+    return _gradient_color((100 - pct) * 1.8)
+
+
+# Ninjabrain Bot's own red -> yellow -> green scale, used for the combined
+# certainty in its information messages.
+NB_RED = (189, 65, 65)
+NB_YELLOW = (216, 192, 100)
+NB_GREEN = (89, 185, 75)
+
+
+def interpolate_color(c1, c2, steps, step):
+    r = int(c1[0] + (c2[0] - c1[0]) * step / max(steps - 1, 1))
+    g = int(c1[1] + (c2[1] - c1[1]) * step / max(steps - 1, 1))
+    b = int(c1[2] + (c2[2] - c1[2]) * step / max(steps - 1, 1))
+    return (r, g, b)
+
+
+def _nb_certainty_color(pct: float):
+    if pct >= 50:
+        return interpolate_color(NB_YELLOW, NB_GREEN, 51, int(pct - 50))
+    return interpolate_color(NB_RED, NB_YELLOW, 51, int(pct))
+
+
+# --------------------- Lookup tables --------------------------
+
+# The gradients are read from tables instead of being computed per cell. Turn
+# angles and certainties are looked up at the 0.1 precision the overlays show
+# them with, Ninjabrain Bot's scale only changes on whole percents. Values off
+# the table's range are computed. Per alpha, the RGBA tables are built once.
+
+LUT_STEPS = 10  # entries per degree / percent
+_LUTS = {
+    "gradient": tuple(
+        _gradient_color(i / LUT_STEPS) for i in range(180 * LUT_STEPS + 1)
+    ),
+    "certainty": tuple(
+        _certainty_color(i / LUT_STEPS) for i in range(100 * LUT_STEPS + 1)
+    ),
+    "nb_certainty": tuple(_nb_certainty_color(i) for i in range(101)),
+}
+_GRADIENT_LUT = _LUTS["gradient"]
+_CERTAINTY_LUT = _LUTS["certainty"]
+_NB_CERTAINTY_LUT = _LUTS["nb_certainty"]
+
+
+@lru_cache(maxsize=64)
+def _rgba_table(name, alpha):
+    return tuple((r, g, b, alpha) for r, g, b in _LUTS[name])
+
+
+def gradient_color(angle: float):
+    if 0 <= angle <= 180:
+        return _GRADIENT_LUT[round(angle * LUT_STEPS)]
+    return _gradient_color(angle)
+
+
 def certainty_color(pct: float):
     pct = max(0.0, min(100.0, pct))
-    return gradient_color((100 - pct) * 1.8)
+    return _CERTAINTY_LUT[round(pct * LUT_STEPS)]
+
+
+def nb_certainty_color(pct: float):
+    if 0 <= pct <= 100:
+        return _NB_CERTAINTY_LUT[int(pct)]
+    return _nb_certainty_color(pct)
+
+
+def gradient_rgba(angle: float, alpha: int):
+    if 0 <= angle <= 180:
+        return _rgba_table("gradient", alpha)[round(angle * LUT_STEPS)]
+    return (*_gradient_color(angle), alpha)
+
+
+def certainty_rgba(pct: float, alpha: int):
+    pct = max(0.0, min(100.0, pct))
+    return _rgba_table("certainty", alpha)[round(pct * LUT_STEPS)]
+
+
+def nb_certainty_rgba(pct: float, alpha: int):
+    if 0 <= pct <= 100:
+        return _rgba_table("nb_certainty", alpha)[int(pct)]
+    return (*_nb_certainty_color(pct), alpha)
 
 
 def blind_evaluation_color(evaluation):
@@ -44,10 +128,12 @@ def hex_to_rgb(hexstr, fallback=(0, 0, 0)):
         return fallback
 
 
+def alpha_byte(alpha_float):
+    return max(0, min(255, int(alpha_float * 255)))
+
+
 def with_alpha(color, alpha_float):
-    r, g, b = color[0], color[1], color[2]
-    a = max(0, min(255, int(alpha_float * 255)))
-    return (r, g, b, a)
+    return (color[0], color[1], color[2], alpha_byte(alpha_float))
 
 
 def format_blind_evaluation(evaluation):
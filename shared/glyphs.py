@@ -0,0 +1,225 @@
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Most per-frame text is coordinates, certainties, distances and angles drawn
+# from a handful of characters. Instead of shaping and rasterising each string
+# with FreeType on every frame, the glyphs of that alphabet are rasterised once
+# per font and stroke width and number strings are put together from them.
+#
+# The atlas keeps coverage masks, not coloured sprites: the string's mask is
+# drawn with the same bitmap call draw.text ends in, so one atlas serves every
+# colour and the result is identical to draw.text. Glyphs are placed on the
+# pen positions FreeType would use (advance plus the font's pair kerning,
+# rounded to whole pixels), and where two glyphs overlap they are blended the
+# way FreeType blends them into a string mask.
+#
+# Finished string masks are kept too, so recurring values and static labels
+# are not put together (or, with the outline on, stroked) again. Outlined text
+# of any kind goes through the cache: stroking is the expensive part, and
+# header labels, blind lines and the error message repeat on every frame.
+
+GLYPH_ALPHABET = frozenset("0123456789+-.,()%<> ")
+TEXT_MASK_CACHE_BYTES = 4 * 1024 * 1024
+
+
+def _blend(dst, src):
+    # src over dst, with the rounding of FreeType's string renderer in Pillow.
+    out = bytearray(src)
+    for i, d in enumerate(dst):
+        if d:
+            s = src[i]
+            t = d * (255 - s) + 128
+            out[i] = s + (((t >> 8) + t) >> 8)
+    return bytes(out)
+
+
+class GlyphAtlas:
+    def __init__(self, font, stroke_width=0):
+        self.font = font
+        self.stroke_width = stroke_width
+        self._glyphs = {}
+        self._kerning = {}
+
+    def glyph(self, char):
+        # (mask or None, offset x, offset y, advance in 1/64 px)
+        glyph = self._glyphs.get(char)
+        if glyph is None:
+            font, sw = self.font, self.stroke_width
+            left, top, right, bottom = font.getbbox(char, stroke_width=sw)
+            mask = None
+            if right > left and bottom > top:
+                mask = Image.new("L", (right - left, bottom - top))
+                ImageDraw.Draw(mask).text(
+                    (-left, -top), char, font=font, fill=255, stroke_width=sw
+                )
+            advance = round(font.getlength(char) * 64)
+            glyph = self._glyphs[char] = (mask, left, top, advance)
+        return glyph
+
+    def kerning(self, left, right):
+        pair = left + right
+        kern = self._kerning.get(pair)
+        if kern is None:
+            kern = self._kerning[pair] = (
+                round(self.font.getlength(pair) * 64)
+                - self.glyph(left)[3]
+                - self.glyph(right)[3]
+            )
+        return kern
+
+    def mask(self, text):
+        # Returns the string's mask and its offset from the text origin, or
+        # (None, None) when nothing would be drawn.
+        placed = []
+        pen = 0
+        prev = None
+        for char in text:
+            if prev is not None:
+                pen += self.kerning(prev, char)
+            mask, ox, oy, advance = self.glyph(char)
+            if mask is not None:
+                placed.append((mask, ((pen + 32) >> 6) + ox, oy))
+            pen += advance
+            prev = char
+        if not placed:
+            return None, None
+
+        x0 = min(x for _, x, _ in placed)
+        y0 = min(y for _, _, y in placed)
+        x1 = max(x + m.width for m, x, _ in placed)
+        y1 = max(y + m.height for m, _, y in placed)
+        out = Image.new("L", (x1 - x0, y1 - y0))
+        drawn = None
+        for mask, x, y in placed:
+            box = (x - x0, y - y0, x - x0 + mask.width, y - y0 + mask.height)
+            overlap = None
+            if drawn is not None:
+                overlap = (
+                    max(box[0], drawn[0]),
+                    max(box[1], drawn[1]),
+                    min(box[2], drawn[2]),
+                    min(box[3], drawn[3]),
+                )
+                if overlap[0] >= overlap[2] or overlap[1] >= overlap[3]:
+                    overlap = None
+            if overlap is None:
+                out.paste(mask, box)
+            else:
+                src = mask.crop(
+                    (
+                        overlap[0] - box[0],
+                        overlap[1] - box[1],
+                        overlap[2] - box[0],
+                        overlap[3] - box[1],
+                    )
+                )
+                blended = _blend(out.crop(overlap).tobytes(), src.tobytes())
+                out.paste(mask, box)
+                out.paste(Image.frombytes("L", src.size, blended), overlap)
+            drawn = box if drawn is None else (
+                min(drawn[0], box[0]),
+                min(drawn[1], box[1]),
+                max(drawn[2], box[2]),
+                max(drawn[3], box[3]),
+            )
+        return out, (x0, y0)
+
+
+@lru_cache(maxsize=64)
+def glyph_atlas(font, stroke_width=0):
+    return GlyphAtlas(font, stroke_width)
+
+
+# --------------------- Text mask cache --------------------------
+
+# LRU of (font, text, stroke width) -> (mask, offset), capped by the bytes the
+# masks take. Colours are not part of the key, the mask is drawn in whatever
+# fill the caller passes.
+
+_mask_cache = OrderedDict()
+_mask_cache_bytes = 0
+_mask_lock = threading.Lock()
+
+
+def _render_mask(font, text, stroke_width):
+    left, top, right, bottom = font.getbbox(text, stroke_width=stroke_width)
+    if right <= left or bottom <= top:
+        return None, None
+    mask = Image.new("L", (right - left, bottom - top))
+    ImageDraw.Draw(mask).text(
+        (-left, -top), text, font=font, fill=255, stroke_width=stroke_width
+    )
+    return mask, (left, top)
+
+
+def text_mask(font, text, stroke_width=0):
+    global _mask_cache_bytes
+    key = (font, text, stroke_width)
+    with _mask_lock:
+        entry = _mask_cache.get(key)
+        if entry is not None:
+            _mask_cache.move_to_end(key)
+            return entry
+
+    if GLYPH_ALPHABET.issuperset(text):
+        entry = glyph_atlas(font, stroke_width).mask(text)
+    else:
+        entry = _render_mask(font, text, stroke_width)
+    size = entry[0].width * entry[0].height if entry[0] is not None else 0
+
+    with _mask_lock:
+        if key not in _mask_cache:
+            _mask_cache[key] = entry
+            _mask_cache_bytes += size
+            while _mask_cache_bytes > TEXT_MASK_CACHE_BYTES and len(_mask_cache) > 1:
+                _, (old, _) = _mask_cache.popitem(last=False)
+                if old is not None:
+                    _mask_cache_bytes -= old.width * old.height
+    return entry
+
+
+def clear_text_mask_cache():
+    global _mask_cache_bytes
+    with _mask_lock:
+        _mask_cache.clear()
+        _mask_cache_bytes = 0
+
+
+def draw_text(draw, xy, text, font, fill, stroke_width=0, stroke_fill=None):
+    # Same pixels as draw.text. Number strings and outlined text come from the
+    # cache, plain text and anything the masks can't reproduce exactly go to
+    # draw.text.
+    x, y = xy
+    if (
+        not isinstance(font, ImageFont.FreeTypeFont)
+        or not isinstance(x, int)
+        or not isinstance(y, int)
+        or draw.fontmode != "L"
+        or not (stroke_width or GLYPH_ALPHABET.issuperset(text))
+    ):
+        draw.text(
+            xy,
+            text,
+            font=font,
+            fill=fill,
+            stroke_width=stroke_width,
+            stroke_fill=stroke_fill,
+        )
+        return
+
+    if stroke_width:
+        mask, offset = text_mask(font, text, stroke_width)
+        if mask is not None:
+            draw.bitmap(
+                (x + offset[0], y + offset[1]),
+                mask,
+                fill=fill if stroke_fill is None else stroke_fill,
+            )
+        if stroke_fill is None or stroke_fill == fill:
+            return
+    mask, offset = text_mask(font, text)
+    if mask is not None:
+        draw.bitmap((x + offset[0], y + offset[1]), mask, fill=fill)
@@ -0,0 +1,929 @@
+import math
+import os
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+from shared.colors import format_blind_evaluation
+
+BUNDLED_FONT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "assets",
+    "LiberationSans",
+    "LiberationSans-Bold.ttf",
+)
+
+# --------------------- Fonts & measuring --------------------------
+
+
+@lru_cache(maxsize=64)
+def truetype(path, size):
+    return ImageFont.truetype(path, size)
+
+
+def load_font(font_path, size):
+    if font_path:
+        try:
+            return truetype(font_path, size)
+        except Exception:
+            pass
+    try:
+        return truetype(BUNDLED_FONT_PATH, size)
+    except Exception:
+        return ImageFont.load_default()
+
+
+_measure_draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+
+@lru_cache(maxsize=16384)
+def text_bbox(font, text, stroke_width=0):
+    return _measure_draw.textbbox((0, 0), text, font=font, stroke_width=stroke_width)
+
+
+def text_width(font, text, stroke_width=0):
+    return text_bbox(font, text, stroke_width)[2]
+
+
+@lru_cache(maxsize=256)
+def font_height(font):
+    a, d = font.getmetrics()
+    return a + d
+
+
+def clear_measure_cache():
+    text_bbox.cache_clear()
+    font_height.cache_clear()
+    with _layout_lock:
+        _layout_cache.clear()
+
+
+# --------------------- Layout memo --------------------------
+
+# Layouts are reused as long as their signature matches. Cell contents only
+# enter the signature through their width class, where digits that measure
+# the same as "0" count as "0". Which digits those are is checked per font:
+# all of them in fonts with tabular figures (at most sizes the bundled one
+# kerns "11", so "1" stays apart there), none in proportional fonts. A value
+# that grows past its slot changes the class and forces a relayout.
+
+LAYOUT_CACHE_SIZE = 64
+
+_layout_cache = OrderedDict()
+_layout_lock = threading.Lock()
+# Anything that can stand next to a digit in a cell.
+_DIGIT_NEIGHBOURS = [chr(c) for c in range(32, 127)]
+
+
+@lru_cache(maxsize=256)
+def _digit_class(font):
+    # A digit is as wide as "0" next to every character, so kerning doesn't
+    # tell them apart either. Pair kerning adds up pair by pair, so any number
+    # of these digits can be swapped for "0" at once.
+    same = ""
+    try:
+        for d in "123456789":
+            if all(
+                font.getlength(c + d) == font.getlength(c + "0")
+                and font.getlength(d + c) == font.getlength("0" + c)
+                for c in _DIGIT_NEIGHBOURS
+            ):
+                same += d
+    except Exception:
+        same = ""
+    return str.maketrans(same, "0" * len(same))
+
+
+def width_class(font, text):
+    return text.translate(_digit_class(font)) if text else ""
+
+
+def width_classes(font, texts):
+    return tuple(sorted({width_class(font, t) for t in texts}))
+
+
+def _memo_layout(key, build):
+    with _layout_lock:
+        lay = _layout_cache.get(key)
+        if lay is not None:
+            _layout_cache.move_to_end(key)
+            return lay
+    lay = build()
+    with _layout_lock:
+        _layout_cache[key] = lay
+        if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return lay
+
+
+# --------------------- Shared data model --------------------------
+
+
+def overworld_coords(cx, cz, ow_coords_format):
+    if ow_coords_format == "chunk":
+        return cx, cz
+    if ow_coords_format == "eight_eight":
+        return cx * 16 + 8, cz * 16 + 8
+    return cx * 16 + 4, cz * 16 + 4
+
+
+def stronghold_angles(cx, cz, player_x, player_z, h_ang, in_nether):
+    sx = cx * 16 + 4
+    sz = cz * 16 + 4
+    if in_nether:
+        sx /= 8.0
+        sz /= 8.0
+        px, pz = player_x / 8.0, player_z / 8.0
+    else:
+        px, pz = player_x, player_z
+    dx, dz = sx - px, sz - pz
+    tgt = (math.degrees(math.atan2(dz, dx)) + 270) % 360
+    signed = ((tgt + 180) % 360) - 180
+    turn = ((tgt - (h_ang % 360) + 180) % 360) - 180
+    return signed, turn
+
+
+def blind_lines(blind_result):
+    evaluation = blind_result.get("evaluation", "")
+    x_nether = blind_result.get("xInNether", 0)
+    z_nether = blind_result.get("zInNether", 0)
+    highroll_prob = blind_result.get("highrollProbability", 0) * 100
+    highroll_thresh = blind_result.get("highrollThreshold", 400)
+    improve_dir = blind_result.get("improveDirection", 0)
+    improve_dist = blind_result.get("improveDistance", 0)
+    return {
+        "evaluation": evaluation,
+        "prefix": f"Blind coords ({round(x_nether)}, {round(z_nether)}) are ",
+        "eval_text": format_blind_evaluation(evaluation),
+        "pct": f"{highroll_prob:.1f}%",
+        "post": f" chance of <{int(highroll_thresh)} block blind",
+        "improve": f"Head {math.degrees(improve_dir):.0f}°, {round(improve_dist)} blocks away, for better coords.",
+    }
+
+
+# --------------------- Default (Ninjabrain Bot style) overlay --------------------------
+
+NB_CELL_PAD_MAIN = 3
+NB_CELL_PAD_THROW = 14
+NB_HDR_SEP = 1
+NB_ROW_SEP = 1
+
+NB_FAILED_LINES = [
+    "Could not determine the stronghold chunk.",
+    "",
+    "You probably misread one of the eyes.",
+]
+
+NB_INFO_TYPES = (
+    "PORTAL_LINKING",
+    "NEXT_THROW_DIRECTION",
+    "MISMEASURE",
+    "COMBINED_CERTAINTY",
+)
+NB_TWO_LINE_INFO_TYPES = (
+    "NEXT_THROW_DIRECTION",
+    "MISMEASURE",
+    "PORTAL_LINKING",
+    "COMBINED_CERTAINTY",
+)
+
+NB_THROW_HEADERS = ["x", "z", "Angle", "Error"]
+
+_NB_REP_LOC = f"({12345}, {12345})"
+_NB_REP_SAMPLES = {
+    "loc": _NB_REP_LOC,
+    "cert": "100.0%",
+    "dist": "10000",
+    "nether": _NB_REP_LOC,
+    "angle": "180.0 (-> 180.0)",
+}
+_NB_REP_THROW_SAMPLES = ["12345.67", "12345.67", "180.0", "0.0000"]
+
+
+def nb_fonts(font_size, font_path=""):
+    small_size = max(8, int(font_size * 0.85))
+    body = load_font(font_path, font_size)
+    small = load_font(font_path, small_size)
+    return {
+        "hdr": body,
+        "body": body,
+        "small": small,
+        "warn": small,
+        "title": load_font(font_path, max(10, int(font_size * 1.05))),
+        "version": small,
+    }
+
+
+def nb_rows(preds, player_x, player_z, h_ang, in_nether, ow_coords_format):
+    show_angle = h_ang is not None and player_x is not None and player_z is not None
+    rows = []
+    for pred in preds[:5]:
+        cx, cz = pred.get("chunkX"), pred.get("chunkZ")
+        cert = pred.get("certainty")
+        dist = pred.get("overworldDistance")
+        if None in (cx, cz, cert, dist):
+            continue
+
+        angle_str = None
+        dir_val = None
+        if show_angle:
+            signed, turn = stronghold_angles(cx, cz, player_x, player_z, h_ang, in_nether)
+            angle_str = f"{signed:.2f}"
+            dir_val = turn
+
+        rows.append(
+            {
+                "loc": overworld_coords(cx, cz, ow_coords_format),
+                "cert_pct": cert * 100,
+                "dist": int(dist / 8) if in_nether else int(dist),
+                "nether": (round((cx * 16 + 4) / 8), round((cz * 16 + 4) / 8)),
+                "angle": angle_str,
+                "dir": dir_val,
+            }
+        )
+    return rows
+
+
+def nb_angle_cell(row):
+    base = row["angle"]
+    if row["dir"] is None:
+        return base, ""
+    arrow = "->" if row["dir"] > 0 else "<-"
+    return base, f" ({arrow} {abs(row['dir']):.1f})"
+
+
+def nb_throw_rows(eye_throws, show_adj_count):
+    adj_count_by_throw = {}
+    if show_adj_count and eye_throws:
+        for throw_idx, throw in enumerate(eye_throws):
+            angle_without = throw.get("angleWithoutCorrection", 0.0) or 0.0
+            increments = throw.get("correctionIncrements", 0) or 0
+            if increments != 0:
+                sign = "+" if increments >= 0 else ""
+                adj_count_by_throw[throw_idx] = (
+                    f"{angle_without:.2f}",
+                    f"{sign}{increments}",
+                    increments,
+                )
+            else:
+                adj_count_by_throw[throw_idx] = (f"{angle_without:.2f}", None, None)
+
+    throw_rows = []
+    for ti, t in enumerate(eye_throws):
+        if show_adj_count and ti in adj_count_by_throw:
+            aw_str, cnt_str, _ = adj_count_by_throw[ti]
+            angle_cell = aw_str + (cnt_str if cnt_str else "")
+        else:
+            angle_cell = f"{t.get('angleWithoutCorrection', 0.0):.2f}"
+
+        x_val = t.get("xInOverworld", 0.0) or 0.0
+        z_val = t.get("zInOverworld", 0.0) or 0.0
+
+        throw_rows.append(
+            (
+                f"{float(x_val):.2f}",
+                f"{float(z_val):.2f}",
+                angle_cell,
+                f"{t.get('error', 0.0):.4f}",
+            )
+        )
+    return throw_rows, adj_count_by_throw
+
+
+def nb_model(
+    preds,
+    eye_throws,
+    player_x,
+    player_z,
+    h_ang,
+    in_nether,
+    ow_coords_format,
+    show_adj_count,
+    blind_result=None,
+    failed=False,
+    force_empty=False,
+    info_messages=None,
+):
+    show_angle = h_ang is not None and player_x is not None and player_z is not None
+    rows = nb_rows(preds, player_x, player_z, h_ang, in_nether, ow_coords_format)
+
+    hide_row_dividers = blind_result is not None or failed
+    if not rows and not hide_row_dividers and not force_empty:
+        return None
+    num_display_rows = max(len(rows), 5) if hide_row_dividers else len(rows)
+    if force_empty:
+        num_display_rows = 5
+
+    col_keys = ["loc", "cert", "dist", "nether"]
+    hdr_labels = {
+        "loc": "Chunk" if ow_coords_format == "chunk" else "Location",
+        "cert": "%",
+        "dist": "Dist.",
+        "nether": "Nether",
+    }
+    if show_angle or force_empty:
+        col_keys.append("angle")
+        hdr_labels["angle"] = "Angle"
+
+    throw_rows, adj_count_by_throw = nb_throw_rows(eye_throws, show_adj_count)
+
+    return {
+        "rows": rows,
+        "show_angle": show_angle,
+        "ow_coords_format": ow_coords_format,
+        "col_keys": col_keys,
+        "hdr_labels": hdr_labels,
+        "hide_row_dividers": hide_row_dividers,
+        "num_display_rows": num_display_rows,
+        "throw_rows": throw_rows,
+        "adj_count_by_throw": adj_count_by_throw,
+        "show_adj_count": show_adj_count,
+        "blind": blind_lines(blind_result) if blind_result is not None else None,
+        "failed": failed,
+        "info_messages": [
+            m for m in (info_messages or []) if m.get("type") in NB_INFO_TYPES
+        ],
+    }
+
+
+def _nb_layout_key(model, fonts):
+    rows = model["rows"]
+    throw_rows = model["throw_rows"]
+    blind = model["blind"]
+    body, small = fonts["body"], fonts["small"]
+    return (
+        "nb",
+        fonts["hdr"],
+        fonts["small"],
+        fonts["title"],
+        fonts["warn"],
+        model["ow_coords_format"],
+        tuple(model["col_keys"]),
+        model["show_angle"],
+        model["hide_row_dividers"],
+        model["num_display_rows"],
+        model["failed"],
+        len(throw_rows),
+        tuple(m.get("type") for m in model["info_messages"]),
+        width_classes(body, (f"({r['loc'][0]}, {r['loc'][1]})" for r in rows)),
+        width_classes(body, (f"{r['cert_pct']:.1f}%" for r in rows)),
+        width_classes(body, (str(r["dist"]) for r in rows)),
+        width_classes(body, (f"({r['nether'][0]}, {r['nether'][1]})" for r in rows)),
+        width_classes(
+            body, ("".join(nb_angle_cell(r)) for r in rows if r["angle"] is not None)
+        ),
+        tuple(width_classes(small, (t[i] for t in throw_rows)) for i in range(4)),
+        None
+        if blind is None
+        else (
+            width_class(body, blind["prefix"]),
+            blind["eval_text"],
+            width_class(body, blind["pct"]),
+            width_class(body, blind["post"]),
+            width_class(body, blind["improve"]),
+        ),
+    )
+
+
+def layout_nb(model, fonts):
+    return _memo_layout(
+        _nb_layout_key(model, fonts), lambda: _build_nb_layout(model, fonts)
+    )
+
+
+def _build_nb_layout(model, fonts):
+    hdr_font = fonts["hdr"]
+    body_font = fonts["body"]
+    small_font = fonts["small"]
+    pad = NB_CELL_PAD_MAIN * 2
+    throw_pad = NB_CELL_PAD_THROW * 2
+
+    col_keys = model["col_keys"]
+    hdr_labels = model["hdr_labels"]
+
+    new_header_h = font_height(fonts["title"]) + 8
+    body_h = font_height(body_font) + 4
+    throw_body_h = font_height(body_font) + 2
+    hdr_h = font_height(hdr_font) + 4
+    small_h = font_height(small_font) + 2
+
+    if model["ow_coords_format"] == "chunk":
+        loc_sample = f"({-999}, {-999})"
+    else:
+        loc_sample = _NB_REP_LOC
+    col_widths = {}
+    for key in col_keys:
+        sample = loc_sample if key == "loc" else _NB_REP_SAMPLES.get(key, "")
+        col_widths[key] = max(
+            text_width(hdr_font, hdr_labels[key]) + pad,
+            text_width(hdr_font, sample) + pad,
+        )
+
+    for r in model["rows"]:
+        col_widths["loc"] = max(
+            col_widths["loc"],
+            text_width(body_font, f"({r['loc'][0]}, {r['loc'][1]})") + pad,
+        )
+        col_widths["cert"] = max(
+            col_widths["cert"], text_width(body_font, f"{r['cert_pct']:.1f}%") + pad
+        )
+        col_widths["dist"] = max(
+            col_widths["dist"], text_width(body_font, str(r["dist"])) + pad
+        )
+        col_widths["nether"] = max(
+            col_widths["nether"],
+            text_width(body_font, f"({r['nether'][0]}, {r['nether'][1]})") + pad,
+        )
+        if model["show_angle"] and r["angle"] is not None:
+            base, dir_part = nb_angle_cell(r)
+            col_widths["angle"] = max(
+                col_widths.get("angle", 0), text_width(body_font, base + dir_part) + pad
+            )
+
+    throw_nat = [text_width(small_font, h) + throw_pad for h in NB_THROW_HEADERS]
+    for trow in model["throw_rows"]:
+        for i, cell in enumerate(trow):
+            throw_nat[i] = max(throw_nat[i], text_width(small_font, cell) + throw_pad)
+
+    min_text_w = 0
+    blind = model["blind"]
+    if blind is not None:
+        min_text_w = (
+            max(
+                text_width(body_font, blind["prefix"])
+                + text_width(body_font, blind["eval_text"]),
+                text_width(body_font, blind["pct"])
+                + text_width(body_font, blind["post"]),
+                text_width(body_font, blind["improve"]),
+            )
+            + pad
+        )
+    elif model["failed"]:
+        min_text_w = (
+            max(text_width(body_font, line) for line in NB_FAILED_LINES if line) + pad
+        )
+
+    # Keep the window from jumping around: every column is at least as wide as
+    # a representative worst-case value.
+    calc_main_table_w = sum(
+        max(col_widths.get(key, 0), text_width(hdr_font, _NB_REP_SAMPLES[key]) + pad)
+        for key in col_keys
+    )
+    calc_throw_nat = [
+        max(text_width(small_font, h) + throw_pad, text_width(small_font, s) + throw_pad)
+        for h, s in zip(NB_THROW_HEADERS, _NB_REP_THROW_SAMPLES)
+    ]
+
+    img_w = max(
+        sum(col_widths[k] for k in col_keys),
+        sum(throw_nat),
+        min_text_w,
+        calc_main_table_w,
+        sum(calc_throw_nat),
+    )
+
+    current_main_w = sum(col_widths[k] for k in col_keys)
+    if current_main_w < img_w:
+        extra = img_w - current_main_w
+        expand_keys = [k for k in col_keys if k != "angle"] or col_keys
+        per_col = extra // len(expand_keys)
+        for k in expand_keys:
+            col_widths[k] += per_col
+        col_widths[expand_keys[-1]] += img_w - sum(col_widths[k] for k in col_keys)
+
+    leftover = max(0, img_w - sum(throw_nat))
+    outer_bonus = int(leftover * 0.20)
+    centre_bonus = int(leftover * 0.30)
+    throw_col_widths = list(throw_nat)
+    throw_col_widths[0] += outer_bonus
+    throw_col_widths[1] += centre_bonus
+    throw_col_widths[2] += centre_bonus
+    throw_col_widths[3] += outer_bonus
+    throw_total = sum(throw_col_widths)
+    if throw_total < img_w:
+        diff = img_w - throw_total
+        throw_col_widths[0] += diff // 4
+        throw_col_widths[1] += diff // 4
+        throw_col_widths[2] += diff // 4
+        throw_col_widths[3] += img_w - throw_total - 3 * (diff // 4)
+
+    row_slot = body_h + (NB_ROW_SEP if not model["hide_row_dividers"] else 0)
+    row_area_y = new_header_h + NB_HDR_SEP + NB_HDR_SEP + hdr_h + NB_HDR_SEP
+    main_h = row_area_y + model["num_display_rows"] * row_slot
+
+    warn_text_h = font_height(fonts["warn"])
+    info_heights = []
+    for m in model["info_messages"]:
+        if m.get("type") in NB_TWO_LINE_INFO_TYPES:
+            info_heights.append(warn_text_h * 2 + 4 + 6)
+        else:
+            info_heights.append(warn_text_h + 6)
+    info_area_y = main_h
+    if info_heights:
+        main_h += sum(info_heights) + NB_ROW_SEP * len(info_heights)
+
+    num_throw_rows = max(len(model["throw_rows"]), 3)
+    throw_h = (
+        NB_HDR_SEP
+        + hdr_h
+        + small_h
+        + NB_HDR_SEP
+        + num_throw_rows * (throw_body_h + NB_ROW_SEP)
+    )
+
+    return {
+        "img_w": img_w,
+        "img_h": main_h + throw_h,
+        "new_header_h": new_header_h,
+        "body_h": body_h,
+        "throw_body_h": throw_body_h,
+        "hdr_h": hdr_h,
+        "small_h": small_h,
+        "warn_text_h": warn_text_h,
+        "col_widths": col_widths,
+        "throw_col_widths": throw_col_widths,
+        "row_slot": row_slot,
+        "row_area_y": row_area_y,
+        "info_area_y": info_area_y,
+        "info_heights": info_heights,
+        "main_h": main_h,
+        "num_throw_rows": num_throw_rows,
+    }
+
+
+# --------------------- Custom (minimal) overlay --------------------------
+
+CUSTOM_HEADER_LABELS = {
+    "distance": "Dist.",
+    "certainty_percentage": "%",
+    "angle": "Angle",
+    "overworld_coords": "Location",
+    "nether_coords": "Nether",
+}
+
+
+def custom_fonts(font_size, font_path=""):
+    return {
+        "main": load_font(font_path, font_size),
+        "small": load_font(font_path, max(8, int(font_size * 0.90))),
+    }
+
+
+def portal_link_flags(preds, eye_throws, enabled):
+    if not (enabled and eye_throws):
+        return [False] * len(preds)
+    ft = eye_throws[0]
+    approx_nx = (ft.get("xInOverworld") or 0.0) / 8.0
+    approx_nz = (ft.get("zInOverworld") or 0.0) / 8.0
+    flags = []
+    for pred in preds:
+        best_nx = pred.get("chunkX", 0) * 16 / 8.0 + 0.5
+        best_nz = pred.get("chunkZ", 0) * 16 / 8.0 + 0.5
+        flags.append(max(abs(approx_nx - best_nx), abs(approx_nz - best_nz)) < 24)
+    return flags
+
+
+def custom_lines(custom, preds, eye_throws, player_x, player_z, h_ang, in_nether):
+    shown_count = custom.get("shown_measurements", 5)
+    order = custom.get("text_order", [])
+    enabled = custom.get("text_enabled", {})
+    ow_coords_format = custom.get("overworld_coords_format", "four_four")
+    show_coords_by_dim = custom.get("show_coords_based_on_dimension", True)
+    angle_display_mode = custom.get("angle_display_mode", "angle_and_change")
+
+    preds = preds[:shown_count]
+    flags = portal_link_flags(
+        preds, eye_throws, custom.get("portal_nether_color_enabled", True)
+    )
+
+    lines = []
+    for pred_idx, pred in enumerate(preds):
+        cx, cz = pred.get("chunkX"), pred.get("chunkZ")
+        cert = pred.get("certainty")
+        dist = pred.get("overworldDistance")
+        if None in (cx, cz, cert, dist):
+            continue
+
+        parts = []
+        for key in order:
+            if not enabled.get(key, True):
+                continue
+
+            if key == "distance":
+                d = dist / 8 if in_nether else dist
+                parts.append(("distance", (str(int(d)), d)))
+
+            elif key == "certainty_percentage":
+                pct = round(cert * 100, 1)
+                parts.append(("certainty", f"{pct}%"))
+
+            elif key == "angle" and None not in (h_ang, player_x, player_z):
+                signed, turn = stronghold_angles(
+                    cx, cz, player_x, player_z, h_ang, in_nether
+                )
+                if angle_display_mode in ("angle_and_change", "angle_only"):
+                    parts.append(("text", f"{signed:.2f}"))
+                if angle_display_mode in ("angle_and_change", "change_only"):
+                    arrow = "->" if turn > 0 else "<-"
+                    parts.append(("angle_change", (arrow, f"{abs(turn):.1f}")))
+
+            elif key == "overworld_coords":
+                ox, oz = overworld_coords(cx, cz, ow_coords_format)
+                if show_coords_by_dim and in_nether:
+                    ox, oz = round(ox / 8), round(oz / 8)
+                parts.append(("coords", (ox, oz)))
+
+            elif key == "nether_coords":
+                nx, nz = cx * 16 + 4, cz * 16 + 4
+                if not (show_coords_by_dim and not in_nether):
+                    nx, nz = round(nx / 8), round(nz / 8)
+                parts.append(("nether_coords_val", (nx, nz)))
+        if parts:
+            lines.append((parts, flags[pred_idx] if pred_idx < len(flags) else False))
+    return lines
+
+
+def custom_bottom_rows(custom, eye_throws):
+    adj_rows = []
+    error_rows = []
+    for throw in eye_throws or []:
+        if custom.get("show_angle_adjustment_count", False):
+            angle_without = throw.get("angleWithoutCorrection", 0.0)
+            increments = throw.get("correctionIncrements", 0) or 0
+            if increments != 0:
+                sign = "+" if increments >= 0 else ""
+                adj_rows.append(
+                    (f"{angle_without:.2f}", f"{sign}{increments}", increments)
+                )
+            else:
+                adj_rows.append((f"{angle_without:.2f}", None, None))
+        if custom.get("show_angle_error", False):
+            error_val = throw.get("error", None)
+            if error_val is not None:
+                error_rows.append((f"{error_val:.4f}",))
+    return adj_rows, error_rows
+
+
+def custom_item_text(kind, val):
+    if kind == "distance":
+        return val[0] if isinstance(val, tuple) else str(val)
+    if kind in ("coords", "nether_coords_val"):
+        return f"({val[0]}, {val[1]})"
+    if kind == "angle_change":
+        return f"({val[0]} {val[1]})"
+    return str(val)
+
+
+def custom_item_width(font, kind, val, stroke_width=0):
+    if kind in ("coords", "nether_coords_val"):
+        cx_v, cz_v = val
+        return sum(
+            text_width(font, p, stroke_width)
+            for p in ("(", str(cx_v), ", ", str(cz_v), ")")
+        )
+    return text_width(font, custom_item_text(kind, val), stroke_width)
+
+
+def custom_key_slots(visible_keys, angle_display_mode):
+    key_slots = {}
+    slot = 0
+    for key in visible_keys:
+        if key == "angle":
+            slots = []
+            if angle_display_mode in ("angle_and_change", "angle_only"):
+                slots.append(slot)
+                slot += 1
+            if angle_display_mode in ("angle_and_change", "change_only"):
+                slots.append(slot)
+                slot += 1
+            key_slots[key] = slots
+        else:
+            key_slots[key] = [slot]
+            slot += 1
+    return key_slots
+
+
+def _custom_layout_key(custom, lines, adj_rows, error_rows, fonts, stroke_width):
+    font, small = fonts["main"], fonts["small"]
+    slots = []
+    for parts, _plink in lines:
+        for slot_idx, (kind, val) in enumerate(parts):
+            if slot_idx >= len(slots):
+                slots.append(set())
+            slots[slot_idx].add(width_class(font, custom_item_text(kind, val)))
+    return (
+        "custom",
+        fonts["main"],
+        fonts["small"],
+        stroke_width,
+        tuple(custom.get("text_order", [])),
+        tuple(sorted(custom.get("text_enabled", {}).items())),
+        tuple(sorted(custom.get("text_header", {}).items())),
+        custom.get("angle_display_mode", "angle_and_change"),
+        custom.get("overworld_coords_format", "four_four"),
+        custom.get("show_overlay_header", False),
+        len(lines),
+        tuple(tuple(sorted(slot)) for slot in slots),
+        tuple(
+            (kind, width_class(font, custom_item_text(kind, val)))
+            for parts, _plink in lines[-1:]
+            for kind, val in parts
+        ),
+        tuple(
+            (width_class(small, a), width_class(small, c)) for a, c, _raw in adj_rows
+        ),
+        tuple(width_class(small, e[0]) for e in error_rows),
+    )
+
+
+def layout_custom(custom, lines, adj_rows, error_rows, fonts, stroke_width=0):
+    lay = _memo_layout(
+        _custom_layout_key(custom, lines, adj_rows, error_rows, fonts, stroke_width),
+        lambda: _build_custom_layout(
+            custom, lines, adj_rows, error_rows, fonts, stroke_width
+        ),
+    )
+    # Only positions are shared between frames, the texts are always current.
+    bottom_items = []
+    for kind, oi, bx, by in lay["bottom_slots"]:
+        if kind == "error":
+            bottom_items.append((kind, error_rows[oi][0], bx, by, None))
+        elif kind == "count":
+            bottom_items.append((kind, adj_rows[oi][1], bx, by, adj_rows[oi][2]))
+        else:
+            bottom_items.append((kind, adj_rows[oi][0], bx, by, None))
+    return dict(lay, bottom_items=bottom_items)
+
+
+def _build_custom_layout(custom, lines, adj_rows, error_rows, fonts, stroke_width):
+    font = fonts["main"]
+    small_font = fonts["small"]
+    order = custom.get("text_order", [])
+    enabled = custom.get("text_enabled", {})
+    text_header = custom.get("text_header", {})
+    angle_display_mode = custom.get("angle_display_mode", "angle_and_change")
+    ow_coords_format = custom.get("overworld_coords_format", "four_four")
+    show_overlay_header = custom.get("show_overlay_header", False)
+
+    line_h = font_height(font) + 6
+    has_header = any(
+        text_header.get(k, "Text") == "Text" for k in order if enabled.get(k, True)
+    )
+    header_h = line_h if has_header else 0
+
+    n_bottom_rows = max(len(adj_rows), len(error_rows))
+    small_line_h = font_height(small_font) + 4
+    overlay_header_h = (
+        small_line_h if (show_overlay_header and n_bottom_rows > 0) else 0
+    )
+    bottom_extra_h = (
+        (overlay_header_h + (small_line_h - 2) * n_bottom_rows + 4)
+        if n_bottom_rows > 0
+        else 0
+    )
+    height = header_h + line_h * len(lines) + 10 + bottom_extra_h
+
+    col_widths = []
+    for parts, _plink in lines:
+        for slot_idx, (kind, val) in enumerate(parts):
+            w = custom_item_width(font, kind, val, stroke_width) + 14
+            if slot_idx >= len(col_widths):
+                col_widths.append(w)
+            else:
+                col_widths[slot_idx] = max(col_widths[slot_idx], w)
+
+    col_x = []
+    cx_acc = 10
+    for w in col_widths:
+        col_x.append(cx_acc)
+        cx_acc += w
+    width = int(10 + sum(col_widths) + 10 + 10)
+
+    headers = []
+    if has_header:
+        visible_keys = [k for k in order if enabled.get(k, True)]
+        key_slots = custom_key_slots(visible_keys, angle_display_mode)
+        for key in visible_keys:
+            if text_header.get(key, "Text") != "Text":
+                continue
+            slots = key_slots.get(key, [])
+            if not slots:
+                continue
+            first_slot = slots[0]
+            last_slot = slots[-1]
+            if first_slot >= len(col_x) or last_slot >= len(col_widths):
+                continue
+            hdr_txt = CUSTOM_HEADER_LABELS.get(key, "")
+            if key == "overworld_coords" and ow_coords_format == "chunk":
+                hdr_txt = "Chunk"
+            if not hdr_txt:
+                continue
+            tw_val = text_width(font, hdr_txt, stroke_width)
+            if key == "angle" and angle_display_mode == "angle_and_change":
+                hx = col_x[last_slot] + (col_widths[last_slot] - tw_val) // 2
+            else:
+                span_start = col_x[first_slot]
+                span_end = col_x[last_slot] + col_widths[last_slot]
+                hx = span_start + (span_end - span_start - tw_val) // 2
+            headers.append((hdr_txt, hx))
+
+    # The bottom rows hang off the horizontal extent of the last visible line.
+    actual_left = actual_right = None
+    for parts, _plink in lines[-1:]:
+        for slot_idx, (kind, val) in enumerate(parts):
+            if slot_idx >= len(col_x) or slot_idx >= len(col_widths):
+                continue
+            if kind == "angle_change":
+                arrow, num = val
+                txt_w = text_width(font, arrow) + 4 + text_width(font, num)
+            else:
+                txt_w = text_width(font, custom_item_text(kind, val))
+            cs = col_x[slot_idx] + (col_widths[slot_idx] - txt_w) // 2
+            ce = cs + txt_w
+            actual_left = cs if actual_left is None else min(actual_left, cs)
+            actual_right = ce if actual_right is None else max(actual_right, ce)
+    if actual_left is None:
+        actual_left = 10
+    if actual_right is None:
+        actual_right = 10
+
+    bottom_slots = []
+    bottom_headers = []
+    if n_bottom_rows > 0:
+        base_y = header_h + line_h * len(lines) + 10
+        first_err_x = first_err_w = first_adj_x = first_adj_total_w = None
+        for oi in range(n_bottom_rows):
+            row_y = base_y + overlay_header_h + oi * (small_line_h - 2) - 2
+            if oi < len(adj_rows):
+                angle_txt, count_txt, adj_raw = adj_rows[oi]
+                angle_w = text_width(small_font, angle_txt, stroke_width)
+                count_w = (
+                    text_width(small_font, count_txt, stroke_width) if count_txt else 0
+                )
+                total_w = angle_w + count_w
+                if oi == 0:
+                    adj_x = actual_right - total_w
+                    first_adj_x = adj_x
+                    first_adj_total_w = total_w
+                else:
+                    adj_x = first_adj_x + (first_adj_total_w - total_w) // 2
+                bottom_slots.append(("angle", oi, adj_x, row_y))
+                if count_txt:
+                    bottom_slots.append(("count", oi, adj_x + angle_w, row_y))
+            if oi < len(error_rows):
+                err_txt = error_rows[oi][0]
+                err_txt_w = text_width(small_font, err_txt, stroke_width)
+                if oi == 0:
+                    err_x = actual_left
+                    first_err_x = err_x
+                    first_err_w = err_txt_w
+                else:
+                    err_x = first_err_x + (first_err_w - err_txt_w) // 2
+                bottom_slots.append(("error", oi, err_x, row_y))
+
+        if show_overlay_header:
+            hdr_y = base_y - 2
+            if error_rows and first_err_x is not None:
+                w_e = text_width(small_font, "Error", stroke_width)
+                bottom_headers.append(
+                    ("Error", first_err_x + (first_err_w - w_e) // 2, hdr_y)
+                )
+            if adj_rows and first_adj_x is not None:
+                w_a = text_width(small_font, "Angle", stroke_width)
+                bottom_headers.append(
+                    ("Angle", first_adj_x + (first_adj_total_w - w_a) // 2, hdr_y)
+                )
+
+    return {
+        "width": width,
+        "height": height,
+        "line_h": line_h,
+        "header_h": header_h,
+        "col_x": col_x,
+        "col_widths": col_widths,
+        "headers": headers,
+        "bottom_slots": bottom_slots,
+        "bottom_headers": bottom_headers,
+    }
+
+
+def layout_custom_blind(lines, font, stroke_width=0):
+    w_pre = text_width(font, lines["prefix"], stroke_width)
+    w_pct = text_width(font, lines["pct"], stroke_width)
+    max_w = max(
+        w_pre + text_width(font, lines["eval_text"], stroke_width),
+        w_pct + text_width(font, lines["post"], stroke_width),
+        text_width(font, lines["improve"], stroke_width),
+    )
+    line_h = font_height(font) + 6
+    pad = 10
+    return {
+        "width": int(max_w + 2 * pad),
+        "height": line_h * 3 + 20,
+        "pad": pad,
+        "line_h": line_h,
+        "w_prefix": w_pre,
+        "w_pct": w_pct,
+    }
@@ -0,0 +1,990 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+
+from shared.colors import (
+    alpha_byte,
+    blind_evaluation_color,
+    certainty_rgba,
+    gradient_rgba,
+    hex_to_rgb,
+    nb_certainty_rgba,
+    with_alpha,
+)
+from shared.glyphs import draw_text
+from shared.layout import (
+    BUNDLED_FONT_PATH,
+    NB_CELL_PAD_MAIN,
+    NB_FAILED_LINES,
+    NB_THROW_HEADERS,
+    NB_TWO_LINE_INFO_TYPES,
+    blind_lines,
+    custom_bottom_rows,
+    custom_fonts,
+    custom_lines,
+    font_height,
+    layout_custom,
+    layout_custom_blind,
+    layout_nb,
+    load_font,
+    nb_fonts,
+    nb_model,
+    text_bbox,
+    text_width,
+    truetype,
+)
+
+# Overlay renderers used by both the tracker and the Customizer previews. They
+# only take data and settings and return a PIL image; the tracker decides when
+# to render and where the frame goes.
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+NB_BG = (55, 60, 66, 255)
+NB_HEADER_BG = (45, 50, 56, 255)
+NB_HEADER_FG = (229, 229, 229)
+NB_ROW_BG = (55, 60, 66, 255)
+NB_TEXT = (255, 255, 255)
+NB_THROW_HEADER_FG = (192, 192, 192)
+NB_TITLE_BG = (0x21, 0x25, 0x29)
+NB_VERSION_FG = (0x80, 0x80, 0x80)
+
+NB_HDR_SEP_COLOR = (33, 37, 41, 255)
+NB_ROW_SEP_COLOR = (42, 46, 50, 255)
+
+ADJ_COUNT_POSITIVE = (117, 204, 108)
+ADJ_COUNT_NEGATIVE = (204, 110, 114)
+
+BOAT_ICONS = {
+    "VALID": "boat_green_icon.png",
+    "ERROR": "boat_red_icon.png",
+    "MEASURING": "boat_blue_icon.png",
+    "NONE": "boat_gray_icon.png",
+}
+
+# Where a two line information message is wrapped, the line break goes right
+# after the marker.
+INFO_SPLIT_MARKERS = {
+    "NEXT_THROW_DIRECTION": "after next",
+    "MISMEASURE": "mismeasured or",
+    "PORTAL_LINKING": "due to",
+    "COMBINED_CERTAINTY": "stronghold (it",
+}
+
+
+def no_stage(name):
+    return nullcontext()
+
+
+# --------------------- Helpers --------------------------
+
+
+def apply_img_opacity(img, op):
+    if op >= 1.0:
+        return img
+    img = img.convert("RGBA")
+    _a = img.split()[-1].point(lambda i: int(i * op))
+    img.putalpha(_a)
+    return img
+
+
+def load_icon(filename, size, opacity=1.0):
+    with Image.open(os.path.join(ASSETS_DIR, filename)) as icon:
+        icon = icon.convert("RGBA").resize(size, Image.Resampling.LANCZOS)
+    return apply_img_opacity(icon, opacity)
+
+
+# Shared between frames, callers must not draw on it.
+@lru_cache(maxsize=32)
+def cached_icon(filename, size, opacity=1.0):
+    return load_icon(filename, size, opacity)
+
+
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_CERTAINTY_PCT_RE = re.compile(r"(\d+\.?\d*%)")
+
+
+def strip_html(text):
+    return _HTML_TAG_RE.sub("", text)
+
+
+def split_info_message(msg_type, text):
+    marker = INFO_SPLIT_MARKERS.get(msg_type)
+    if marker is None:
+        return text, None
+    idx = text.find(marker)
+    if idx != -1:
+        split_pos = idx + len(marker)
+        line1 = text[:split_pos].rstrip()
+        line2 = text[split_pos:].lstrip()
+        if line2:
+            return line1, line2
+    return text, None
+
+
+_nb_font_missing_warned = False
+
+
+def load_nb_font(size):
+    global _nb_font_missing_warned
+    if os.path.isfile(BUNDLED_FONT_PATH):
+        try:
+            return truetype(BUNDLED_FONT_PATH, size)
+        except Exception:
+            pass
+    if not _nb_font_missing_warned:
+        print(
+            "ERROR: Could not find the bundled font at:\n"
+            f"  {BUNDLED_FONT_PATH}\n"
+            "The overlay text will use a fallback font and may look incorrect.\n"
+            "Please reinstall NBTrackr to restore the missing file."
+        )
+        _nb_font_missing_warned = True
+    return ImageFont.load_default()
+
+
+# --------------------- Information messages --------------------------
+
+# Each information message is parsed (tags stripped, wrapped, the certainty
+# picked out) and drawn once per distinct message and style, into a block as
+# wide as the overlay on the row background. Frames showing the same messages
+# paste the blocks, the row under a block is plain background so the pixels are
+# the same as drawing there.
+
+INFO_BLOCK_CACHE_SIZE = 32
+
+_info_block_cache = OrderedDict()
+_info_block_lock = threading.Lock()
+
+
+@lru_cache(maxsize=256)
+def parse_info_message(msg_type, message):
+    # Returns (line1, line2 or None, certainty span in line1 or None).
+    text = strip_html(message)
+    line1, line2 = text, None
+    if msg_type in NB_TWO_LINE_INFO_TYPES:
+        line1, line2 = split_info_message(msg_type, text)
+    pct_span = None
+    if line2 and msg_type == "COMBINED_CERTAINTY":
+        pct_match = _CERTAINTY_PCT_RE.search(line1)
+        if pct_match:
+            pct_span = pct_match.span(1)
+    return line1, line2, pct_span
+
+
+def _render_info_block(severity, msg_type, message, font, size, text_opacity, bg):
+    width, height = size
+    block = Image.new("RGBA", size, bg)
+    draw = ImageDraw.Draw(block)
+    fg = with_alpha(NB_THROW_HEADER_FG, text_opacity)
+    text_h = font_height(font)
+    icon_size = int(text_h * 1.1)
+
+    icon_file = "info_icon.png" if severity == "INFO" else "warning_icon.png"
+    try:
+        icon_img = cached_icon(icon_file, (icon_size, icon_size), text_opacity)
+        block.alpha_composite(icon_img, (NB_CELL_PAD_MAIN, (height - icon_size) // 2))
+        text_x = NB_CELL_PAD_MAIN + icon_size + 8
+    except Exception:
+        text_x = NB_CELL_PAD_MAIN
+
+    line1, line2, pct_span = parse_info_message(msg_type, message)
+    if not line2:
+        draw.text((text_x, (height - text_h) // 2), line1, font=font, fill=fg)
+        return block
+
+    line_gap = 4
+    text_y1 = (height - (text_h * 2 + line_gap)) // 2
+    text_y2 = text_y1 + text_h + line_gap
+    if pct_span:
+        start, end = pct_span
+        pct_str = line1[start:end]
+        try:
+            pct_color = nb_certainty_rgba(
+                float(pct_str.rstrip("%")), alpha_byte(text_opacity)
+            )
+        except Exception:
+            pct_color = fg
+        bx = text_x
+        for part, fill in (
+            (line1[:start], fg),
+            (pct_str, pct_color),
+            (line1[end:], fg),
+        ):
+            draw.text((bx, text_y1), part, font=font, fill=fill)
+            bx += text_width(font, part)
+    else:
+        draw.text((text_x, text_y1), line1, font=font, fill=fg)
+    draw.text((text_x, text_y2), line2, font=font, fill=fg)
+    return block
+
+
+def info_block(msg, font, size, text_opacity, bg):
+    severity = msg.get("severity", "WARNING")
+    key = (
+        severity,
+        msg.get("type", ""),
+        msg.get("message", ""),
+        font,
+        size,
+        text_opacity,
+        bg,
+    )
+    with _info_block_lock:
+        block = _info_block_cache.get(key)
+        if block is not None:
+            _info_block_cache.move_to_end(key)
+            return block
+    block = _render_info_block(*key)
+    with _info_block_lock:
+        _info_block_cache[key] = block
+        if len(_info_block_cache) > INFO_BLOCK_CACHE_SIZE:
+            _info_block_cache.popitem(last=False)
+    return block
+
+
+# --------------------- Default (Ninjabrain Bot style) overlay --------------------------
+
+
+def render_nb_stronghold(
+    preds,
+    eye_throws,
+    player_x,
+    player_z,
+    h_ang,
+    in_nether,
+    font_size,
+    neg_coords_enabled,
+    neg_coords_rgb,
+    ow_coords_format,
+    show_adj_count,
+    blind_result=None,
+    failed=False,
+    boat_state=None,
+    force_empty=False,
+    user_font_path="",
+    info_messages=None,
+    bg_opacity=1.0,
+    text_opacity=1.0,
+    version="",
+    stage=no_stage,
+):
+    with stage("layout"):
+        model = nb_model(
+            preds,
+            eye_throws,
+            player_x,
+            player_z,
+            h_ang,
+            in_nether,
+            ow_coords_format,
+            show_adj_count,
+            blind_result=blind_result,
+            failed=failed,
+            force_empty=force_empty,
+            info_messages=info_messages,
+        )
+        if model is None:
+            return None
+
+        fonts = nb_fonts(font_size, user_font_path)
+        lay = layout_nb(model, fonts)
+
+    def _bc(color):
+        return with_alpha(color[:3], bg_opacity)
+
+    def _tc(color):
+        return with_alpha(color[:3], text_opacity)
+
+    text_alpha = alpha_byte(text_opacity)
+
+    _NB_ROW_BG = _bc(NB_ROW_BG)
+    _NB_HEADER_BG = _bc(NB_HEADER_BG)
+    _NB_HDR_SEP = _bc(NB_HDR_SEP_COLOR)
+    _NB_ROW_SEP = _bc(NB_ROW_SEP_COLOR)
+    _NEW_HEADER_BG = _bc(NB_TITLE_BG)
+
+    _NB_TEXT = _tc(NB_TEXT)
+    _NB_THROW_HDR_FG = _tc(NB_THROW_HEADER_FG)
+    _NEW_HDR_VER_FG = _tc(NB_VERSION_FG)
+
+    hdr_font = fonts["hdr"]
+    body_font = fonts["body"]
+    small_font = fonts["small"]
+    portal_warn_font = fonts["warn"]
+    new_header_font = fonts["title"]
+    new_header_ver_font = fonts["version"]
+
+    def tw(text, fnt=body_font):
+        return text_width(fnt, text)
+
+    def th(fnt=body_font):
+        return font_height(fnt)
+
+    CELL_PAD_MAIN = NB_CELL_PAD_MAIN
+    HDR_SEP = 1
+    ROW_SEP = 1
+
+    rows = model["rows"]
+    show_angle = model["show_angle"]
+    col_keys = model["col_keys"]
+    hdr_labels = model["hdr_labels"]
+    hide_row_dividers = model["hide_row_dividers"]
+    num_display_rows = model["num_display_rows"]
+    throw_rows_data = model["throw_rows"]
+    adj_count_by_throw = model["adj_count_by_throw"]
+    blind = model["blind"]
+    _display_info_messages = model["info_messages"]
+    show_portal_warning = any(
+        m.get("type") == "PORTAL_LINKING" for m in _display_info_messages
+    )
+
+    img_w = lay["img_w"]
+    img_h = lay["img_h"]
+    new_header_h = lay["new_header_h"]
+    body_h = lay["body_h"]
+    throw_body_h = lay["throw_body_h"]
+    hdr_h = lay["hdr_h"]
+    small_h = lay["small_h"]
+    col_widths = lay["col_widths"]
+    throw_col_widths = lay["throw_col_widths"]
+    main_h = lay["main_h"]
+    num_throw_rows = lay["num_throw_rows"]
+
+    with stage("raster"):
+        img = Image.new("RGBA", (img_w, img_h), _NB_ROW_BG)
+        draw = ImageDraw.Draw(img)
+
+        draw.rectangle([0, 0, img_w - 1, new_header_h - 1], fill=_NEW_HEADER_BG)
+        nh_text_x = CELL_PAD_MAIN + 4
+        nh_text_y = (new_header_h - th(new_header_font)) // 2
+        draw.text((nh_text_x, nh_text_y), "NBTrackr", font=new_header_font, fill=_NB_TEXT)
+        ver_x = nh_text_x + tw("NBTrackr", new_header_font) + 8
+        a_title, d_title = new_header_font.getmetrics()
+        a_ver, d_ver = new_header_ver_font.getmetrics()
+
+        title_baseline = nh_text_y + a_title
+        ver_y = title_baseline - a_ver
+        try:
+            draw.text(
+                (ver_x, ver_y), version, font=new_header_ver_font, fill=_NEW_HDR_VER_FG
+            )
+        except Exception:
+            pass
+
+        _boat_icon_file = BOAT_ICONS.get(boat_state)
+        if _boat_icon_file:
+            try:
+                _icon_size = new_header_h - 8
+                _bicon = cached_icon(_boat_icon_file, (_icon_size, _icon_size), text_opacity)
+                _icon_x = img_w - _icon_size - 20
+                _icon_y = (new_header_h - _icon_size) // 2
+                img.alpha_composite(_bicon, (_icon_x, _icon_y))
+            except Exception:
+                pass
+
+        new_header_bottom = new_header_h + HDR_SEP
+
+        top_header_y0 = new_header_bottom
+        top_header_y1 = top_header_y0 + hdr_h - 1
+        if not hide_row_dividers:
+            draw.rectangle(
+                [0, top_header_y0, img_w - 1, top_header_y0 + HDR_SEP - 1], fill=_NB_HDR_SEP
+            )
+            draw.rectangle(
+                [0, top_header_y0 + HDR_SEP, img_w - 1, top_header_y1 + HDR_SEP],
+                fill=_NB_HEADER_BG,
+            )
+            x = 0
+            for key in col_keys:
+                cw = col_widths[key]
+                lbl = hdr_labels[key]
+                lw = tw(lbl, hdr_font)
+                if key == "angle" and show_angle:
+                    rep_base = tw("000.00", hdr_font)
+                    rep_dir = tw(" (-> 000.0)", hdr_font)
+                    rep_full = rep_base + rep_dir
+                    cell_bx = x + (cw - rep_full) // 2
+                    dir_start = cell_bx + rep_base
+                    text_x = dir_start + (rep_dir - lw) // 2
+                    text_x = max(x, min(text_x, x + cw - lw))
+                else:
+                    text_x = x + (cw - lw) // 2
+                draw.text(
+                    (text_x, top_header_y0 + HDR_SEP + (hdr_h - th(hdr_font)) // 2),
+                    lbl,
+                    font=hdr_font,
+                    fill=_NB_TEXT,
+                )
+                x += cw
+            draw.rectangle(
+                [
+                    0,
+                    top_header_y1 + HDR_SEP + 1,
+                    img_w - 1,
+                    top_header_y1 + HDR_SEP + 1 + HDR_SEP - 1,
+                ],
+                fill=_NB_HDR_SEP,
+            )
+
+        row_area_y = new_header_bottom + HDR_SEP + hdr_h + HDR_SEP
+
+        for row_idx in range(num_display_rows):
+            row_slot = body_h + (ROW_SEP if not hide_row_dividers else 0)
+            y = row_area_y + row_idx * row_slot
+            if (not hide_row_dividers and row_idx < num_display_rows - 1) or (
+                show_portal_warning and row_idx == num_display_rows - 1
+            ):
+                draw.rectangle(
+                    [0, y + body_h, img_w - 1, y + body_h + ROW_SEP - 1], fill=_NB_ROW_SEP
+                )
+
+            a_body, d_body = body_font.getmetrics()
+            text_y = y + (body_h - (a_body + d_body)) // 2
+            x = 0
+
+            def draw_cell_centered(key, text, fill=_NB_TEXT, fnt=body_font):
+                nonlocal x
+                cw = col_widths[key]
+                tw_ = tw(text, fnt)
+                draw_text(draw, (x + (cw - tw_) // 2, text_y), text, fnt, fill)
+                x += cw
+
+            def draw_coord_cell(key, coord_pair):
+                nonlocal x
+                cw = col_widths[key]
+                cx_v, cz_v = coord_pair
+                parts = [
+                    ("(", _NB_TEXT),
+                    (
+                        str(cx_v),
+                        _tc(neg_coords_rgb)
+                        if neg_coords_enabled and cx_v < 0
+                        else _NB_TEXT,
+                    ),
+                    (", ", _NB_TEXT),
+                    (
+                        str(cz_v),
+                        _tc(neg_coords_rgb)
+                        if neg_coords_enabled and cz_v < 0
+                        else _NB_TEXT,
+                    ),
+                    (")", _NB_TEXT),
+                ]
+                full_w = sum(tw(p[0]) for p in parts)
+                bx = x + (cw - full_w) // 2
+                for pt, pc in parts:
+                    draw_text(draw, (bx, text_y), pt, body_font, pc)
+                    bx += tw(pt)
+                x += cw
+
+            if row_idx >= len(rows):
+                continue
+            r = rows[row_idx]
+            x = 0
+            draw_coord_cell("loc", r["loc"])
+            cert_txt = f"{r['cert_pct']:.1f}%"
+            draw_cell_centered("cert", cert_txt, fill=certainty_rgba(r["cert_pct"], text_alpha))
+            draw_cell_centered("dist", str(r["dist"]))
+            draw_coord_cell("nether", r["nether"])
+
+            if show_angle and r["angle"] is not None:
+                cw = col_widths["angle"]
+                base_str = r["angle"]
+                dir_part = ""
+                dir_col = _NB_TEXT
+                if r["dir"] is not None:
+                    arrow = "->" if r["dir"] > 0 else "<-"
+                    dir_part = f" ({arrow} {abs(r['dir']):.1f})"
+                    dir_col = gradient_rgba(abs(r["dir"]), text_alpha)
+                full_w = tw(base_str) + tw(dir_part)
+                bx = x + (cw - full_w) // 2
+                draw_text(draw, (bx, text_y), base_str, body_font, _NB_TEXT)
+                if dir_part:
+                    draw_text(
+                        draw, (bx + tw(base_str), text_y), dir_part, body_font, dir_col
+                    )
+                x += cw
+
+        if _display_info_messages:
+            current_info_y = lay["info_area_y"]
+            draw.rectangle(
+                [0, current_info_y, img_w - 1, current_info_y + ROW_SEP - 1],
+                fill=_NB_ROW_SEP,
+            )
+            current_info_y += ROW_SEP
+            for msg_idx, msg in enumerate(_display_info_messages):
+                this_msg_h = lay["info_heights"][msg_idx]
+                block = info_block(
+                    msg, portal_warn_font, (img_w, this_msg_h), text_opacity, _NB_ROW_BG
+                )
+                img.paste(block, (0, current_info_y))
+
+                current_info_y += this_msg_h
+                if msg_idx < len(_display_info_messages) - 1:
+                    draw.rectangle(
+                        [0, current_info_y, img_w - 1, current_info_y + ROW_SEP - 1],
+                        fill=_NB_ROW_SEP,
+                    )
+                    current_info_y += ROW_SEP
+
+        if blind is not None:
+            eval_color = _tc(blind_evaluation_color(blind["evaluation"]))
+            txt_x = CELL_PAD_MAIN
+            txt_y = new_header_bottom + (body_h - th(body_font)) // 2
+            lsep = body_h
+            draw.text((txt_x, txt_y), blind["prefix"], font=body_font, fill=_NB_TEXT)
+            draw.text(
+                (txt_x + tw(blind["prefix"]), txt_y),
+                blind["eval_text"],
+                font=body_font,
+                fill=eval_color,
+            )
+            draw.text((txt_x, txt_y + lsep), blind["pct"], font=body_font, fill=eval_color)
+            draw.text(
+                (txt_x + tw(blind["pct"]), txt_y + lsep),
+                blind["post"],
+                font=body_font,
+                fill=_NB_TEXT,
+            )
+            draw.text((txt_x, txt_y + lsep * 2), blind["improve"], font=body_font, fill=_NB_TEXT)
+        elif failed:
+            txt_x = CELL_PAD_MAIN
+            for li, line in enumerate(NB_FAILED_LINES):
+                if not line:
+                    continue
+                ty = new_header_bottom + li * body_h + (body_h - th(body_font)) // 2
+                draw.text((txt_x, ty), line, font=body_font, fill=_NB_TEXT)
+
+        if num_throw_rows:
+            throw_base_y = main_h
+            draw.rectangle(
+                [0, throw_base_y, img_w - 1, throw_base_y + HDR_SEP - 1], fill=_NB_HDR_SEP
+            )
+            th_title_y = throw_base_y + HDR_SEP
+            draw.rectangle(
+                [0, th_title_y, img_w - 1, th_title_y + hdr_h - 1], fill=_NB_HEADER_BG
+            )
+            title_ty = th_title_y + (hdr_h - th(hdr_font)) // 2
+            draw.text(
+                (CELL_PAD_MAIN + 6, title_ty),
+                "Ender eye throws",
+                font=hdr_font,
+                fill=_NB_TEXT,
+            )
+
+            th_hdr_y = th_title_y + hdr_h
+            draw.rectangle(
+                [0, th_hdr_y, img_w - 1, th_hdr_y + small_h - 1], fill=_NB_HEADER_BG
+            )
+            x = 0
+            for i, thdr in enumerate(NB_THROW_HEADERS):
+                cw = throw_col_widths[i]
+                lw = tw(thdr, small_font)
+                ty = th_hdr_y + (small_h - th(small_font)) // 2
+                draw.text((x + (cw - lw) // 2, ty), thdr, font=small_font, fill=_NB_TEXT)
+                x += cw
+
+            sep2_y = th_hdr_y + small_h
+            draw.rectangle([0, sep2_y, img_w - 1, sep2_y + HDR_SEP - 1], fill=_NB_HDR_SEP)
+
+            a_small, _ = small_font.getmetrics()
+            for ti in range(num_throw_rows):
+                ty = sep2_y + HDR_SEP + ti * (throw_body_h + ROW_SEP)
+                if ti < num_throw_rows - 1:
+                    draw.rectangle(
+                        [0, ty + throw_body_h, img_w - 1, ty + throw_body_h + ROW_SEP - 1],
+                        fill=_NB_ROW_SEP,
+                    )
+                if ti >= len(throw_rows_data):
+                    continue
+                x = 0
+                ty2 = ty + (throw_body_h - a_small) // 2
+                for i, cell in enumerate(throw_rows_data[ti]):
+                    cw = throw_col_widths[i]
+                    if failed and i == 3:
+                        x += cw
+                        continue
+                    if i == 2 and show_adj_count and ti in adj_count_by_throw:
+                        aw_str, cnt_str, cnt_raw = adj_count_by_throw[ti]
+                        if cnt_str:
+                            adj_col = _tc(
+                                ADJ_COUNT_POSITIVE
+                                if (cnt_raw is None or cnt_raw >= 0)
+                                else ADJ_COUNT_NEGATIVE
+                            )
+                            full_w = tw(aw_str, small_font) + tw(cnt_str, small_font)
+                            bx = x + (cw - full_w) // 2
+                            draw_text(
+                                draw, (bx, ty2), aw_str, small_font, _NB_THROW_HDR_FG
+                            )
+                            draw_text(
+                                draw,
+                                (bx + tw(aw_str, small_font), ty2),
+                                cnt_str,
+                                small_font,
+                                adj_col,
+                            )
+                        else:
+                            cw_ = tw(aw_str, small_font)
+                            draw_text(
+                                draw,
+                                (x + (cw - cw_) // 2, ty2),
+                                aw_str,
+                                small_font,
+                                _NB_THROW_HDR_FG,
+                            )
+                    else:
+                        cw_ = tw(cell, small_font)
+                        draw_text(
+                            draw,
+                            (x + (cw - cw_) // 2, ty2),
+                            cell,
+                            small_font,
+                            _NB_THROW_HDR_FG,
+                        )
+                    x += cw
+    return img
+
+
+def render_nb_failed_standalone(font_size, bg_opacity=1.0, text_opacity=1.0):
+    font = load_nb_font(font_size)
+    a, d = font.getmetrics()
+    body_h = a + d + 10
+    lines = [line for line in NB_FAILED_LINES if line]
+    max_w = max(text_bbox(font, line)[2] for line in lines)
+    PAD = 20
+    img_w = max_w + PAD * 2
+    img_h = body_h * len(lines) + PAD
+    img = Image.new("RGBA", (img_w, img_h), with_alpha(NB_ROW_BG[:3], bg_opacity))
+    draw = ImageDraw.Draw(img)
+    t_col = with_alpha(NB_TEXT, text_opacity)
+    for i, line in enumerate(lines):
+        y = PAD // 2 + i * body_h
+        lw = text_bbox(font, line)[2]
+        draw.text(
+            ((img_w - lw) // 2, y + (body_h - (a + d)) // 2),
+            line,
+            font=font,
+            fill=t_col,
+        )
+    return img
+
+
+# --------------------- Custom (minimal) overlay --------------------------
+
+
+def custom_style(custom):
+    bg_rgb = hex_to_rgb(custom.get("background_color", "#1E1E1E"), fallback=(255, 255, 255))
+    text_rgb = hex_to_rgb(custom.get("text_color", "#000000"), fallback=(0, 0, 0))
+    bg_opacity = max(0.0, min(1.0, float(custom.get("background_opacity", 1.0))))
+    text_opacity = max(0.0, min(1.0, float(custom.get("text_opacity", 1.0))))
+    text_outline_rgb = hex_to_rgb(custom.get("text_outline_color", "#000000"), (0, 0, 0))
+    try:
+        text_outline_width = int(custom.get("text_outline_width", 2))
+        text_outline_width = max(1, min(10, text_outline_width))
+    except Exception:
+        text_outline_width = 2
+
+    text_alpha = int(text_opacity * 255)
+    stroke_kwargs = {}
+    stroke_width = 0
+    if bool(custom.get("text_outline_enabled", False)):
+        stroke_kwargs = {
+            "stroke_width": text_outline_width,
+            "stroke_fill": (*text_outline_rgb, text_alpha),
+        }
+        stroke_width = text_outline_width
+
+    return {
+        "bg_rgba": (*bg_rgb, int(bg_opacity * 255)),
+        "text_rgba": (*text_rgb, text_alpha),
+        "text_rgb": text_rgb,
+        "text_alpha": text_alpha,
+        "text_opacity": text_opacity,
+        "stroke_kwargs": stroke_kwargs,
+        "stroke_width": stroke_width,
+        "font_size": custom.get("font_size", 18),
+        "font_name": custom.get("font_name", ""),
+        "neg_coords_enabled": custom.get("negative_coords_color_enabled", False),
+        "neg_coords_rgb": hex_to_rgb(
+            custom.get("negative_coords_color", "#CC6E72"), fallback=(204, 110, 114)
+        ),
+        "portal_nether_enabled": custom.get("portal_nether_color_enabled", True),
+        "portal_nether_rgb": hex_to_rgb(
+            custom.get("portal_nether_color", "#FFA500"), fallback=(255, 165, 0)
+        ),
+    }
+
+
+def render_custom_overlay(custom, lines, adj_rows, error_rows, style=None, stage=no_stage):
+    if style is None:
+        style = custom_style(custom)
+    stroke_width = style["stroke_width"]
+    stroke_kwargs = style["stroke_kwargs"]
+    text_rgba = style["text_rgba"]
+    alpha = style["text_alpha"]
+    neg_coords_enabled = style["neg_coords_enabled"]
+    neg_coords_rgb = style["neg_coords_rgb"]
+    portal_nether_enabled = style["portal_nether_enabled"]
+    portal_nether_rgb = style["portal_nether_rgb"]
+
+    with stage("layout"):
+        fonts = custom_fonts(style["font_size"], style["font_name"])
+        font = fonts["main"]
+        small_font = fonts["small"]
+        lay = layout_custom(custom, lines, adj_rows, error_rows, fonts, stroke_width)
+
+    with stage("raster"):
+        line_h = lay["line_h"]
+        header_h = lay["header_h"]
+        col_x = lay["col_x"]
+        col_widths = lay["col_widths"]
+
+        img = Image.new("RGBA", (lay["width"], lay["height"]), style["bg_rgba"])
+        draw = ImageDraw.Draw(img)
+        _last_turn_pct = 0.0
+
+        for hdr_txt, hx in lay["headers"]:
+            draw_text(draw, (hx, 5), hdr_txt, font, text_rgba, **stroke_kwargs)
+
+        for row, (parts, _portal_link) in enumerate(lines):
+            y = 5 + header_h + row * line_h
+            for _item in parts:
+                if _item[0] == "angle_change":
+                    try:
+                        _last_turn_pct = float(_item[1][1])
+                    except Exception:
+                        pass
+                    break
+
+            for slot_idx, (kind, val) in enumerate(parts):
+                col_left = col_x[slot_idx] if slot_idx < len(col_x) else 10
+                col_w = col_widths[slot_idx] if slot_idx < len(col_widths) else 0
+
+                def _cx(txt):
+                    tw_v = text_width(font, txt, stroke_width)
+                    return col_left + (col_w - tw_v) // 2
+
+                def _coord_parts(cx_v, cz_v, punct_fill, highlight):
+                    if highlight is not None:
+                        x_fill = z_fill = highlight
+                    else:
+                        x_fill = (
+                            (*neg_coords_rgb, alpha)
+                            if neg_coords_enabled and cx_v < 0
+                            else text_rgba
+                        )
+                        z_fill = (
+                            (*neg_coords_rgb, alpha)
+                            if neg_coords_enabled and cz_v < 0
+                            else text_rgba
+                        )
+                    return [
+                        ("(", punct_fill),
+                        (str(cx_v), x_fill),
+                        (", ", punct_fill),
+                        (str(cz_v), z_fill),
+                        (")", punct_fill),
+                    ]
+
+                if kind == "certainty":
+                    txt = val
+                    try:
+                        pct = float(txt.rstrip("%"))
+                        fill = certainty_rgba(pct, alpha)
+                    except Exception:
+                        fill = text_rgba
+                    draw_text(
+                        draw, (_cx(txt), y), txt, font, fill, **stroke_kwargs
+                    )
+
+                elif kind == "angle_change":
+                    arrow, num = val
+                    try:
+                        _last_turn_pct = float(num)
+                    except Exception:
+                        pass
+                    fill = gradient_rgba(_last_turn_pct, alpha)
+                    full_change = f"({arrow} {num})"
+                    draw_text(
+                        draw,
+                        (_cx(full_change), y),
+                        full_change,
+                        font,
+                        fill,
+                        **stroke_kwargs,
+                    )
+
+                elif kind in ("coords", "nether_coords_val"):
+                    cx_v, cz_v = val
+                    punct_fill = text_rgba
+                    highlight = None
+                    if kind == "nether_coords_val" and portal_nether_enabled and _portal_link:
+                        punct_fill = highlight = (*portal_nether_rgb, alpha)
+                    coord_parts = _coord_parts(cx_v, cz_v, punct_fill, highlight)
+                    total_w = sum(
+                        text_width(font, p, stroke_width) for p, _ in coord_parts
+                    )
+                    bx = col_left + (col_w - total_w) // 2
+                    for part_txt, part_fill in coord_parts:
+                        draw_text(
+                            draw, (bx, y), part_txt, font, part_fill, **stroke_kwargs
+                        )
+                        bx += text_width(font, part_txt, stroke_width)
+
+                else:
+                    if kind == "distance":
+                        txt = val[0] if isinstance(val, tuple) else str(val)
+                    else:
+                        txt = str(val)
+                    draw_text(
+                        draw, (_cx(txt), y), txt, font, text_rgba, **stroke_kwargs
+                    )
+
+        for kind, txt, bx, by, adj_raw in lay["bottom_items"]:
+            fill = text_rgba
+            if kind == "count":
+                base_color = (
+                    ADJ_COUNT_POSITIVE
+                    if (adj_raw is None or adj_raw >= 0)
+                    else ADJ_COUNT_NEGATIVE
+                )
+                fill = (*base_color, alpha)
+            draw_text(draw, (bx, by), txt, small_font, fill, **stroke_kwargs)
+
+        for txt, bx, by in lay["bottom_headers"]:
+            draw_text(draw, (bx, by), txt, small_font, text_rgba, **stroke_kwargs)
+    return img
+
+
+def render_custom_blind(custom, blind_result, style=None, stage=no_stage):
+    if style is None:
+        style = custom_style(custom)
+    stroke_kwargs = style["stroke_kwargs"]
+    text_rgba = style["text_rgba"]
+
+    with stage("layout"):
+        lines = blind_lines(blind_result)
+        font = load_font(style["font_name"], style["font_size"])
+        blay = layout_custom_blind(lines, font, style["stroke_width"])
+
+    with stage("raster"):
+        pad = blay["pad"]
+        line_h = blay["line_h"]
+        img = Image.new("RGBA", (blay["width"], blay["height"]), style["bg_rgba"])
+        draw = ImageDraw.Draw(img)
+        eval_color_rgba = (
+            *blind_evaluation_color(lines["evaluation"]),
+            style["text_alpha"],
+        )
+
+        x, y = pad, 10
+        draw_text(draw, (x, y), lines["prefix"], font, text_rgba, **stroke_kwargs)
+        draw_text(
+            draw,
+            (x + blay["w_prefix"], y),
+            lines["eval_text"],
+            font,
+            eval_color_rgba,
+            **stroke_kwargs,
+        )
+        y += line_h
+        draw_text(draw, (x, y), lines["pct"], font, eval_color_rgba, **stroke_kwargs)
+        draw_text(
+            draw,
+            (x + blay["w_pct"], y),
+            lines["post"],
+            font,
+            text_rgba,
+            **stroke_kwargs,
+        )
+        y += line_h
+        draw_text(draw, (pad, y), lines["improve"], font, text_rgba, **stroke_kwargs)
+    return img
+
+
+def render_custom_text(custom, text, style=None):
+    if style is None:
+        style = custom_style(custom)
+    font = load_font(style["font_name"], style["font_size"])
+    bbox = text_bbox(font, text, style["stroke_width"])
+    pad = 10
+    img = Image.new(
+        "RGBA",
+        (bbox[2] - bbox[0] + 2 * pad, bbox[3] - bbox[1] + 2 * pad),
+        style["bg_rgba"],
+    )
+    draw = ImageDraw.Draw(img)
+    draw_text(
+        draw,
+        (pad - bbox[0], pad - bbox[1]),
+        text,
+        font,
+        style["text_rgba"],
+        **style["stroke_kwargs"],
+    )
+    return img
+
+
+def render_custom_boat_icon(boat_state, text_opacity=1.0, size=64):
+    icon_file = "boat_green_icon.png" if boat_state == "VALID" else "boat_red_icon.png"
+    return load_icon(icon_file, (size, size), text_opacity)
+
+
+# --------------------- Customizer previews --------------------------
+
+PREVIEW_KINDS = ("default", "default_blind", "eye", "blind")
+
+
+def render_preview(kind, settings, data, version=""):
+    # data holds preds, eye_throws, player (a Ninjabrain Bot playerPosition),
+    # blind_result, boat_state and optionally info_messages, either the Customizer's sample or the
+    # tracker's latest snapshot. Returns None when there is nothing to show.
+    player = data.get("player") or {}
+    player_x = player.get("xInOverworld")
+    player_z = player.get("zInOverworld")
+    h_ang = player.get("horizontalAngle")
+    in_nether = player.get("isInNether", False)
+
+    if kind == "eye":
+        lines = custom_lines(
+            settings, data["preds"], data["eye_throws"], player_x, player_z, h_ang, in_nether
+        )
+        if not lines:
+            return None
+        adj_rows, error_rows = custom_bottom_rows(settings, data["eye_throws"])
+        return render_custom_overlay(settings, lines, adj_rows, error_rows)
+    if kind == "blind":
+        return render_custom_blind(settings, data["blind_result"])
+
+    try:
+        font_size = int(settings.get("font_size", 18))
+    except Exception:
+        font_size = 18
+    blind = kind == "default_blind"
+    return render_nb_stronghold(
+        [] if blind else data["preds"],
+        [] if blind else data["eye_throws"],
+        player_x,
+        player_z,
+        h_ang,
+        in_nether,
+        font_size,
+        bool(settings.get("negative_coords_color_enabled", False)),
+        hex_to_rgb(settings.get("negative_coords_color", "#BA6669"), (186, 102, 105)),
+        "four_four" if blind else settings.get("overworld_coords_format", "four_four"),
+        False if blind else bool(settings.get("show_angle_adjustment_count", False)),
+        blind_result=data.get("blind_result") if blind else None,
+        boat_state=data.get("boat_state"),
+        user_font_path=settings.get("font_name", ""),
+        info_messages=data.get("info_messages"),
+        bg_opacity=max(0.0, min(1.0, float(settings.get("background_opacity", 1.0)))),
+        text_opacity=max(0.0, min(1.0, float(settings.get("text_opacity", 1.0)))),
+        version=version,
+    )